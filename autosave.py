@@ -0,0 +1,128 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Autosave Module
+
+Name: Isaiah Coleman
+
+This module saves characters in the background so the game loop never waits
+on a save file.
+"""
+
+import threading
+import character_manager
+
+# ============================================================================
+# WRITE-BEHIND QUEUE
+# request() stores a snapshot of the character and returns at once. Pending
+# snapshots are keyed by character name, so asking to save the same character
+# several times before the worker wakes up costs a single write of the latest
+# state. The worker writes everything pending every `interval` seconds;
+# flush() writes it immediately and close() flushes and stops the worker.
+# ============================================================================
+
+DEFAULT_INTERVAL = 5.0
+
+
+def _snapshot(character):
+    # copy the lists too: the game keeps changing the live character
+    return {key: list(value) if isinstance(value, list) else value
+            for key, value in character.items()}
+
+
+class AutosaveWorker:
+    """
+    Background saver for character dicts.
+    save_function is called as save_function(character) from the worker
+    thread (or from flush()); it defaults to character_manager.save_character.
+    Counters: requested (calls to request), written (saves actually made),
+    coalesced (requests replaced by a newer one before being written) and
+    failed (saves that raised; the error is kept in last_error).
+    """
+
+    def __init__(self, save_function=None, interval=DEFAULT_INTERVAL):
+        self.save_function = save_function or character_manager.save_character
+        self.interval = interval
+        self.requested = 0
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_error = None
+
+        self._pending = {}
+        self._lock = threading.Condition()
+        self._write_lock = threading.Lock()  # keeps writes in request order
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def request(self, character):
+        """Queue a save of character's current state."""
+        snapshot = _snapshot(character)
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError("Autosave worker is closed.")
+            if snapshot["name"] in self._pending:
+                self.coalesced += 1
+            self._pending[snapshot["name"]] = snapshot
+            self.requested += 1
+
+    def pending(self):
+        """Number of characters waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Write every pending save now, in the calling thread.
+        Returns the number of saves written. Failed saves are counted and the
+        last exception is stored in last_error; they are not retried.
+        """
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            written = 0
+            for character in batch.values():
+                try:
+                    self.save_function(character)
+                    written += 1
+                except Exception as e:
+                    with self._lock:
+                        self.failed += 1
+                        self.last_error = e
+            with self._lock:
+                self.written += written
+            return written
+
+    def close(self):
+        """Stop the worker thread after a final flush. Safe to call twice."""
+        with self._lock:
+            self._stopping = True
+            self._lock.notify()
+        self._thread.join()
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requested": self.requested,
+                "written": self.written,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "pending": len(self._pending),
+            }
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._stopping:
+                    self._lock.wait(self.interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
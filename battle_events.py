@@ -0,0 +1,156 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Events Module
+
+Name: Isaiah Coleman
+
+This module defines the events a SimpleBattle reports while it runs and the
+sinks that receive them (console, nothing, memory, or a log file).
+"""
+
+import sys
+import json
+from collections import deque, namedtuple
+
+# ============================================================================
+# EVENTS
+# Plain named tuples: cheap to create and easy to inspect in tests.
+# turn counts rounds, starting at 1 (player action + enemy action).
+# ============================================================================
+
+TurnStart = namedtuple("TurnStart", "turn character_name character_health character_max_health "
+                                    "enemy_name enemy_health enemy_max_health")
+DamageDealt = namedtuple("DamageDealt", "turn attacker target damage target_health by_player")
+AbilityUsed = namedtuple("AbilityUsed", "turn character_name ability message")
+EscapeAttempt = namedtuple("EscapeAttempt", "turn success")
+BattleEnd = namedtuple("BattleEnd", "turn winner xp_gained gold_gained")
+
+EVENT_TYPES = (TurnStart, DamageDealt, AbilityUsed, EscapeAttempt, BattleEnd)
+
+
+# format_event(event)
+# The console text for an event, exactly as combat_system used to print it
+# (display_combat_stats / display_battle_log), or None if nothing is shown.
+def format_event(event):
+    kind = type(event)
+    if kind is TurnStart:
+        return (f"\n{event.character_name}: HP={event.character_health}/{event.character_max_health}\n"
+                f"{event.enemy_name}: HP={event.enemy_health}/{event.enemy_max_health}")
+    if kind is DamageDealt:
+        if event.by_player:
+            return f">>> You attacked the {event.target} for {event.damage} damage!"
+        return f">>> {event.attacker} hit you for {event.damage} damage!"
+    if kind is AbilityUsed:
+        return f">>> {event.message}"
+    if kind is EscapeAttempt:
+        return ">>> You escaped successfully!" if event.success else ">>> Escape failed!"
+    return None
+
+
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+# event_to_dict(event)
+# A JSON-ready dict of an event, with its type under "event".
+def event_to_dict(event):
+    data = {"event": type(event).__name__}
+    data.update(event._asdict())
+    return data
+
+# ============================================================================
+# SINKS
+# A sink is any object with emit(event); flush() and close() are optional
+# (BattleSink provides no-op versions). A sink whose wants_turn_events is
+# False only needs BattleEnd, which lets SimpleBattle skip playing the turns.
+# ============================================================================
+
+class BattleSink:
+    """Base sink: ignores everything."""
+
+    wants_turn_events = True
+
+    def emit(self, event):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NullSink(BattleSink):
+    """Discards every event."""
+
+    wants_turn_events = False
+
+
+class ConsoleSink(BattleSink):
+    """Prints events as the game always has. stream defaults to the current sys.stdout."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event):
+        text = format_event(event)
+        if text is not None:
+            (self.stream or sys.stdout).write(text + "\n")
+
+
+class RingBufferSink(BattleSink):
+    """Keeps the last `capacity` events in memory (all of them if capacity is None)."""
+
+    def __init__(self, capacity=1000):
+        self.events = deque(maxlen=capacity)
+        self.emit = self.events.append
+
+    def clear(self):
+        self.events.clear()
+
+
+class BatchedFileSink(BattleSink):
+    """
+    Appends events to a file, one per line, as JSON (fmt="json") or console
+    text (fmt="text"). Lines are buffered and written once batch_bytes have
+    built up, on flush() and on close().
+    """
+
+    def __init__(self, path, batch_bytes=1 << 16, fmt="json"):
+        if fmt not in ("json", "text"):
+            raise ValueError(f"Unknown event format: {fmt}")
+        self.path = path
+        self.batch_bytes = batch_bytes
+        self.fmt = fmt
+        self._lines = []
+        self._size = 0
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, event):
+        if self.fmt == "json":
+            line = _encode_json(event_to_dict(event))
+        else:
+            line = format_event(event)
+            if line is None:
+                return
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.batch_bytes:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._file.write("\n".join(self._lines) + "\n")
+            self._lines = []
+            self._size = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
@@ -0,0 +1,255 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Simulator Module
+
+Name: Isaiah Coleman
+
+This module runs large numbers of headless SimpleBattle fights for balancing:
+no printing, no changes to real characters, just outcome statistics.
+
+Usage:
+    python battle_simulator.py Rogue 4 --trials 1000000 --special-every 2
+"""
+
+import random
+import argparse
+import itertools
+from collections import Counter
+import character_manager
+import combat_system
+from custom_exceptions import InvalidTargetError
+
+try:
+    import numpy as np
+except ImportError:
+    # optional: sampling falls back to random.choices
+    np = None
+
+# ============================================================================
+# BATTLE MODEL
+# A simulated battle follows SimpleBattle.start_battle: the player acts, then
+# the enemy attacks, until one side reaches 0 health. The player normally
+# makes a basic attack (SimpleBattle.calculate_damage); with special_every=k
+# every k-th player turn uses the class ability instead (power strike,
+# fireball, critical strike or heal, as in combat_system).
+#
+# The only randomness is the rogue's 50% critical strike, so a fight can only
+# end in a small number of ways. outcome_distribution() walks the battle turn
+# by turn keeping the probability of every reachable (enemy health, player
+# health) pair, which gives each possible ending (winner, turns, health left)
+# with its exact probability. simulate() then draws the requested number of
+# battles from that distribution (a single multinomial draw with NumPy,
+# random.choices otherwise), so the cost per battle is a random draw instead
+# of a turn-by-turn loop, and results vary between runs like real battles.
+# ============================================================================
+
+DEFAULT_MAX_TURNS = 1000
+DEFAULT_SECONDS_PER_TURN = 3.0
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# character_at_level(character_class, level)
+# Returns a new character of that class with the stat gains of `level`
+# applied, at full health.
+def character_at_level(character_class, level):
+    character = character_manager.create_character(f"sim_{character_class}", character_class)
+    gained = level - 1
+    character["level"] = level
+    character["max_health"] += character_manager.LEVEL_UP_MAX_HEALTH * gained
+    character["strength"] += character_manager.LEVEL_UP_STRENGTH * gained
+    character["magic"] += character_manager.LEVEL_UP_MAGIC * gained
+    character["health"] = character["max_health"]
+    return character
+
+
+# special_outcomes(character)
+# The possible results of the character's class ability as
+# [(probability, damage to enemy, health healed)], matching
+# combat_system.use_special_ability.
+def special_outcomes(character):
+    char_class = str(character.get("class", "")).lower()
+    if char_class == "warrior":
+        return [(1.0, character.get("strength", 1) * 2, 0)]
+    if char_class == "mage":
+        return [(1.0, character.get("magic", 1) * 2, 0)]
+    if char_class == "rogue":
+        strength = character.get("strength", 1)
+        return [(0.5, strength * 3, 0), (0.5, strength, 0)]
+    if char_class == "cleric":
+        return [(1.0, 0, 30)]
+    raise InvalidTargetError("Unknown ability.")
+
+
+# outcome_distribution(character, enemy, special_every=0, max_turns=DEFAULT_MAX_TURNS)
+# Exact distribution of battle endings. Neither dict is modified.
+# Returns a list of (winner, turns, player_health_left, probability) where
+# winner is "player", "enemy" or None (still going after max_turns).
+def outcome_distribution(character, enemy, special_every=0, max_turns=DEFAULT_MAX_TURNS):
+    if not special_every:
+        # plain attacks only: a single, closed-form outcome
+        result = combat_system.resolve_battle(character, enemy)
+        if result["turns"] <= max_turns:
+            return [(result["winner"], result["turns"], result["character_health"], 1.0)]
+
+    basic = [(1.0, combat_system.basic_attack_damage(character, enemy), 0)]
+    special = special_outcomes(character) if special_every else basic
+    enemy_damage = combat_system.basic_attack_damage(enemy, character)
+    max_health = character.get("max_health", 0)
+
+    endings = Counter()
+    states = {(enemy.get("health", 0), character.get("health", 0)): 1.0}
+    for turn in range(1, max_turns + 1):
+        actions = special if special_every and turn % special_every == 0 else basic
+        following = Counter()
+        for (enemy_hp, player_hp), p in states.items():
+            for q, damage, heal in actions:
+                enemy_left = max(0, enemy_hp - damage)
+                player_hp_now = min(player_hp + heal, max_health)
+                if enemy_left <= 0:
+                    endings[("player", turn, player_hp_now)] += p * q
+                    continue
+                player_left = max(0, player_hp_now - enemy_damage)
+                if player_left <= 0:
+                    endings[("enemy", turn, 0)] += p * q
+                else:
+                    following[(enemy_left, player_left)] += p * q
+        states = following
+        if not states:
+            break
+    for (_, player_hp), p in states.items():
+        endings[(None, max_turns, player_hp)] += p
+    return [key + (p,) for key, p in endings.items()]
+
+
+# _sample_counts(probabilities, trials, rng)
+# How many of `trials` battles end in each outcome.
+def _sample_counts(probabilities, trials, rng):
+    if len(probabilities) == 1:
+        return [trials]
+    if np is not None:
+        if isinstance(rng, random.Random):
+            rng = rng.getrandbits(64)
+        generator = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        p = np.asarray(probabilities, dtype=np.float64)
+        return generator.multinomial(trials, p / p.sum()).tolist()
+    if not isinstance(rng, random.Random):
+        rng = random.Random(rng)
+    cum_weights = list(itertools.accumulate(probabilities))
+    drawn = Counter(rng.choices(range(len(probabilities)), cum_weights=cum_weights, k=trials))
+    return [drawn.get(i, 0) for i in range(len(probabilities))]
+
+
+# _percentiles(values_and_counts, total, points)
+# Nearest-rank percentiles of a value -> count table.
+def _percentiles(values_and_counts, total, points):
+    result = {}
+    ordered = sorted(values_and_counts)
+    for point in points:
+        rank = max(1, -(-point * total // 100))
+        seen = 0
+        for value, count in ordered:
+            seen += count
+            if seen >= rank:
+                result[point] = value
+                break
+    return result
+
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+# simulate(character_class, level, enemy_type, trials=100000, special_every=0,
+#          seed=None, max_turns=DEFAULT_MAX_TURNS, seconds_per_turn=DEFAULT_SECONDS_PER_TURN)
+# Runs `trials` battles of a fresh character of that class and level against
+# create_enemy(enemy_type). seed may be an int, a random.Random or (with
+# NumPy) a numpy Generator. Returns a dict with:
+#   win_rate, loss_rate, timeout_rate     fractions of all trials
+#   turns_to_kill                          {turns: battles won in that many turns}
+#   mean_turns                             over all trials
+#   hp_remaining_percentiles               {percentile: % of max health left},
+#                                          over all trials (a loss leaves 0)
+#   xp_per_minute, gold_per_minute         rewards earned over the total time
+#                                          spent fighting, at seconds_per_turn
+def simulate(character_class, level, enemy_type, trials=100000, special_every=0,
+             seed=None, max_turns=DEFAULT_MAX_TURNS, seconds_per_turn=DEFAULT_SECONDS_PER_TURN):
+    if trials < 1:
+        raise ValueError("trials must be at least 1.")
+    character = character_at_level(character_class, level)
+    enemy = combat_system.create_enemy(enemy_type)
+    outcomes = outcome_distribution(character, enemy, special_every, max_turns)
+    counts = _sample_counts([o[3] for o in outcomes], trials, seed)
+
+    wins = losses = timeouts = total_turns = 0
+    turns_to_kill = Counter()
+    hp_left = Counter()
+    max_health = character["max_health"]
+    for (winner, turns, health, _), count in zip(outcomes, counts):
+        if not count:
+            continue
+        total_turns += turns * count
+        hp_left[round(100.0 * health / max_health, 2)] += count
+        if winner == "player":
+            wins += count
+            turns_to_kill[turns] += count
+        elif winner == "enemy":
+            losses += count
+        else:
+            timeouts += count
+
+    rewards = combat_system.get_victory_rewards(enemy)
+    minutes = total_turns * seconds_per_turn / 60.0
+    return {
+        "class": character_class,
+        "level": level,
+        "enemy": enemy["name"],
+        "trials": trials,
+        "win_rate": wins / trials,
+        "loss_rate": losses / trials,
+        "timeout_rate": timeouts / trials,
+        "turns_to_kill": dict(sorted(turns_to_kill.items())),
+        "mean_turns": total_turns / trials,
+        "hp_remaining_percentiles": _percentiles(hp_left.items(), trials, PERCENTILES),
+        "xp_per_minute": rewards["xp"] * wins / minutes if minutes else 0.0,
+        "gold_per_minute": rewards["gold"] * wins / minutes if minutes else 0.0,
+    }
+
+
+# enemy_types()
+# Every enemy type in combat_system's enemy registry, in data file order.
+def enemy_types():
+    return list(combat_system.get_enemy_prototypes())
+
+
+# simulate_all_enemies(character_class, level, trials=100000, **options)
+# simulate() against every registered enemy type; returns enemy type -> result.
+def simulate_all_enemies(character_class, level, trials=100000, **options):
+    rng = options.pop("seed", None)
+    if isinstance(rng, int):
+        # one generator for all enemies, so their draws are independent
+        rng = np.random.default_rng(rng) if np is not None else random.Random(rng)
+    return {enemy_type: simulate(character_class, level, enemy_type, trials, seed=rng, **options)
+            for enemy_type in enemy_types()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate Quest Chronicles battles.")
+    parser.add_argument("character_class")
+    parser.add_argument("level", type=int)
+    parser.add_argument("--trials", type=int, default=100000)
+    parser.add_argument("--special-every", type=int, default=0,
+                        help="use the class ability every N turns (0 = never)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    results = simulate_all_enemies(args.character_class, args.level, args.trials,
+                                   special_every=args.special_every, seed=args.seed)
+    for result in results.values():
+        pct = result["hp_remaining_percentiles"]
+        print(f"{result['class']} L{result['level']} vs {result['enemy']}: "
+              f"win {result['win_rate']:.1%}  turns {result['mean_turns']:.2f}  "
+              f"HP left p50 {pct[50]}%  {result['xp_per_minute']:.1f} XP/min  "
+              f"{result['gold_per_minute']:.1f} gold/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: concurrent asyncio sessions saving and loading
+
+Starts N sessions on one event loop. Each saves its character with
+async_save_character and then loads it back with async_load_character.
+A ticker task measures how long the event loop is blocked. The same work
+done with the blocking calls inside the loop is shown for comparison.
+
+Usage: python benchmarks/bench_async_saves.py [sessions]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from bench_save_formats import make_characters
+
+
+async def ticker(stop, gaps):
+    # longest time the loop went without running this task
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def run(characters, folder, use_async):
+    stop, gaps = asyncio.Event(), []
+    tick = asyncio.ensure_future(ticker(stop, gaps))
+
+    async def session(char):
+        if use_async:
+            await character_manager.async_save_character(char, folder, "binary")
+            await character_manager.async_load_character(char["name"], folder)
+        else:
+            character_manager.save_character(char, folder, "binary")
+            character_manager.load_character(char["name"], folder)
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(c) for c in characters))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max(gaps, default=elapsed)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    characters = make_characters(count)
+    print(f"{count:,} concurrent sessions (save + load)")
+    for label, use_async in (("blocking", False), ("async", True)):
+        with tempfile.TemporaryDirectory() as folder:
+            elapsed, worst = asyncio.run(run(characters, folder, use_async))
+        print(f"  {label:9s} {elapsed:7.2f}s  {count / elapsed:9,.0f} sessions/s  "
+              f"longest loop stall {worst * 1000:8.1f} ms")
+    character_manager.shutdown_async_io()
+
+
+if __name__ == "__main__":
+    main()
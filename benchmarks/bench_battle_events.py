@@ -0,0 +1,53 @@
+"""
+Benchmark: battles per second with each event sink
+
+Plays the same SimpleBattle turn by turn with the console sink (to the real
+stdout redirected to os.devnull, as the old prints did), the null sink, a
+ring buffer and a batched JSON file. With the null sink SimpleBattle
+resolves the fight in one step; "null, played" forces the turn-by-turn loop.
+
+Usage: python benchmarks/bench_battle_events.py [battles]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_events
+import combat_system
+
+
+def run(battles, make_sink, resolve=None):
+    sink = make_sink()
+    start = time.perf_counter()
+    for _ in range(battles):
+        character = {"name": "Hero", "health": 120, "max_health": 120, "strength": 15}
+        enemy = combat_system.create_enemy("orc")
+        combat_system.SimpleBattle(character, enemy, sink=sink, resolve=resolve).start_battle()
+    sink.close()
+    return battles / (time.perf_counter() - start)
+
+
+def main():
+    battles = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{battles:,} battles (Warrior stats vs Orc, 7 rounds each)")
+    with tempfile.TemporaryDirectory() as tmp:
+        sinks = [
+            ("console", battle_events.ConsoleSink, None),
+            ("null", battle_events.NullSink, None),
+            ("null, played", battle_events.NullSink, False),
+            ("ring buffer", battle_events.RingBufferSink, None),
+            ("batched file", lambda: battle_events.BatchedFileSink(os.path.join(tmp, "events.jsonl")), None),
+        ]
+        for label, make_sink, resolve in sinks:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                rate = run(battles, make_sink, resolve)
+            print(f"  {label:<13} {rate:10,.0f} battles/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: simulated battles per second
+
+Times battle_simulator.simulate for every class against every enemy, with
+and without class abilities, and compares against playing battles one by
+one with SimpleBattle's damage rules.
+
+Usage: python benchmarks/bench_battle_simulator.py [trials]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_simulator
+import combat_system
+
+
+def loop_battles(character, enemy, trials, special_every):
+    # turn-by-turn reference: what a naive simulator would do per trial
+    battle = combat_system.SimpleBattle(character, enemy)
+    for _ in range(trials):
+        char, foe = dict(character), dict(enemy)
+        turn = 0
+        while True:
+            turn += 1
+            if special_every and turn % special_every == 0:
+                combat_system.use_special_ability(char, foe)
+            else:
+                battle.apply_damage(foe, battle.calculate_damage(char, foe))
+            if foe["health"] <= 0:
+                break
+            battle.apply_damage(char, battle.calculate_damage(foe, char))
+            if char["health"] <= 0:
+                break
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    backend = "numpy" if battle_simulator.np is not None else "random.choices"
+    print(f"{trials:,} battles per matchup (sampling with {backend})")
+    rng = random.Random(0)
+    for special_every in (0, 2):
+        total = 0
+        start = time.perf_counter()
+        for cls in ("Warrior", "Mage", "Rogue", "Cleric"):
+            for enemy_type in battle_simulator.enemy_types():
+                battle_simulator.simulate(cls, 5, enemy_type, trials, special_every=special_every, seed=rng)
+                total += trials
+        elapsed = time.perf_counter() - start
+        print(f"  special_every={special_every}: {total / elapsed:14,.0f} battles/s")
+
+    character = battle_simulator.character_at_level("Rogue", 5)
+    enemy = combat_system.create_enemy("orc")
+    count = 20000
+    start = time.perf_counter()
+    loop_battles(character, enemy, count, 2)
+    elapsed = time.perf_counter() - start
+    print(f"  turn-by-turn loop (Rogue vs Orc): {count / elapsed:10,.0f} battles/s")
+
+
+if __name__ == "__main__":
+    main()
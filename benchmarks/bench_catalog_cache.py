@@ -0,0 +1,51 @@
+"""
+Benchmark: cold vs warm catalog loading
+
+Writes a synthetic quest and item catalog, then times game_data.load_quests /
+load_items with no cache (cold parse) and with a fresh compiled cache (warm).
+
+Usage: python benchmarks/bench_catalog_cache.py [entries]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import catalog_generator
+
+
+def write_catalogs(folder, count, seed=0):
+    quests = os.path.join(folder, "quests.txt")
+    items = os.path.join(folder, "items.txt")
+    catalog_generator.generate_quests(quests, count, seed)
+    catalog_generator.generate_items(items, count, seed)
+    return quests, items
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as folder:
+        quests, items = write_catalogs(folder, count)
+        for label, loader, path in (("quests", game_data.load_quests, quests),
+                                    ("items", game_data.load_items, items)):
+            game_data.clear_catalog_cache(path)
+            cold = timed(loader, path, use_cache=False)
+            build = timed(loader, path)  # parse + write cache
+            warm = timed(loader, path)
+            print(f"{label:7s} {count:>9,} entries  cold {cold:7.3f}s  "
+                  f"first cached {build:7.3f}s  warm {warm:7.3f}s  "
+                  f"speedup x{cold / warm:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
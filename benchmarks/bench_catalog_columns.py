@@ -0,0 +1,57 @@
+"""
+Benchmark: record loops vs columnar views for balancing queries
+
+Times a level-range filter and a reward-per-level aggregate done by looping
+over quest records (quest_handler style) and on game_data.quest_columns.
+Reports whether NumPy or the array-module fallback was used.
+
+Usage: python benchmarks/bench_catalog_columns.py [entries]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import quest_handler
+from bench_catalog_cache import write_catalogs
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def loop_reward_by_level(quests):
+    groups = {}
+    for q in quests.values():
+        count, total = groups.get(q["required_level"], (0, 0))
+        groups[q["required_level"]] = (count + 1, total + q["reward_xp"])
+    return dict(sorted(groups.items()))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as folder:
+        path, _ = write_catalogs(folder, count)
+        quests = game_data.load_quests(path, use_cache=False)
+
+    cols, build = timed(lambda: game_data.quest_columns(quests))
+    rows = [
+        ("filter 10-20, loop", timed(lambda: len(quest_handler.get_quests_by_level(quests, 10, 20)))),
+        ("filter 10-20, columns", timed(lambda: len(game_data.select_quests_by_level(cols, 10, 20)))),
+        ("xp by level, loop", timed(lambda: len(loop_reward_by_level(quests)))),
+        ("xp by level, columns", timed(lambda: len(game_data.group_sum(cols["required_level"], cols["reward_xp"])))),
+    ]
+    backend = "numpy" if game_data.np is not None else "array fallback"
+    print(f"{count:,} quests ({backend}), columns built in {build * 1000:.1f} ms")
+    for label, (_, seconds) in rows:
+        print(f"  {label:24s} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
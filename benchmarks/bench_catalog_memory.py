@@ -0,0 +1,56 @@
+"""
+Benchmark: memory of a loaded quest catalog, dicts vs slotted records
+
+Uses tracemalloc to measure the memory held by a catalog built the old way
+(one dict per quest) and by game_data.load_quests (Quest records with
+interned ids).
+
+Usage: python benchmarks/bench_catalog_memory.py [entries]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_catalog_cache import write_catalogs
+
+
+def load_as_dicts(path):
+    quests = {}
+    with open(path, encoding="utf-8") as fh:
+        for _, q in game_data._iter_kv_blocks(fh):
+            for k in ("reward_xp", "reward_gold", "required_level"):
+                q[k] = int(q[k])
+            quests[q["quest_id"]] = q
+    return quests
+
+
+def measure(loader, path):
+    tracemalloc.start()
+    catalog = loader(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(catalog), current, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as folder:
+        quests, _ = write_catalogs(folder, count)
+        rows = [
+            ("dict per quest", measure(load_as_dicts, quests)),
+            ("Quest records", measure(lambda p: game_data.load_quests(p, use_cache=False), quests)),
+        ]
+    base = rows[0][1][1]
+    print(f"{count:,} quests")
+    for label, (n, current, peak) in rows:
+        print(f"  {label:16s} held {current / 2**20:8.1f} MiB  "
+              f"({current / n:6.0f} B/quest, x{current / base:4.2f})  peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: hot reload of a single edited quest
+
+Opens a CatalogWatcher on a large synthetic quest file, edits one quest in
+the middle of it and times the poll() that picks up the change, compared with
+a full load_quests parse of the same file.
+
+Usage: python benchmarks/bench_catalog_reload.py [entries]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import catalog_watcher
+from bench_catalog_cache import write_catalogs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as folder:
+        quests, _ = write_catalogs(folder, count)
+        watcher = catalog_watcher.CatalogWatcher(quests, "quests")
+
+        target = f"QUEST_ID: quest_{count // 2}\nTITLE: "
+        with open(quests) as fh:
+            text = fh.read()
+        with open(quests, "w") as fh:
+            fh.write(text.replace(target, target + "Edited "))
+        st = os.stat(quests)
+        os.utime(quests, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        start = time.perf_counter()
+        diff = watcher.poll()
+        reload_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        game_data.load_quests(quests, use_cache=False)
+        full_time = time.perf_counter() - start
+
+        print(f"{count:,} quests, diff {diff}")
+        print(f"  incremental reload {reload_time * 1000:8.1f} ms")
+        print(f"  full re-parse      {full_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
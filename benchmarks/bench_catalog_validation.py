@@ -0,0 +1,36 @@
+"""
+Benchmark: full-report catalog validation at growing sizes
+
+Runs game_data.validate_catalog over generated quest catalogs of increasing
+size and prints the time per entry, which should stay roughly flat.
+
+Usage: python benchmarks/bench_catalog_validation.py [largest]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import catalog_generator
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sizes = [n for n in (10000, 100000, 1000000, 10000000) if n <= largest]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "quests.txt")
+        for count in sizes:
+            catalog_generator.generate_quests(path, count)
+            start = time.perf_counter()
+            report = game_data.validate_catalog(path, "quests")
+            seconds = time.perf_counter() - start
+            print(f"{count:>10,} quests  {seconds:8.2f}s  "
+                  f"{seconds / count * 1e6:6.2f} us/entry  errors={len(report['errors'])}")
+
+
+if __name__ == "__main__":
+    main()
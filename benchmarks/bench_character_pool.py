@@ -0,0 +1,68 @@
+"""
+Benchmark: CharacterPool vs per-dict stat updates
+
+Runs one round of gain_experience, heal_character, add_gold and
+revive_character over a population, first as a loop over character dicts and
+then as CharacterPool column operations. The pool's speedup depends on
+NumPy; without it the pool falls back to array-module loops.
+
+Usage: python benchmarks/bench_character_pool.py [characters]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import character_pool
+
+
+def dict_round(characters, xp, heal, gold):
+    for i, char in enumerate(characters):
+        character_manager.gain_experience(char, xp[i])
+        character_manager.heal_character(char, heal)
+        character_manager.add_gold(char, gold[i])
+        character_manager.revive_character(char)
+
+
+def pool_round(pool, xp, heal, gold):
+    pool.gain_experience(xp)
+    pool.heal(heal)
+    pool.add_gold(gold)
+    pool.revive()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(0)
+    classes = list(character_manager.get_class_templates())
+    characters = character_manager.create_characters(
+        (f"npc_{i}", classes[i % len(classes)]) for i in range(count))
+    xp = [rng.randrange(5000) for _ in range(count)]
+    gold = [rng.randrange(100) for _ in range(count)]
+
+    start = time.perf_counter()
+    pool = character_pool.CharacterPool.from_characters(characters)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dict_round(characters, xp, 5, gold)
+    per_dict = time.perf_counter() - start
+
+    xp_column, gold_column = pool._amounts(xp), pool._amounts(gold)
+    start = time.perf_counter()
+    pool_round(pool, xp_column, 5, gold_column)
+    pooled = time.perf_counter() - start
+
+    assert pool.to_characters() == characters
+    backend = "numpy" if character_pool.np is not None else "array"
+    print(f"{count:,} characters ({backend} columns, pool built in {built:.2f}s)")
+    print(f"  dict loop  {per_dict:8.3f}s  {count / per_dict:12,.0f} characters/s")
+    print(f"  pool       {pooled:8.3f}s  {count / pooled:12,.0f} characters/s  ({per_dict / pooled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark: character creation throughput
+
+Compares create_character in a loop with create_characters for one bulk
+batch of (name, class) specs.
+
+Usage: python benchmarks/bench_create_characters.py [characters]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    classes = list(character_manager.get_class_templates())
+    specs = [(f"npc_{i}", classes[i % len(classes)]) for i in range(count)]
+
+    start = time.perf_counter()
+    single = [character_manager.create_character(name, cls) for name, cls in specs]
+    one_by_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = character_manager.create_characters(specs)
+    batched = time.perf_counter() - start
+
+    assert single == bulk
+    print(f"{count:,} characters")
+    print(f"  create_character  {count / one_by_one:12,.0f}/s")
+    print(f"  create_characters {count / batched:12,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: enemy spawning throughput
+
+Times create_enemy for base enemies and for level-scaled enemies (cached per
+type and level), and get_random_enemy_for_level over levels 1-20, against
+the target of 100,000 enemies per second.
+
+Usage: python benchmarks/bench_create_enemies.py [enemies]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+
+TARGET = 100000
+
+
+def rate(count, spawn):
+    start = time.perf_counter()
+    spawn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    types = list(combat_system.get_enemy_prototypes())
+    plan = [(types[i % len(types)], 1 + i % 20) for i in range(count)]
+    create = combat_system.create_enemy
+
+    results = [
+        ("create_enemy(type)", rate(count, lambda: [create(t) for t, _ in plan])),
+        ("create_enemy(type, level)", rate(count, lambda: [create(t, l) for t, l in plan])),
+        ("get_random_enemy_for_level", rate(count, lambda: [combat_system.get_random_enemy_for_level(l)
+                                                            for _, l in plan])),
+    ]
+    print(f"{count:,} enemies (target {TARGET:,}/s)")
+    for label, per_second in results:
+        verdict = "ok" if per_second >= TARGET else "BELOW TARGET"
+        print(f"  {label:<28} {per_second:12,.0f}/s  {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: encounter sampling throughput
+
+Compares alias-table draws with random.choices (which bisects cumulative
+weights on every call) for tables of growing size, then times
+sample_enemies and get_random_enemy_for_level on the real encounter data.
+
+Usage: python benchmarks/bench_encounters.py [draws]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+
+
+def per_second(count, run):
+    start = time.perf_counter()
+    run()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    rng = random.Random(0)
+    print(f"{draws:,} draws")
+    for size in (3, 30, 300):
+        weights = [rng.randint(1, 100) for _ in range(size)]
+        table = combat_system.AliasTable(weights)
+        population = range(size)
+        alias = per_second(draws, lambda: [table.sample(rng) for _ in range(draws)])
+        batch = per_second(draws, lambda: table.sample_many(draws, rng))
+        choices = per_second(draws, lambda: [rng.choices(population, weights)[0] for _ in range(draws)])
+        print(f"  {size:>3} enemies: sample {alias:12,.0f}/s  sample_many {batch:12,.0f}/s  "
+              f"random.choices {choices:12,.0f}/s")
+
+    combat_system.load_encounter_tables()
+    enemies = per_second(draws, lambda: combat_system.sample_enemies(7, draws, rng))
+    single = per_second(draws, lambda: [combat_system.get_random_enemy_for_level(7, rng) for _ in range(draws)])
+    print(f"  sample_enemies(7, n)          {enemies:12,.0f} enemies/s")
+    print(f"  get_random_enemy_for_level(7) {single:12,.0f} enemies/s")
+
+
+if __name__ == "__main__":
+    main()
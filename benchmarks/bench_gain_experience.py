@@ -0,0 +1,54 @@
+"""
+Benchmark: gain_experience for huge XP grants
+
+Times character_manager.gain_experience with the closed-form linear curve
+and a bisect table curve against the old one-level-at-a-time loop, for
+grants up to 10^9 XP.
+
+Usage: python benchmarks/bench_gain_experience.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def loop_gain_experience(character, xp_amount):
+    character["experience"] += xp_amount
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+    return character
+
+
+def time_grant(function, xp, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        char = character_manager.create_character("Bench", "Warrior")
+        function(char, xp)
+    return (time.perf_counter() - start) / repeat, char["level"]
+
+
+def main():
+    table = character_manager.TableXPCurve.from_function(lambda level: level * 100, 5000)
+    for xp in (10 ** 3, 10 ** 6, 10 ** 9):
+        loop, level = time_grant(loop_gain_experience, xp, 3 if xp >= 10 ** 9 else 100)
+        closed, closed_level = time_grant(character_manager.gain_experience, xp, 10000)
+        previous = character_manager.set_xp_curve(table)
+        tabled, _ = time_grant(character_manager.gain_experience, xp, 10000)
+        character_manager.set_xp_curve(previous)
+        assert closed_level == level
+        print(f"  {xp:>13,} XP -> level {level:>6,}  loop {loop * 1e6:10.1f} us  "
+              f"closed form {closed * 1e6:6.2f} us  table {tabled * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: eager vs lazy catalog startup
+
+Compares game_data.load_quests (parse everything) with
+game_data.open_quest_catalog (index only, decode on access) for opening a
+large catalog and looking up a small fraction of its quests.
+
+Usage: python benchmarks/bench_lazy_catalog.py [entries] [lookups]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_catalog_cache import write_catalogs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(1)
+    wanted = [f"quest_{rng.randrange(count)}" for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        quests, _ = write_catalogs(folder, count)
+
+        start = time.perf_counter()
+        eager = game_data.load_quests(quests, use_cache=False)
+        for qid in wanted:
+            eager[qid]
+        eager_time = time.perf_counter() - start
+
+        rows = []
+        for label in ("lazy, index build", "lazy, index cached"):
+            start = time.perf_counter()
+            catalog = game_data.open_quest_catalog(quests)
+            opened = time.perf_counter() - start
+            for qid in wanted:
+                catalog[qid]
+            rows.append((label, opened, time.perf_counter() - start))
+            catalog.close()
+
+        print(f"{count:,} quests, {lookups:,} lookups")
+        print(f"  {'eager load_quests':20s} total {eager_time:7.3f}s")
+        for label, opened, total in rows:
+            print(f"  {label:20s} open {opened:7.3f}s  total {total:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
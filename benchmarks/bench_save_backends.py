@@ -0,0 +1,71 @@
+"""
+Benchmark: save directory vs SQLite save backend
+
+Saves, lists and loads the same generated characters through
+character_manager with files and with save_backends.SQLiteSaveBackend
+(one transaction per save and one batched transaction), and times migrating
+the save directory into a fresh database.
+
+Usage: python benchmarks/bench_save_backends.py [characters]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+from bench_save_formats import make_characters
+
+
+def run(label, characters, folder, batched=None):
+    count = len(characters)
+    start = time.perf_counter()
+    if batched is not None:
+        batched.save_many(characters)
+    else:
+        for char in characters:
+            character_manager.save_character(char, folder, save_format="binary")
+    saved = time.perf_counter() - start
+
+    start = time.perf_counter()
+    names = character_manager.list_saved_characters(folder)
+    listed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in names:
+        character_manager.load_character(name, folder)
+    loaded = time.perf_counter() - start
+    print(f"  {label:16s} save {count / saved:10,.0f}/s  list {listed * 1000:8.1f} ms  "
+          f"load {count / loaded:10,.0f}/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    characters = make_characters(count)
+    print(f"{count:,} characters")
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "save_games")
+        run("files", characters, folder)
+
+        for label, batched in (("sqlite", False), ("sqlite batched", True)):
+            database = os.path.join(tmp, f"{label.replace(' ', '_')}.db")
+            with save_backends.SQLiteSaveBackend(database) as backend:
+                previous = character_manager.set_save_backend(backend)
+                try:
+                    run(label, characters, folder, backend if batched else None)
+                finally:
+                    character_manager.set_save_backend(previous)
+
+        with save_backends.SQLiteSaveBackend(os.path.join(tmp, "migrated.db")) as backend:
+            start = time.perf_counter()
+            migrated, _ = save_backends.migrate_save_directory(folder, backend)
+            elapsed = time.perf_counter() - start
+        print(f"  migrate {migrated:,} saves in {elapsed:.2f}s ({migrated / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
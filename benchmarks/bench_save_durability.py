@@ -0,0 +1,44 @@
+"""
+Benchmark: cost of each save durability level
+
+Saves the same generated characters with every level in
+character_manager.DURABILITY_LEVELS, with and without .bak backups, and
+reports saves per second and mean latency. The numbers depend heavily on
+the disk; run it on the machine you care about.
+
+Usage: python benchmarks/bench_save_durability.py [characters] [folder]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from bench_save_formats import make_characters
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    parent = sys.argv[2] if len(sys.argv) > 2 else None
+    characters = make_characters(count)
+    print(f"{count:,} binary saves")
+    for backup in (False, True):
+        for level in character_manager.DURABILITY_LEVELS:
+            with tempfile.TemporaryDirectory(dir=parent) as folder:
+                # first pass creates the files so every timed save replaces one
+                for char in characters:
+                    character_manager.save_character(char, folder, "binary", durability="none")
+                start = time.perf_counter()
+                for char in characters:
+                    character_manager.save_character(char, folder, "binary",
+                                                     durability=level, backup=backup)
+                elapsed = time.perf_counter() - start
+            label = level + (" +bak" if backup else "")
+            print(f"  {label:15s} {count / elapsed:10,.0f} saves/s  {elapsed / count * 1e6:8.1f} us/save")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: text vs binary save format throughput
+
+Saves and then loads the same set of generated characters in each format
+with character_manager and reports characters per second.
+
+Usage: python benchmarks/bench_save_formats.py [characters]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def make_characters(count, seed=0):
+    rng = random.Random(seed)
+    characters = []
+    for i in range(count):
+        char = character_manager.create_character(f"hero_{i:07d}", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"]))
+        character_manager.gain_experience(char, rng.randrange(20000))
+        char["inventory"] = [f"item_{rng.randrange(500)}" for _ in range(rng.randrange(12))]
+        char["completed_quests"] = [f"quest_{rng.randrange(2000)}" for _ in range(rng.randrange(15))]
+        char["active_quests"] = [f"quest_{rng.randrange(2000)}" for _ in range(rng.randrange(3))]
+        characters.append(char)
+    return characters
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    characters = make_characters(count)
+    print(f"{count:,} characters")
+    for save_format in character_manager.SAVE_FORMATS:
+        with tempfile.TemporaryDirectory() as folder:
+            start = time.perf_counter()
+            for char in characters:
+                character_manager.save_character(char, folder, save_format=save_format)
+            saved = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for char in characters:
+                character_manager.load_character(char["name"], folder)
+            loaded = time.perf_counter() - start
+
+            size = sum(e.stat().st_size for e in os.scandir(folder))
+        print(f"  {save_format:7s} save {count / saved:10,.0f}/s  load {count / loaded:10,.0f}/s  "
+              f"{size / count:6.0f} B/character")
+
+    start = time.perf_counter()
+    for char in characters:
+        character_manager.decode_character(character_manager.encode_character(char))
+    codec = time.perf_counter() - start
+    print(f"  binary encode+decode only {count / codec:10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
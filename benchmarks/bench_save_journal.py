@@ -0,0 +1,57 @@
+"""
+Benchmark: small-change saves, full binary rewrite vs journal
+
+Each round changes gold and experience of every character (as after a
+battle) and saves it, first with the binary format and then with the
+journal format. Reports saves per second and the bytes written per save.
+
+Usage: python benchmarks/bench_save_journal.py [characters] [rounds]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from bench_save_formats import make_characters
+
+
+def folder_size(folder):
+    return sum(e.stat().st_size for e in os.scandir(folder))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{count:,} characters x {rounds} small changes")
+    for save_format in ("binary", "journal"):
+        characters = make_characters(count)
+        with tempfile.TemporaryDirectory() as folder:
+            for char in characters:
+                character_manager.save_character(char, folder, save_format, durability="none")
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for char in characters:
+                    char["gold"] += 7
+                    char["experience"] += 3
+                    character_manager.save_character(char, folder, save_format, durability="none")
+            elapsed = time.perf_counter() - start
+            saves = count * rounds
+            if save_format == "binary":
+                written = folder_size(folder) * rounds
+            else:
+                written = sum(e.stat().st_size for e in os.scandir(folder)
+                              if e.name.endswith(character_manager.JOURNAL_SUFFIX))
+            start = time.perf_counter()
+            for char in characters:
+                character_manager.load_character(char["name"], folder)
+            loaded = time.perf_counter() - start
+        print(f"  {save_format:8s} save {saves / elapsed:10,.0f}/s  ~{written / saves:6.0f} B written/save  "
+              f"load {count / loaded:10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: sharded catalog loading, serial vs process pool
+
+Splits a synthetic quest catalog into shards and times game_data.load_quests
+on the directory with one worker and with one worker per core. The compiled
+cache is disabled so every shard is parsed.
+
+Usage: python benchmarks/bench_sharded_catalog.py [entries] [shards]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_catalog_cache import write_catalogs
+
+
+def split_into_shards(source, folder, shards):
+    with open(source) as fh:
+        blocks = fh.read().split("\n\n")
+    blocks = [b for b in blocks if b.strip()]
+    per_shard = -(-len(blocks) // shards)
+    for n in range(shards):
+        part = blocks[n * per_shard:(n + 1) * per_shard]
+        with open(os.path.join(folder, f"quests_{n:03d}.txt"), "w") as fh:
+            fh.write("\n\n".join(part) + "\n")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    shards = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1) * 2
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as folder:
+        source, _ = write_catalogs(folder, count)
+        shard_dir = os.path.join(folder, "shards")
+        os.makedirs(shard_dir)
+        split_into_shards(source, shard_dir, shards)
+
+        results = {}
+        for workers in sorted({1, cores}):
+            start = time.perf_counter()
+            game_data.load_quests(shard_dir, use_cache=False, workers=workers)
+            results[workers] = time.perf_counter() - start
+
+        print(f"{count:,} quests in {shards} shards, {cores} cores")
+        for workers, seconds in results.items():
+            print(f"  workers={workers:<3d} {seconds:7.3f}s  "
+                  f"speedup x{results[1] / seconds:4.1f}")
+        slowest = max(game_data.last_shard_timings, key=lambda t: t["seconds"])
+        print(f"  slowest shard: {os.path.basename(slowest['path'])} "
+              f"{slowest['entries']:,} entries in {slowest['seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
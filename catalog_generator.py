@@ -0,0 +1,171 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Generator Module
+
+Name: Isaiah Coleman
+
+This module writes large synthetic quest/item catalogs and save files for
+benchmarks. Output is fully determined by the seed, so runs are comparable.
+
+Usage:
+    python catalog_generator.py --out bench_data --quests 100000 --items 10000 --characters 1000 --seed 1
+"""
+
+import os
+import random
+import argparse
+import character_manager
+
+# ============================================================================
+# WORD LISTS
+# Titles, names and descriptions are stitched together from these so entries
+# have realistic, varied lengths.
+# ============================================================================
+
+ADJECTIVES = ["Ancient", "Burning", "Silent", "Frozen", "Hidden", "Cursed",
+              "Golden", "Shattered", "Wild", "Forgotten", "Crimson", "Hollow"]
+PLACES = ["Forest", "Crypt", "Mountain", "Harbor", "Swamp", "Citadel",
+          "Mine", "Village", "Tower", "Desert", "Marsh", "Ruins"]
+TASKS = ["Clear the {place} of monsters", "Recover the relic from the {place}",
+         "Escort the merchant through the {place}", "Investigate strange lights in the {place}",
+         "Hunt the beast that stalks the {place}", "Deliver supplies to the {place}"]
+ITEM_KINDS = {
+    "consumable": (["Potion", "Elixir", "Tonic", "Draught"], ["health", "strength", "magic"]),
+    "weapon": (["Sword", "Axe", "Staff", "Dagger", "Bow", "Mace"], ["strength", "magic"]),
+    "armor": (["Plate", "Robe", "Mail", "Helm", "Shield", "Cloak"], ["max_health", "magic"]),
+}
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# Quests extend one of at most this many open prerequisite chains, which keeps
+# memory flat no matter how many quests are written.
+MAX_OPEN_CHAINS = 1000
+MAX_QUEST_LEVEL = 60
+
+# ============================================================================
+# CATALOGS
+# ============================================================================
+
+# generate_quests(path, count, seed=0)
+# Writes count quests in the KEY: value block format.
+# About a fifth of quests start a new chain (PREREQUISITE: NONE, low level);
+# the rest continue an open chain with the same or a slightly higher level,
+# so prerequisites always point at an earlier quest of lower or equal level.
+# Rewards grow with required level. Returns count.
+def generate_quests(path, count, seed=0):
+    rng = random.Random(f"quests:{seed}")
+    chains = []  # [quest_id, level] of each open chain's last quest
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(count):
+            qid = f"quest_{i}"
+            if not chains or rng.random() < 0.2:
+                level = min(MAX_QUEST_LEVEL, 1 + int(rng.expovariate(0.15)))
+                prereq = "NONE"
+                if len(chains) < MAX_OPEN_CHAINS:
+                    chains.append([qid, level])
+                else:
+                    chains[rng.randrange(len(chains))] = [qid, level]
+            else:
+                chain = chains[rng.randrange(len(chains))]
+                prereq = chain[0]
+                level = min(MAX_QUEST_LEVEL, chain[1] + rng.choice((0, 0, 1, 1, 2)))
+                chain[0], chain[1] = qid, level
+            place = rng.choice(PLACES)
+            fh.write(
+                f"QUEST_ID: {qid}\n"
+                f"TITLE: The {rng.choice(ADJECTIVES)} {place} {i}\n"
+                f"DESCRIPTION: {rng.choice(TASKS).format(place=place.lower())}.\n"
+                f"REWARD_XP: {level * 50 + rng.randrange(50)}\n"
+                f"REWARD_GOLD: {level * 25 + rng.randrange(25)}\n"
+                f"REQUIRED_LEVEL: {level}\n"
+                f"PREREQUISITE: {prereq}\n\n"
+            )
+    return count
+
+
+# generate_items(path, count, seed=0)
+# Writes count items in the KEY: value block format, mixing consumables,
+# weapons and armor. About one weapon/armor in ten gets a second stat.
+# Cost follows the size of the effect. Returns count.
+def generate_items(path, count, seed=0):
+    rng = random.Random(f"items:{seed}")
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(count):
+            item_type = rng.choices(("consumable", "weapon", "armor"), (5, 3, 2))[0]
+            nouns, stats = ITEM_KINDS[item_type]
+            tier = 1 + int(rng.expovariate(0.4))
+            stat = rng.choice(stats)
+            amount = tier * (20 if stat in ("health", "max_health") else 3)
+            effect = f"{stat}:{amount}"
+            if item_type != "consumable" and rng.random() < 0.1:
+                extra = rng.choice([s for s in ("strength", "magic", "max_health") if s != stat])
+                effect += f",{extra}:{tier}"
+            fh.write(
+                f"ITEM_ID: item_{i}\n"
+                f"NAME: {rng.choice(ADJECTIVES)} {rng.choice(nouns)}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {effect}\n"
+                f"COST: {amount * 5 + rng.randrange(1, 20)}\n"
+                f"DESCRIPTION: A tier {tier} {item_type} found in the {rng.choice(PLACES).lower()}\n\n"
+            )
+    return count
+
+
+# ============================================================================
+# SAVES
+# ============================================================================
+
+# generate_saves(save_directory, count, seed=0, quest_count=0, item_count=0)
+# Creates count characters with random classes, levels, gold, inventories and
+# quest progress, and saves each with character_manager.save_character().
+# quest_count / item_count are the sizes of the generated catalogs, so saved
+# quest and item ids refer to entries that exist. Returns the names written.
+def generate_saves(save_directory, count, seed=0, quest_count=0, item_count=0):
+    rng = random.Random(f"saves:{seed}")
+    names = []
+    for i in range(count):
+        name = f"hero_{i:07d}"
+        character = character_manager.create_character(name, rng.choice(CLASSES))
+        character_manager.gain_experience(character, int(rng.expovariate(1 / 2000)))
+        character["gold"] += rng.randrange(1000)
+        if item_count:
+            character["inventory"] = [f"item_{rng.randrange(item_count)}"
+                                      for _ in range(rng.randrange(8))]
+        if quest_count:
+            done = rng.randrange(10)
+            character["completed_quests"] = [f"quest_{rng.randrange(quest_count)}" for _ in range(done)]
+            character["active_quests"] = [f"quest_{rng.randrange(quest_count)}"
+                                          for _ in range(rng.randrange(3))]
+        character_manager.save_character(character, save_directory)
+        names.append(name)
+    return names
+
+
+# generate_all(out_dir, quests, items, characters, seed=0)
+# Writes quests.txt, items.txt and a save_games folder under out_dir.
+# Returns the paths (quests_path, items_path, save_directory).
+def generate_all(out_dir, quests, items, characters, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    quests_path = os.path.join(out_dir, "quests.txt")
+    items_path = os.path.join(out_dir, "items.txt")
+    save_directory = os.path.join(out_dir, "save_games")
+    generate_quests(quests_path, quests, seed)
+    generate_items(items_path, items, seed)
+    if characters:
+        generate_saves(save_directory, characters, seed, quests, items)
+    return quests_path, items_path, save_directory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Quest Chronicles data.")
+    parser.add_argument("--out", default="bench_data", help="output folder")
+    parser.add_argument("--quests", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--characters", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = generate_all(args.out, args.quests, args.items, args.characters, args.seed)
+    print("Wrote " + ", ".join(paths))
+
+
+if __name__ == "__main__":
+    main()
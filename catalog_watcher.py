@@ -0,0 +1,209 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Watcher Module
+
+Name: Isaiah Coleman
+
+This module hot-reloads quest and item catalogs while the game is running.
+"""
+
+import os
+import game_data
+from custom_exceptions import MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+
+# ============================================================================
+# CHANGE DETECTION
+# A watcher keeps the raw bytes of the last good version of its file. When the
+# file's inode, size or mtime changes, the new bytes are compared with the old
+# ones to find the smallest changed region, which is then widened to whole
+# blocks. Only blocks inside that region are looked at and only added or
+# edited blocks are parsed, so a one-quest tweak costs a byte compare of the
+# file plus one block parse. Ids are assumed to be unique within the file.
+# ============================================================================
+
+COMPARE_CHUNK = 1 << 20
+
+
+# _stat_key(filename)
+# Returns (inode, size, mtime_ns), which changes on any edit or file replace.
+def _stat_key(filename):
+    st = os.stat(filename)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+# _read_bytes(filename)
+# Reads the whole data file as bytes.
+def _read_bytes(filename):
+    with open(filename, "rb") as fh:
+        return fh.read()
+
+
+# _common_prefix(a, b)
+# Length of the longest common prefix of two byte strings.
+# Compares 1 MB chunks first, then bisects inside the first differing chunk.
+def _common_prefix(a, b):
+    n = min(len(a), len(b))
+    lo = 0
+    while lo < n:
+        hi = min(lo + COMPARE_CHUNK, n)
+        if a[lo:hi] != b[lo:hi]:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if a[lo:mid] == b[lo:mid]:
+                    lo = mid
+                else:
+                    hi = mid
+            return lo
+        lo = hi
+    return n
+
+
+# _common_suffix(a, b, limit)
+# Length of the longest common suffix of two byte strings, at most limit.
+def _common_suffix(a, b, limit):
+    la, lb = len(a), len(b)
+    lo = 0
+    while lo < limit:
+        hi = min(lo + COMPARE_CHUNK, limit)
+        if a[la - hi:la - lo] != b[lb - hi:lb - lo]:
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if a[la - mid:la - lo] == b[lb - mid:lb - lo]:
+                    lo = mid
+                else:
+                    hi = mid
+            return lo
+        lo = hi
+    return limit
+
+
+# _changed_region(old, new)
+# Finds the byte ranges of old and new that differ, widened to whole blocks.
+# The widening only stops at a blank line ("\n\n") inside the shared prefix
+# or suffix, so both ranges start and end on the same block boundaries.
+# Returns (start, old_end, new_end).
+def _changed_region(old, new):
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+
+    start = new.rfind(b"\n\n", 0, prefix)
+    start = 0 if start < 0 else start + 1
+
+    new_end = len(new) - suffix
+    boundary = new.find(b"\n\n", new_end)
+    if boundary < 0:
+        return start, len(old), len(new)
+    return start, boundary + 1 - len(new) + len(old), boundary + 1
+
+
+# _region_blocks(data, start, end, kind)
+# Returns id -> (offset, length) for the blocks inside data[start:end],
+# with offsets relative to the whole of data.
+def _region_blocks(data, start, end, kind):
+    index = game_data._build_block_index(data[start:end], kind)
+    return {key: (start + off, length) for key, (off, length) in index.items()}
+
+
+# ============================================================================
+# WATCHER
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Polls one quest or item file and keeps `catalog` up to date.
+    Each reload builds a new dict and swaps it in with a single assignment;
+    the previous dict is never modified, so sessions holding it keep a
+    consistent (older) view. Unchanged entries are shared between versions.
+    """
+
+    def __init__(self, filename, kind):
+        if kind not in game_data._CATALOG_KINDS:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        if not os.path.exists(filename):
+            label = game_data._CATALOG_KINDS[kind][0]
+            raise MissingDataFileError(f"{label} data file not found: {filename}")
+        self.filename = filename
+        self.kind = kind
+        self.reloads = 0
+        self.last_diff = None
+
+        self._stat = _stat_key(filename)
+        self._raw = _read_bytes(filename)
+        if _stat_key(filename) == self._stat:
+            # file is stable: the compiled cache can supply the entries
+            self.catalog = game_data._load_catalog_file(filename, kind, True)
+        else:
+            self._stat = _stat_key(filename)
+            self._raw = _read_bytes(filename)
+            self.catalog = self._parse_blocks(self._raw, _region_blocks(self._raw, 0, len(self._raw), kind))
+
+    def _parse_blocks(self, data, blocks):
+        # blocks: id -> (offset, length); returns id -> built entry
+        builder = game_data._CATALOG_KINDS[self.kind][2]
+        entries = {}
+        line, counted = 1, 0
+        for key, (offset, length) in sorted(blocks.items(), key=lambda kv: kv[1][0]):
+            line += data.count(b"\n", counted, offset)
+            counted = offset
+            try:
+                text = data[offset:offset + length].decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise CorruptedDataError(f"Could not decode data file (line {line}): {e}")
+            for line_no, entry in game_data._iter_kv_blocks(text.splitlines(), line):
+                entries[key] = builder(entry, line_no)
+        return entries
+
+    def poll(self):
+        """
+        Check the file and reload it if it changed.
+        Returns None when nothing changed, otherwise a diff dict with sorted
+        "added", "changed" and "removed" id lists.
+        Raises InvalidDataFormatError/CorruptedDataError if the new version is
+        bad; the current catalog is kept and the next edit is diffed against
+        the last good version.
+        """
+        try:
+            stat = _stat_key(self.filename)
+        except OSError:
+            # file is being replaced; try again on the next poll
+            return None
+        if stat == self._stat:
+            return None
+        self._stat = stat
+        try:
+            new_raw = _read_bytes(self.filename)
+        except OSError as e:
+            raise CorruptedDataError(f"Could not read data file: {e}")
+
+        start, old_end, new_end = _changed_region(self._raw, new_raw)
+        old_blocks = _region_blocks(self._raw, start, old_end, self.kind)
+        new_blocks = _region_blocks(new_raw, start, new_end, self.kind)
+
+        removed = old_blocks.keys() - new_blocks.keys()
+        added = new_blocks.keys() - old_blocks.keys()
+        changed = set()
+        for key in old_blocks.keys() & new_blocks.keys():
+            off_o, len_o = old_blocks[key]
+            off_n, len_n = new_blocks[key]
+            # surrounding whitespace depends on the neighbours, not the block
+            if self._raw[off_o:off_o + len_o].strip() != new_raw[off_n:off_n + len_n].strip():
+                changed.add(key)
+
+        parsed = self._parse_blocks(new_raw, {k: new_blocks[k] for k in added | changed})
+        catalog = dict(self.catalog)
+        for key in removed:
+            catalog.pop(key, None)
+        catalog.update(parsed)
+        if not catalog:
+            label = game_data._CATALOG_KINDS[self.kind][0]
+            raise InvalidDataFormatError(f"{label} data file is empty or invalid.")
+
+        self._raw = new_raw
+        self.catalog = catalog
+        self.reloads += 1
+        self.last_diff = {
+            "added": sorted(added),
+            "changed": sorted(changed),
+            "removed": sorted(removed),
+        }
+        return self.last_diff
@@ -11,46 +11,90 @@ This module handles character creation, loading, and saving.
 """
  
 import os
+import sys
+import math
+import bisect
+import struct
+import shutil
+import zlib
+import tempfile
+import asyncio
+import weakref
+import threading
+import functools
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, OrderedDict
+import game_data
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
-    CharacterDeadError
+    CharacterDeadError,
+    MissingDataFileError
 )
 
 # ==============================================================================
 # CHARACTER CREATION - Creates a new character dictionary using the selected class.
-   #Validates that the chosen class is allowed.
-   #Assigns base starting stats depending on the class.
-    #Initializes inventory, quest lists, gold, and experience.
+   #Looks the class up in the class template registry (data/classes.txt).
+   #Raises InvalidCharacterClassError for an unknown class.
+   #Assigns the template's starting stats and gold.
+    #Initializes inventory, quest lists, and experience.
     #Returns a fully structured character object ready for gameplay.
+# create_characters(specs) does the same for many (name, class) pairs at once.
 # ==============================================================================
 
-def create_character(name, character_class):
-    valid_classes = ["Warrior", "Mage", "Rogue", "Cleric"]
+CLASS_DATA_FILE = "data/classes.txt"
 
-    if character_class not in valid_classes:
-        raise InvalidCharacterClassError("Invalid character class.")
+# Used when the class data file is missing
+DEFAULT_CLASS_TEMPLATES = {
+    "Warrior": {"class": "Warrior", "health": 120, "strength": 15, "magic": 5, "gold": 100},
+    "Mage": {"class": "Mage", "health": 80, "strength": 8, "magic": 20, "gold": 100},
+    "Rogue": {"class": "Rogue", "health": 90, "strength": 12, "magic": 10, "gold": 100},
+    "Cleric": {"class": "Cleric", "health": 100, "strength": 10, "magic": 15, "gold": 100},
+}
+
+# class name -> (class, health, strength, magic, gold); filled on first use
+_class_rows = None
+
+
+def load_class_templates(filename=CLASS_DATA_FILE):
+    """
+    (Re)load the class registry from filename, falling back to
+    DEFAULT_CLASS_TEMPLATES if the file does not exist.
+    Returns class name -> template dict.
+    """
+    global _class_rows
+    try:
+        templates = game_data.load_classes(filename)
+    except MissingDataFileError:
+        templates = DEFAULT_CLASS_TEMPLATES
+    _class_rows = {
+        name: (t["class"], t["health"], t["strength"], t["magic"], t["gold"])
+        for name, t in templates.items()
+    }
+    return get_class_templates()
 
-    # Assign base stats
-    if character_class == "Warrior":
-        health = 120
-        strength = 15
-        magic = 5
-    elif character_class == "Mage":
-        health = 80
-        strength = 8
-        magic = 20
-    elif character_class == "Rogue":
-        health = 90
-        strength = 12
-        magic = 10
-    elif character_class == "Cleric":
-        health = 100
-        strength = 10
-        magic = 15
 
+def get_class_templates():
+    """Return class name -> template dict for every registered class."""
+    return {name: dict(zip(game_data.CLASS_FIELDS, row)) for name, row in _registry().items()}
+
+
+def _registry():
+    if _class_rows is None:
+        load_class_templates()
+    return _class_rows
+
+
+def create_character(name, character_class):
+    rows = _registry()
+    row = rows.get(character_class)
+    if row is None:
+        raise InvalidCharacterClassError("Invalid character class.")
+
+    character_class, health, strength, magic, gold = row
     return {
         "name": name,
         "class": character_class,
@@ -60,59 +104,712 @@ def create_character(name, character_class):
         "strength": strength,
         "magic": magic,
         "experience": 0,
-        "gold": 100,
+        "gold": gold,
         "inventory": [],
         "active_quests": [],
         "completed_quests": []
     }
 
+
+def create_characters(specs):
+    """
+    Create many characters from (name, character_class) pairs.
+    Returns the list of characters in the same order. Raises
+    InvalidCharacterClassError on the first unknown class.
+    """
+    rows = _registry()
+    characters = []
+    append = characters.append
+    for name, character_class in specs:
+        row = rows.get(character_class)
+        if row is None:
+            raise InvalidCharacterClassError(f"Invalid character class: {character_class}")
+        cls, health, strength, magic, gold = row
+        append({
+            "name": name, "class": cls, "level": 1,
+            "health": health, "max_health": health,
+            "strength": strength, "magic": magic,
+            "experience": 0, "gold": gold,
+            "inventory": [], "active_quests": [], "completed_quests": []
+        })
+    return characters
+
+# ==============================================================================
+# SAVE FORMATS
+# "text" is the original KEY:value file (name_save.txt).
+# "binary" (name_save.bin) is a versioned, length-prefixed format:
+#   header      6-byte magic b"QCSAVE" + 1-byte format version
+#   strings     count, the byte length of each string, then the UTF-8 bytes
+#               of all strings back to back. Every name, class, item id and
+#               quest id is stored once and referred to by its index.
+#   name/class  two string indexes
+#   stats       level, health, max_health, strength, magic, experience, gold
+#               as signed 64-bit integers
+#   lists       the lengths of inventory, active_quests and completed_quests,
+#               then all of their string indexes in that order
+# All integers are little-endian. Item and quest ids may contain any
+# character, including the commas and colons that break the text format.
+# "journal" keeps a binary snapshot plus an append-only change log
+# (name_save.journal); see JOURNAL SAVES below.
+# ==============================================================================
+
+SAVE_FORMATS = ("text", "binary", "journal")
+DEFAULT_SAVE_FORMAT = "text"
+SAVE_SUFFIXES = {"text": "_save.txt", "binary": "_save.bin"}
+
+STAT_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+BINARY_MAGIC = b"QCSAVE"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<6sBI")
+_BODY = struct.Struct("<II7q3I")
+# array typecode for unsigned 32-bit ints (lengths and string indexes)
+_U32 = "I" if array("I").itemsize == 4 else "L"
+_SWAP = sys.byteorder == "big"
+
+
+def _save_path(character_name, save_directory, save_format):
+    return os.path.join(save_directory, f"{character_name}{SAVE_SUFFIXES[save_format]}")
+
+# ==============================================================================
+# ATOMIC WRITES
+# A save is written to a temp file in the save directory and then renamed
+# over the old save with os.replace, so a crash mid-write leaves either the
+# old save or the new one, never a truncated file. Temp files that a crash
+# leaves behind end in ".tmp" and are ignored by list_saved_characters.
+# Durability picks how much survives a power loss, fastest first:
+#   "none"       no fsync; the rename alone only protects against crashes
+#                of the game itself
+#   "file"       fsync the new file before the rename
+#   "directory"  also fsync the directory so the rename itself is on disk
+# With backups on, the previous save is kept as <save file>.bak.
+# mkstemp creates temp files as 0600, so the temp file is given the old
+# save's permissions (or the umask default for a new save) before the rename.
+# ==============================================================================
+
+DURABILITY_LEVELS = ("none", "file", "directory")
+DEFAULT_DURABILITY = "file"
+KEEP_BACKUPS = False
+BACKUP_SUFFIX = ".bak"
+
+# os.umask can only be read by setting it, so it is read once at import
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def _fsync_directory(folder):
+    # directories cannot be opened for fsync on Windows
+    if os.name == "nt":
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_mode(filename):
+    # permissions a plain open(filename, "wb") would leave the file with
+    try:
+        return os.stat(filename).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _atomic_write(filename, data, durability, backup):
+    folder = os.path.dirname(filename) or "."
+    fd, temp = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp", dir=folder)
+    try:
+        os.chmod(temp, _file_mode(filename))
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            if durability != "none":
+                file.flush()
+                os.fsync(file.fileno())
+        if backup and os.path.exists(filename):
+            # hard link: the old save stays in place until the rename below
+            backup_file = filename + BACKUP_SUFFIX
+            if os.path.exists(backup_file):
+                os.remove(backup_file)
+            try:
+                os.link(filename, backup_file)
+            except OSError:
+                shutil.copy2(filename, backup_file)
+        os.replace(temp, filename)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+    if durability == "directory":
+        _fsync_directory(folder)
+
+
+def encode_text_character(character):
+    """Encode character in the text save format (returns bytes)."""
+    lines = [f"{key.upper()}:{character[key]}\n" for key in ("name", "class") + STAT_FIELDS]
+    lines.append("INVENTORY:" + ",".join(character["inventory"]) + "\n")
+    lines.append("ACTIVE_QUESTS:" + ",".join(character["active_quests"]) + "\n")
+    lines.append("COMPLETED_QUESTS:" + ",".join(character["completed_quests"]) + "\n")
+    return "".join(lines).encode("utf-8")
+
+
+def _u32_bytes(values):
+    packed = array(_U32, values)
+    if _SWAP:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _u32_array(data, pos, count):
+    values = array(_U32)
+    values.frombytes(data[pos:pos + 4 * count])
+    if len(values) != count:
+        raise InvalidSaveDataError("Save file is truncated.")
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def encode_character(character):
+    """Encode a character dict into the binary save format. Returns bytes."""
+    lists = [character[key] for key in LIST_FIELDS]
+    table = list(dict.fromkeys([character["name"], character["class"],
+                                *lists[0], *lists[1], *lists[2]]))
+    index = {value: i for i, value in enumerate(table)}
+    raw = [value.encode("utf-8") for value in table]
+
+    return b"".join((
+        _HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(raw)),
+        _u32_bytes(map(len, raw)),
+        b"".join(raw),
+        _BODY.pack(index[character["name"]], index[character["class"]],
+                   *[character[key] for key in STAT_FIELDS],
+                   *map(len, lists)),
+        _u32_bytes([index[value] for values in lists for value in values]),
+    ))
+
+
+def decode_character(data):
+    """
+    Decode bytes produced by encode_character() back into a character dict.
+    Raises InvalidSaveDataError if the data is not a valid binary save.
+    """
+    try:
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != BINARY_MAGIC:
+            raise InvalidSaveDataError("Not a binary save file.")
+        if version != BINARY_VERSION:
+            raise InvalidSaveDataError(f"Unsupported save format version {version}.")
+        pos = _HEADER.size
+
+        lengths = _u32_array(data, pos, count)
+        pos += 4 * count
+        strings = []
+        for length in lengths:
+            strings.append(data[pos:pos + length].decode("utf-8"))
+            pos += length
+
+        fields = _BODY.unpack_from(data, pos)
+        pos += _BODY.size
+        character = {"name": strings[fields[0]], "class": strings[fields[1]]}
+        character.update(zip(STAT_FIELDS, fields[2:9]))
+
+        refs = _u32_array(data, pos, sum(fields[9:]))
+        pos += 4 * len(refs)
+        start = 0
+        for key, size in zip(LIST_FIELDS, fields[9:]):
+            character[key] = [strings[i] for i in refs[start:start + size]]
+            start += size
+    except InvalidSaveDataError:
+        raise
+    except Exception:
+        raise InvalidSaveDataError("Save file contains invalid data.")
+
+    if pos != len(data):
+        raise InvalidSaveDataError("Save file has trailing data.")
+    return character
+
+# ==============================================================================
+# JOURNAL SAVES
+# In "journal" mode a save appends only what changed since the last save to
+# name_save.journal; the full character lives in the binary snapshot
+# name_save.bin. load_character replays the journal on top of the snapshot.
+#   header   6-byte magic b"QCJRNL" + 1-byte version + CRC32 of the snapshot
+#            the journal belongs to (a journal left over from an older
+#            snapshot is ignored)
+#   records  one per save: payload length, CRC32 of the payload, payload
+#   payload  operations, each starting with an opcode and a field index:
+#            DELTA   stat += signed 64-bit delta
+#            APPEND  add a string to the end of a list
+#            REMOVE  remove the first occurrence of a string from a list
+#            SET     replace a list (only when the change is a reorder)
+# A record cut short by a crash fails its CRC and is dropped with everything
+# after it. Once the journal passes JOURNAL_COMPACT_BYTES the next save writes
+# a fresh snapshot and starts a new journal. The last saved state of the
+# JOURNAL_STATE_CACHE_SIZE most recently saved characters is kept in memory,
+# so a save costs a diff and a small append instead of re-encoding and
+# rewriting the whole character; older ones are read back from disk.
+# ==============================================================================
+
+JOURNAL_SUFFIX = "_save.journal"
+JOURNAL_MAGIC = b"QCJRNL"
+JOURNAL_VERSION = 1
+JOURNAL_COMPACT_BYTES = 16 * 1024
+JOURNAL_STATE_CACHE_SIZE = 256
+_JOURNAL_HEADER = struct.Struct("<6sBI")
+_FRAME = struct.Struct("<II")
+_OP_DELTA, _OP_APPEND, _OP_REMOVE, _OP_SET = 1, 2, 3, 4
+_OP_STAT = struct.Struct("<BBq")
+_OP_LIST = struct.Struct("<BBI")
+_U32_ONE = struct.Struct("<I")
+
+# absolute snapshot path -> [last saved character, journal size, snapshot CRC,
+# snapshot (inode, size, mtime)], least recently saved first
+_journal_states = OrderedDict()
+_journal_lock = threading.Lock()
+
+
+def _journal_path(character_name, save_directory):
+    return os.path.join(save_directory, f"{character_name}{JOURNAL_SUFFIX}")
+
+
+def _copy_character(character):
+    return {key: list(value) if isinstance(value, list) else value
+            for key, value in character.items()}
+
+
+def _list_ops(index, old, new, out):
+    # removals then appends, unless that would not reproduce the order of new
+    work = list(old)
+    ops = []
+    for value, extra in (Counter(old) - Counter(new)).items():
+        for _ in range(extra):
+            work.remove(value)
+            raw = value.encode("utf-8")
+            ops.append(_OP_LIST.pack(_OP_REMOVE, index, len(raw)) + raw)
+    if work == new[:len(work)]:
+        for value in new[len(work):]:
+            raw = value.encode("utf-8")
+            ops.append(_OP_LIST.pack(_OP_APPEND, index, len(raw)) + raw)
+        out.extend(ops)
+    else:
+        out.append(_OP_LIST.pack(_OP_SET, index, len(new)))
+        for value in new:
+            raw = value.encode("utf-8")
+            out.append(_U32_ONE.pack(len(raw)) + raw)
+
+
+
+def _journal_diff(old, new):
+    """Encode the change from old to new, or return None if it cannot be journaled."""
+    if old.keys() != new.keys() or old["name"] != new["name"] or old["class"] != new["class"]:
+        return None
+    out = []
+    for index, field in enumerate(STAT_FIELDS):
+        if type(new[field]) is not int:
+            return None
+        if new[field] != old[field]:
+            out.append(_OP_STAT.pack(_OP_DELTA, index, new[field] - old[field]))
+    for index, field in enumerate(LIST_FIELDS):
+        if old[field] != new[field]:
+            _list_ops(index, old[field], new[field], out)
+    return b"".join(out)
+
+
+def _apply_journal_record(character, payload):
+    pos = 0
+    try:
+        while pos < len(payload):
+            op = payload[pos]
+            if op == _OP_DELTA:
+                _, index, delta = _OP_STAT.unpack_from(payload, pos)
+                pos += _OP_STAT.size
+                character[STAT_FIELDS[index]] += delta
+                continue
+            _, index, size = _OP_LIST.unpack_from(payload, pos)
+            pos += _OP_LIST.size
+            values = character[LIST_FIELDS[index]]
+            if op == _OP_SET:
+                new = []
+                for _ in range(size):
+                    (length,) = _U32_ONE.unpack_from(payload, pos)
+                    pos += _U32_ONE.size
+                    new.append(payload[pos:pos + length].decode("utf-8"))
+                    pos += length
+                values[:] = new
+                continue
+            value = payload[pos:pos + size].decode("utf-8")
+            pos += size
+            if op == _OP_APPEND:
+                values.append(value)
+            elif op == _OP_REMOVE:
+                values.remove(value)
+            else:
+                raise InvalidSaveDataError(f"Unknown journal operation {op}.")
+    except (struct.error, IndexError, ValueError) as e:
+        raise InvalidSaveDataError(f"Save journal is corrupted: {e}")
+
+
+def _read_journal(journal_file, snapshot):
+    """
+    Returns (payloads, valid_size) for the journal of this snapshot.
+    valid_size is None when the journal belongs to another snapshot (or its
+    header was never fully written); a torn last record is left out.
+    """
+    with open(journal_file, "rb") as file:
+        data = file.read()
+    if len(data) < _JOURNAL_HEADER.size:
+        return [], None
+    magic, version, snapshot_crc = _JOURNAL_HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise InvalidSaveDataError("Not a save journal, or unsupported journal version.")
+    if snapshot_crc != zlib.crc32(snapshot):
+        return [], None
+
+    payloads = []
+    pos = _JOURNAL_HEADER.size
+    while pos + _FRAME.size <= len(data):
+        length, crc = _FRAME.unpack_from(data, pos)
+        payload = data[pos + _FRAME.size:pos + _FRAME.size + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            break
+        payloads.append(payload)
+        pos += _FRAME.size + length
+    return payloads, pos
+
+
+def _replay_journal(character, snapshot, journal_file):
+    if not os.path.exists(journal_file):
+        return None
+    payloads, valid_size = _read_journal(journal_file, snapshot)
+    for payload in payloads:
+        _apply_journal_record(character, payload)
+    return valid_size
+
+
+def _journal_state_from_disk(snapshot_file, journal_file):
+    # [character, journal size, snapshot CRC, snapshot stamp], or None to start a new snapshot
+    try:
+        with open(snapshot_file, "rb") as file:
+            st = os.fstat(file.fileno())
+            snapshot = file.read()
+        character = decode_character(snapshot)
+        valid_size = _replay_journal(character, snapshot, journal_file)
+    except (OSError, InvalidSaveDataError):
+        return None
+    if valid_size is None:
+        valid_size = 0
+    elif os.path.getsize(journal_file) != valid_size:
+        # drop a torn record so new records are appended after good ones
+        with open(journal_file, "r+b") as file:
+            file.truncate(valid_size)
+    return [character, valid_size, zlib.crc32(snapshot), (st.st_ino, st.st_size, st.st_mtime_ns)]
+
+
+def _journal_size(journal_file):
+    try:
+        return os.stat(journal_file).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _save_journaled(character, save_directory, durability, backup):
+    snapshot_file = _save_path(character["name"], save_directory, "binary")
+    journal_file = _journal_path(character["name"], save_directory)
+    key = os.path.abspath(snapshot_file)
+
+    with _journal_lock:
+        state = _journal_states.get(key)
+        if state is not None and (_journal_size(journal_file) != state[1]
+                                  or _file_stamp(snapshot_file) != state[3]):
+            state = None  # snapshot or journal changed behind our back
+        if state is None:
+            state = _journal_state_from_disk(snapshot_file, journal_file)
+
+        payload = None if state is None else _journal_diff(state[0], character)
+        if payload == b"":
+            return
+        if payload is not None:
+            record = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+            if state[1] + len(record) > JOURNAL_COMPACT_BYTES:
+                payload = None
+
+        if payload is None:
+            # new character, unjournalable change or compaction: new snapshot
+            snapshot = encode_character(character)
+            _atomic_write(snapshot_file, snapshot, durability, backup)
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+            _remember_journal_state(key, [_copy_character(character), 0, zlib.crc32(snapshot),
+                                          _file_stamp(snapshot_file)])
+            return
+
+        created = state[1] == 0
+        if created:
+            record = _JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, state[2]) + record
+        with open(journal_file, "wb" if created else "ab") as file:
+            file.write(record)
+            if durability != "none":
+                file.flush()
+                os.fsync(file.fileno())
+        if created and durability == "directory":
+            _fsync_directory(save_directory)
+        state[0] = _copy_character(character)
+        state[1] += len(record)
+        _remember_journal_state(key, state)
+
+
+def _remember_journal_state(key, state):
+    # called with _journal_lock held
+    _journal_states[key] = state
+    _journal_states.move_to_end(key)
+    while len(_journal_states) > JOURNAL_STATE_CACHE_SIZE:
+        _journal_states.popitem(last=False)
+
+
+def _forget_journal(character_name, save_directory):
+    with _journal_lock:
+        _journal_states.pop(os.path.abspath(_save_path(character_name, save_directory, "binary")), None)
+        journal_file = _journal_path(character_name, save_directory)
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+
+# ==============================================================================
+# SAVE BACKENDS
+# Saves normally live as files in save_directory. set_save_backend() routes
+# save_character / load_character / list_saved_characters / delete_character
+# to another store instead (for example save_backends.SQLiteSaveBackend); the
+# save_directory and save_format arguments are then ignored. A backend is any
+# object with those four methods, minus the directory arguments.
+# ==============================================================================
+
+_save_backend = None
+
+
+def set_save_backend(backend):
+    """Use backend for all saves (None = save files). Returns the previous backend."""
+    global _save_backend
+    previous = _save_backend
+    _save_backend = backend
+    return previous
+
+
+def get_save_backend():
+    """Return the active save backend, or None when saving to files."""
+    return _save_backend
+
 # ==============================================================================
 # SAVE CHARACTER
-# save_character(character, save_directory="data/save_games")
-# Saves the character’s stats and information into a text file.
+# save_character(character, save_directory="data/save_games", save_format=None,
+#                durability=None, backup=None)
+# Saves the character’s stats and information into a save file.
+# save_format is "text", "binary" or "journal" (default DEFAULT_SAVE_FORMAT).
+# durability is one of DURABILITY_LEVELS (default DEFAULT_DURABILITY) and
+# backup keeps the previous save as .bak (default KEEP_BACKUPS); see
+# ATOMIC WRITES above.
 # Creates the save directory if it does not exist.
-# Writes all core attributes, inventory, and quest lists to the save file.
+# Atomically replaces the save file with all core attributes, inventory, and
+# quest lists, then removes any save of the same character in the other format.
 # Raises SaveFileCorruptedError if writing to the file fails.
+# Goes to the active save backend instead, if one is set.
 # Returns True when saving is successful.
 # ==============================================================================
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", save_format=None,
+                   durability=None, backup=None):
+    if _save_backend is not None:
+        return _save_backend.save_character(character)
+
+    save_format = save_format or DEFAULT_SAVE_FORMAT
+    if save_format not in SAVE_FORMATS:
+        raise ValueError(f"Unknown save format: {save_format}")
+    durability = durability or DEFAULT_DURABILITY
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {durability}")
+    if backup is None:
+        backup = KEEP_BACKUPS
+
     if not os.path.exists(save_directory):
         os.makedirs(save_directory)
 
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
-
     try:
-        with open(filename, "w") as file:
-            for key in [
-                "name", "class", "level", "health", "max_health",
-                "strength", "magic", "experience", "gold"
-            ]:
-                file.write(f"{key.upper()}:{character[key]}\n")
-
-            file.write("INVENTORY:" + ",".join(character["inventory"]) + "\n")
-            file.write("ACTIVE_QUESTS:" + ",".join(character["active_quests"]) + "\n")
-            file.write("COMPLETED_QUESTS:" + ",".join(character["completed_quests"]) + "\n")
-
+        if save_format == "journal":
+            _save_journaled(character, save_directory, durability, backup)
+        else:
+            if save_format == "binary":
+                data = encode_character(character)
+            else:
+                data = encode_text_character(character)
+            filename = _save_path(character["name"], save_directory, save_format)
+            _atomic_write(filename, data, durability, backup)
+            # only now: until the new save is in place the journal holds the latest state
+            _forget_journal(character["name"], save_directory)
     except Exception:
         raise SaveFileCorruptedError("Unable to save character file.")
+    finally:
+        _invalidate_load_cache(character["name"], save_directory)
+
+    kept = "binary" if save_format == "journal" else save_format
+    for other in SAVE_SUFFIXES:
+        if other != kept:
+            try:
+                os.remove(_save_path(character["name"], save_directory, other))
+            except OSError:
+                pass
 
     return True
 
+# ==============================================================================
+# LOAD CACHE
+# enable_load_cache() keeps the most recently loaded characters in memory
+# (an OrderedDict used as an LRU, max_entries long). Each entry remembers
+# the inode, size and mtime of the save, journal and text files it was read
+# from, taken before reading; a hit whose files no longer match (another
+# process saved) counts as stale and is reloaded. save_character and
+# delete_character drop the entry. Every hit returns a fresh copy.
+# The cache is off by default and is bypassed while a save backend is set.
+# ==============================================================================
+
+DEFAULT_LOAD_CACHE_SIZE = 256
+
+
+class _LoadCache:
+    def __init__(self, max_entries):
+        if max_entries < 1:
+            raise ValueError("Load cache needs room for at least one character.")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (fingerprint, character)
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.stale = self.evictions = 0
+
+
+_load_cache = None
+
+
+def enable_load_cache(max_entries=DEFAULT_LOAD_CACHE_SIZE):
+    """Turn on (or resize and empty) the load_character cache."""
+    global _load_cache
+    _load_cache = _LoadCache(max_entries)
+
+
+def disable_load_cache():
+    global _load_cache
+    _load_cache = None
+
+
+def clear_load_cache():
+    """Drop every cached character; statistics are kept."""
+    cache = _load_cache
+    if cache is not None:
+        with cache.lock:
+            cache.entries.clear()
+
+
+def load_cache_stats():
+    """Return hits, misses, stale, evictions, size and max_entries (None when off)."""
+    cache = _load_cache
+    if cache is None:
+        return None
+    with cache.lock:
+        return {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "stale": cache.stale,
+            "evictions": cache.evictions,
+            "size": len(cache.entries),
+            "max_entries": cache.max_entries,
+        }
+
+
+def _file_stamp(filename):
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _save_fingerprint(character_name, save_directory):
+    return (
+        _file_stamp(_save_path(character_name, save_directory, "binary")),
+        _file_stamp(_journal_path(character_name, save_directory)),
+        _file_stamp(_save_path(character_name, save_directory, "text")),
+    )
+
+
+def _invalidate_load_cache(character_name, save_directory):
+    cache = _load_cache
+    if cache is not None:
+        with cache.lock:
+            cache.entries.pop((os.path.abspath(save_directory), character_name), None)
+
+
+def _cached_load(cache, character_name, save_directory):
+    key = (os.path.abspath(save_directory), character_name)
+    fingerprint = _save_fingerprint(character_name, save_directory)
+    with cache.lock:
+        entry = cache.entries.get(key)
+        if entry is not None:
+            if entry[0] == fingerprint:
+                cache.entries.move_to_end(key)
+                cache.hits += 1
+                return _copy_character(entry[1])
+            cache.stale += 1
+            del cache.entries[key]
+        cache.misses += 1
+
+    character = _load_character_files(character_name, save_directory)
+    with cache.lock:
+        cache.entries[key] = (fingerprint, _copy_character(character))
+        cache.entries.move_to_end(key)
+        while len(cache.entries) > cache.max_entries:
+            cache.entries.popitem(last=False)
+            cache.evictions += 1
+    return character
+
 # ==============================================================================
 # LOAD CHARACTER
 # load_character(character_name, save_directory="data/save_games")
 # Loads a character’s data from its corresponding save file.
-# Confirms the file exists before attempting to read it.
+# Confirms the file exists before attempting to read it; a binary save is
+# used if there is one, otherwise the (legacy) text save.
 # Parses each line into the correct data type (strings, integers, lists).
 # Rebuilds the inventory, active quest list, and completed quest list.
 # Validates all fields to ensure the saved character data is complete.
 # Returns the fully reconstructed character dictionary.
+# Served from the load cache when it is enabled (see LOAD CACHE above).
 
 # ==============================================================================
 
 def load_character(character_name, save_directory="data/save_games"):
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    if _save_backend is not None:
+        return _save_backend.load_character(character_name)
+    cache = _load_cache
+    if cache is not None:
+        return _cached_load(cache, character_name, save_directory)
+    return _load_character_files(character_name, save_directory)
+
+
+def _load_character_files(character_name, save_directory):
+    binary_file = _save_path(character_name, save_directory, "binary")
+    if os.path.exists(binary_file):
+        try:
+            with open(binary_file, "rb") as file:
+                data = file.read()
+        except Exception:
+            raise SaveFileCorruptedError("Save file could not be read.")
+        character = decode_character(data)
+        try:
+            _replay_journal(character, data, _journal_path(character_name, save_directory))
+        except OSError:
+            raise SaveFileCorruptedError("Save journal could not be read.")
+        validate_character_data(character)
+        return character
+
+    filename = _save_path(character_name, save_directory, "text")
 
     if not os.path.exists(filename):
         raise CharacterNotFoundError("Save file not found.")
@@ -152,42 +849,266 @@ def load_character(character_name, save_directory="data/save_games"):
 # ==============================================================================
 # LIST SAVED CHARACTERS
 # list_saved_characters(save_directory="data/save_games")
-# Looks inside the save directory for files ending with _save.txt.
-# Extracts and returns all character names found.
+# Looks inside the save directory for text or binary save files.
+# Extracts and returns all character names found (each name once).
 # Provides the list used to show available saved games to the player.
 # ==============================================================================
 
 def list_saved_characters(save_directory="data/save_games"):
+    if _save_backend is not None:
+        return _save_backend.list_saved_characters()
+
     if not os.path.exists(save_directory):
         return []
 
     characters = []
+    seen = set()
 
     for file in os.listdir(save_directory):
-        if file.endswith("_save.txt"):
-            characters.append(file.replace("_save.txt", ""))
+        for suffix in SAVE_SUFFIXES.values():
+            if file.endswith(suffix):
+                name = file[:-len(suffix)]
+                if name not in seen:
+                    seen.add(name)
+                    characters.append(name)
 
     return characters
 
 # ==============================================================================
 # DELETE CHARACTER
 # delete_character(character_name, save_directory="data/save_games")
-# Deletes the save file associated with a given character.
-# Raises CharacterNotFoundError if the save file does not exist.
+# Deletes the save file(s) associated with a given character, their journal
+# and their backups.
+# Raises CharacterNotFoundError if no save file exists.
 # Returns True if the deletion completes successfully.
 # ==============================================================================
 
 def delete_character(character_name, save_directory="data/save_games"):
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    if _save_backend is not None:
+        return _save_backend.delete_character(character_name)
 
-    if not os.path.exists(filename):
+    filenames = [_save_path(character_name, save_directory, fmt) for fmt in SAVE_SUFFIXES]
+    existing = [f for f in filenames if os.path.exists(f)]
+
+    if not existing:
         raise CharacterNotFoundError("Character save file does not exist.")
 
-    os.remove(filename)
+    _forget_journal(character_name, save_directory)
+    _invalidate_load_cache(character_name, save_directory)
+    for filename in existing:
+        os.remove(filename)
+    for filename in filenames:
+        if os.path.exists(filename + BACKUP_SUFFIX):
+            os.remove(filename + BACKUP_SUFFIX)
     return True
 
+# ==============================================================================
+# ASYNC API
+# async_save_character / async_load_character / async_list_saved_characters
+# run the blocking functions above on a small shared thread pool, so an
+# asyncio server never waits on the disk inside its event loop.
+#   - at most ASYNC_MAX_WORKERS threads do save I/O, and at most
+#     ASYNC_MAX_PENDING_IO operations per event loop are handed to them at
+#     once (the rest wait on a semaphore instead of piling up in the pool)
+#   - concurrent loads of the same save share one read; each caller gets
+#     its own copy of the character
+#   - saves of the same character run one at a time, in call order, using a
+#     snapshot taken when the save was requested; a save also stops later
+#     loads from joining a read that started before it
+# ==============================================================================
+
+ASYNC_MAX_WORKERS = 8
+ASYNC_MAX_PENDING_IO = 64
+
+_async_executor = None
+_async_executor_lock = threading.Lock()
+_async_states = weakref.WeakKeyDictionary()
+
+
+class _AsyncState:
+    # per event loop: asyncio primitives cannot be shared between loops
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(ASYNC_MAX_PENDING_IO)
+        self.loads = {}        # save key -> task reading it
+        self.save_locks = {}   # save key -> [asyncio.Lock, number of users]
+
+
+def _get_async_executor():
+    global _async_executor
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(ASYNC_MAX_WORKERS, thread_name_prefix="save-io")
+        return _async_executor
+
+
+def shutdown_async_io():
+    """Stop the save I/O threads (they are started again on next use)."""
+    global _async_executor
+    with _async_executor_lock:
+        executor, _async_executor = _async_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _async_state():
+    loop = asyncio.get_running_loop()
+    state = _async_states.get(loop)
+    if state is None:
+        state = _async_states[loop] = _AsyncState()
+    return loop, state
+
+
+def _async_key(character_name, save_directory):
+    return (os.path.abspath(save_directory), character_name)
+
+
+async def _run_io(loop, state, function, *args):
+    async with state.semaphore:
+        return await loop.run_in_executor(_get_async_executor(), functools.partial(function, *args))
+
+
+def async_save_character(character, save_directory="data/save_games", save_format=None,
+                         durability=None, backup=None):
+    """
+    Async save_character; same arguments, result and exceptions.
+    Not itself a coroutine function, so the character is copied right away
+    rather than when the returned awaitable first runs.
+    """
+    return _async_save(_copy_character(character), save_directory, save_format, durability, backup)
+
+
+async def _async_save(snapshot, save_directory, save_format, durability, backup):
+    loop, state = _async_state()
+    key = _async_key(snapshot["name"], save_directory)
+    state.loads.pop(key, None)
+
+    entry = state.save_locks.setdefault(key, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            return await _run_io(loop, state, save_character, snapshot, save_directory,
+                                 save_format, durability, backup)
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del state.save_locks[key]
+
+
+async def async_load_character(character_name, save_directory="data/save_games"):
+    """Async load_character; same arguments, result and exceptions."""
+    loop, state = _async_state()
+    key = _async_key(character_name, save_directory)
+    task = state.loads.get(key)
+    if task is None:
+        task = loop.create_task(_run_io(loop, state, load_character, character_name, save_directory))
+        state.loads[key] = task
+
+        def forget(done, key=key):
+            if state.loads.get(key) is done:
+                del state.loads[key]
+        task.add_done_callback(forget)
+    # shield: one caller giving up must not cancel the read for the others
+    return _copy_character(await asyncio.shield(task))
+
+
+async def async_list_saved_characters(save_directory="data/save_games"):
+    """Async list_saved_characters."""
+    loop, state = _async_state()
+    return await _run_io(loop, state, list_saved_characters, save_directory)
+
+# ==============================================================================
+# XP CURVES
+# An XP curve answers "starting at this level with this much experience, where
+# does the character end up?" in one call, however many levels that is.
+# curve.advance(level, experience) returns (new_level, leftover_experience);
+# curve.cost(level) is the XP needed to go from level to level + 1.
+# LinearXPCurve is the game's curve (level * 100 XP per level), solved in
+# closed form. TableXPCurve takes any per-level costs, precomputes their
+# running total and finds the new level with bisect.
+# ==============================================================================
+
+class LinearXPCurve:
+    """Each level costs step * level XP (the default curve, step=100)."""
+
+    def __init__(self, step=100):
+        self.step = step
+
+    def cost(self, level):
+        return self.step * level
+
+    def advance(self, level, experience):
+        if experience < self.step * level:
+            return level, experience
+        # k levels from level L cost step * (k*L + k*(k-1)/2), so the most
+        # levels we can afford is the largest k with k^2 + (2L-1)k <= 2*budget
+        # int(): XP may be a float (e.g. 150.0); the leftover below stays exact
+        budget = int(experience // self.step)
+        b = 2 * level - 1
+        gained = (math.isqrt(b * b + 8 * budget) - b) // 2
+        spent = self.step * (gained * level + gained * (gained - 1) // 2)
+        return level + gained, experience - spent
+
+
+class TableXPCurve:
+    """
+    Per-level costs from a list: costs[0] is the XP from level 1 to 2, and so
+    on. Characters stop at the last level the table reaches
+    (len(costs) + 1) and keep any further experience.
+    """
+
+    def __init__(self, costs):
+        self.costs = list(costs)
+        if any(c <= 0 for c in self.costs):
+            raise ValueError("Level costs must be positive.")
+        # totals[i] = XP needed to reach level i + 1 from level 1
+        self.totals = [0]
+        for c in self.costs:
+            self.totals.append(self.totals[-1] + c)
+        self.max_level = len(self.totals)
+
+    @classmethod
+    def from_function(cls, cost, max_level):
+        """Build a table from cost(level) for levels 1 .. max_level - 1."""
+        return cls(cost(level) for level in range(1, max_level))
+
+    def cost(self, level):
+        return self.costs[level - 1] if level < self.max_level else None
+
+    def advance(self, level, experience):
+        if level >= self.max_level or experience < self.costs[level - 1]:
+            return level, experience
+        total = self.totals[level - 1] + experience
+        new_level = min(bisect.bisect_right(self.totals, total), self.max_level)
+        return new_level, total - self.totals[new_level - 1]
+
+
+_xp_curve = LinearXPCurve()
+
+# Stat gains for each level gained
+LEVEL_UP_MAX_HEALTH = 10
+LEVEL_UP_STRENGTH = 2
+LEVEL_UP_MAGIC = 2
+
+
+def set_xp_curve(curve):
+    """Use curve for all level-ups (None = the default linear curve). Returns the previous curve."""
+    global _xp_curve
+    previous = _xp_curve
+    _xp_curve = curve if curve is not None else LinearXPCurve()
+    return previous
+
+
+def get_xp_curve():
+    """Return the active XP curve."""
+    return _xp_curve
+
 # ==============================================================================
 # CHARACTER OPERATIONS
+# gain_experience(character, xp_amount)
+# Adds XP and applies every level-up it pays for at once: the active XP curve
+# gives the new level, then each level gained adds LEVEL_UP_MAX_HEALTH max
+# health, LEVEL_UP_STRENGTH strength and LEVEL_UP_MAGIC magic, and health is
+# refilled if any level was gained.
 # ==============================================================================
 
 def gain_experience(character, xp_amount):
@@ -197,12 +1118,14 @@ def gain_experience(character, xp_amount):
     character["experience"] += xp_amount
 
     # Level-up logic
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
+    level, experience = _xp_curve.advance(character["level"], character["experience"])
+    gained = level - character["level"]
+    if gained > 0:
+        character["level"] = level
+        character["experience"] = experience
+        character["max_health"] += LEVEL_UP_MAX_HEALTH * gained
+        character["strength"] += LEVEL_UP_STRENGTH * gained
+        character["magic"] += LEVEL_UP_MAGIC * gained
         character["health"] = character["max_health"]
 
     return character
@@ -0,0 +1,239 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Pool Module
+
+Name: Isaiah Coleman
+
+This module stores many characters as parallel stat columns so whole
+populations can gain XP, heal, earn gold and revive in one call.
+"""
+
+import character_manager
+from math import isqrt
+from array import array
+from operator import add, sub
+from custom_exceptions import CharacterDeadError
+
+try:
+    import numpy as np
+except ImportError:
+    # optional: the pool falls back to array columns and plain loops
+    np = None
+
+# ============================================================================
+# CHARACTER POOL
+# Each stat in character_manager.STAT_FIELDS is one column: a NumPy int64
+# array when NumPy is installed, an array("q") otherwise. Names, classes,
+# inventories and quest lists stay in ordinary lists and are only used when
+# converting back to dicts. Every operation acts on the whole pool and
+# matches the per-dict function of the same name exactly; with NumPy it runs
+# as a handful of array operations instead of a Python loop per character.
+# Amounts can be a single number or one value per character.
+# ============================================================================
+
+STAT_FIELDS = character_manager.STAT_FIELDS
+LIST_FIELDS = character_manager.LIST_FIELDS
+
+
+def _column(values):
+    if np is not None:
+        return np.array(values, dtype=np.int64)
+    return array("q", values)
+
+
+def _isqrt(values):
+    # exact integer square root of an int64 array (float sqrt, then corrected)
+    root = np.sqrt(values.astype(np.float64)).astype(np.int64)
+    for _ in range(2):
+        root -= root * root > values
+        root += (root + 1) * (root + 1) <= values
+    return root
+
+
+class CharacterPool:
+    """A population of characters stored column by column."""
+
+    def __init__(self, characters=()):
+        characters = list(characters)
+        self.names = [c["name"] for c in characters]
+        self.classes = [c["class"] for c in characters]
+        for field in STAT_FIELDS:
+            setattr(self, field, _column([c[field] for c in characters]))
+        for field in LIST_FIELDS:
+            setattr(self, field, [list(c[field]) for c in characters])
+
+    @classmethod
+    def from_characters(cls, characters):
+        """Build a pool from character dicts (they are copied, not shared)."""
+        return cls(characters)
+
+    def __len__(self):
+        return len(self.names)
+
+    def character(self, index):
+        """Return character index as a new character dict."""
+        character = {"name": self.names[index], "class": self.classes[index]}
+        for field in STAT_FIELDS:
+            character[field] = int(getattr(self, field)[index])
+        for field in LIST_FIELDS:
+            character[field] = list(getattr(self, field)[index])
+        return character
+
+    def to_characters(self):
+        """Return every character as a dict, in pool order."""
+        columns = [getattr(self, field).tolist() for field in STAT_FIELDS]
+        characters = []
+        for i, stats in enumerate(zip(*columns)):
+            character = {"name": self.names[i], "class": self.classes[i]}
+            character.update(zip(STAT_FIELDS, stats))
+            for field in LIST_FIELDS:
+                character[field] = list(getattr(self, field)[i])
+            characters.append(character)
+        return characters
+
+    def _amounts(self, amount):
+        # one value per character, as a column (NumPy) or a list
+        if isinstance(amount, int):
+            return np.full(len(self), amount, dtype=np.int64) if np is not None else [amount] * len(self)
+        if len(amount) != len(self):
+            raise ValueError("Need one amount per character.")
+        return np.asarray(amount, dtype=np.int64) if np is not None else list(amount)
+
+    # ------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------
+
+    def is_dead(self):
+        """Per-character is_character_dead (a bool column or list)."""
+        if np is not None:
+            return self.health <= 0
+        return [h <= 0 for h in self.health]
+
+    def dead_count(self):
+        if np is not None:
+            return int(np.count_nonzero(self.health <= 0))
+        return sum(1 for h in self.health if h <= 0)
+
+    # ------------------------------------------------------------------
+    # operations
+    # ------------------------------------------------------------------
+
+    def gain_experience(self, amount, skip_dead=False):
+        """
+        gain_experience for every character, using the active XP curve.
+        Dead characters raise CharacterDeadError before anything changes,
+        unless skip_dead=True, in which case they are left as they are.
+        Returns the number of levels gained per character.
+        """
+        amounts = self._amounts(amount)
+        dead = self.is_dead()
+        if not skip_dead and (dead.any() if np is not None else any(dead)):
+            raise CharacterDeadError("Cannot gain experience while dead.")
+        curve = character_manager.get_xp_curve()
+        if np is not None:
+            return self._gain_experience_numpy(amounts, ~dead, curve)
+
+        if any(dead):
+            amounts = [0 if d else a for a, d in zip(amounts, dead)]
+        level = self.level
+        experience = list(map(add, self.experience, amounts))
+        if isinstance(curve, character_manager.LinearXPCurve):
+            # same closed form as LinearXPCurve.advance, one list at a time
+            step = curve.step
+            gained = [0 if d or e < step * l else (isqrt((2 * l - 1) ** 2 + 8 * (e // step)) - 2 * l + 1) // 2
+                      for l, e, d in zip(level, experience, dead)]
+            experience = [e - step * (g * l + g * (g - 1) // 2) if g else e
+                          for l, e, g in zip(level, experience, gained)]
+        else:
+            gained = [0] * len(self)
+            for i, (l, e) in enumerate(zip(level, experience)):
+                if not dead[i]:
+                    new_level, experience[i] = curve.advance(l, e)
+                    gained[i] = new_level - l
+
+        self.level = array("q", map(add, level, gained))
+        self.experience = array("q", experience)
+        self.max_health = array("q", map(add, self.max_health,
+                                         [character_manager.LEVEL_UP_MAX_HEALTH * g for g in gained]))
+        self.strength = array("q", map(add, self.strength,
+                                       [character_manager.LEVEL_UP_STRENGTH * g for g in gained]))
+        self.magic = array("q", map(add, self.magic, [character_manager.LEVEL_UP_MAGIC * g for g in gained]))
+        self.health = array("q", [m if g else h for h, m, g in zip(self.health, self.max_health, gained)])
+        return array("q", gained)
+
+    def _gain_experience_numpy(self, amounts, alive, curve):
+        experience = self.experience + np.where(alive, amounts, 0)
+        level = self.level
+        if isinstance(curve, character_manager.LinearXPCurve):
+            b = 2 * level - 1
+            gained = (_isqrt(np.maximum(b * b + 8 * (experience // curve.step), 0)) - b) // 2
+            gained = np.where(alive, np.maximum(gained, 0), 0)
+            new_level = level + gained
+            leftover = experience - curve.step * (gained * level + gained * (gained - 1) // 2)
+        elif isinstance(curve, character_manager.TableXPCurve):
+            totals = np.asarray(curve.totals, dtype=np.int64)
+            capped = level >= curve.max_level
+            total = totals[np.minimum(level, curve.max_level) - 1] + experience
+            new_level = np.minimum(np.searchsorted(totals, total, side="right"), curve.max_level)
+            new_level = np.where(capped | ~alive, level, np.maximum(new_level, level))
+            # capped rows keep their own level, which may be past the table
+            leftover = np.where(new_level > level,
+                                total - totals[np.minimum(new_level, curve.max_level) - 1], experience)
+            gained = new_level - level
+        else:
+            # unknown curve: ask it one character at a time
+            pairs = [curve.advance(l, e) if a else (l, e)
+                     for l, e, a in zip(level.tolist(), experience.tolist(), alive.tolist())]
+            new_level = np.array([p[0] for p in pairs], dtype=np.int64)
+            leftover = np.array([p[1] for p in pairs], dtype=np.int64)
+            gained = new_level - level
+
+        levelled = gained > 0
+        self.level = new_level
+        self.experience = np.where(levelled, leftover, experience)
+        self.max_health = self.max_health + character_manager.LEVEL_UP_MAX_HEALTH * gained
+        self.strength = self.strength + character_manager.LEVEL_UP_STRENGTH * gained
+        self.magic = self.magic + character_manager.LEVEL_UP_MAGIC * gained
+        self.health = np.where(levelled, self.max_health, self.health)
+        return gained
+
+    def heal(self, amount):
+        """heal_character for every character. Returns the health restored per character."""
+        amounts = self._amounts(amount)
+        if np is not None:
+            old = self.health
+            self.health = np.minimum(old + amounts, self.max_health)
+            return self.health - old
+        old = self.health
+        self.health = array("q", map(min, map(add, old, amounts), self.max_health))
+        return array("q", map(sub, self.health, old))
+
+    def add_gold(self, amount):
+        """
+        add_gold for every character. Raises ValueError, changing nothing, if
+        any character would end up with negative gold. Returns the gold column.
+        """
+        amounts = self._amounts(amount)
+        if np is not None:
+            new = self.gold + amounts
+            if (new < 0).any():
+                raise ValueError("Not enough gold.")
+            self.gold = new
+            return self.gold
+        new = array("q", map(add, self.gold, amounts))
+        if new and min(new) < 0:
+            raise ValueError("Not enough gold.")
+        self.gold = new
+        return self.gold
+
+    def revive(self):
+        """revive_character for every dead character. Returns how many were revived."""
+        if np is not None:
+            dead = self.health <= 0
+            self.health = np.where(dead, self.max_health // 2, self.health)
+            return int(np.count_nonzero(dead))
+        revived = self.dead_count()
+        if revived:
+            self.health = array("q", [m // 2 if h <= 0 else h
+                                      for h, m in zip(self.health, self.max_health)])
+        return revived
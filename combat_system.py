@@ -10,65 +10,285 @@ Handles combat mechanics
 """
  
 import random
+from bisect import bisect_right
+from types import MappingProxyType
+import game_data
+import battle_events
+from battle_events import TurnStart, DamageDealt, AbilityUsed, EscapeAttempt, BattleEnd
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
     CharacterDeadError,
-    AbilityOnCooldownError
+    AbilityOnCooldownError,
+    MissingDataFileError,
+    InvalidDataFormatError
 )
 
 # ============================================================================
 # ENEMY DEFINITIONS
 #This section defines all enemy types used in the game, including their stats, rewards, and how they are generated based on player level. 
 #It sets the foundation for every encounter by specifying what enemies exist and what attributes they bring into battle.
-#
+#Enemy types are read from data/enemies.txt into a registry of prototypes; create_enemy hands out copies,
+#optionally scaled to a level (cached per enemy type and level).
 # ============================================================================
 
-def create_enemy(enemy_type):
-    enemy_type = enemy_type.lower()
-
-    if enemy_type == "goblin":
-        return {
-            "name": "Goblin",
-            "health": 50,
-            "max_health": 50,
-            "strength": 8,
-            "magic": 2,
-            "xp_reward": 25,
-            "gold_reward": 10
-        }
-    elif enemy_type == "orc":
-        return {
-            "name": "Orc",
-            "health": 80,
-            "max_health": 80,
-            "strength": 12,
-            "magic": 5,
-            "xp_reward": 50,
-            "gold_reward": 25
-        }
-    elif enemy_type == "dragon":
-        return {
-            "name": "Dragon",
-            "health": 200,
-            "max_health": 200,
-            "strength": 25,
-            "magic": 15,
-            "xp_reward": 200,
-            "gold_reward": 100
+ENEMY_DATA_FILE = "data/enemies.txt"
+
+# Used when the enemy data file is missing
+DEFAULT_ENEMY_TEMPLATES = {
+    "goblin": {"name": "Goblin", "level": 1, "health": 50, "strength": 8, "magic": 2,
+               "xp_reward": 25, "gold_reward": 10, "health_per_level": 6, "strength_per_level": 1,
+               "magic_per_level": 0, "xp_per_level": 5, "gold_per_level": 2},
+    "orc": {"name": "Orc", "level": 3, "health": 80, "strength": 12, "magic": 5,
+            "xp_reward": 50, "gold_reward": 25, "health_per_level": 10, "strength_per_level": 2,
+            "magic_per_level": 1, "xp_per_level": 10, "gold_per_level": 5},
+    "dragon": {"name": "Dragon", "level": 6, "health": 200, "strength": 25, "magic": 15,
+               "xp_reward": 200, "gold_reward": 100, "health_per_level": 20, "strength_per_level": 3,
+               "magic_per_level": 2, "xp_per_level": 25, "gold_per_level": 10},
+    "wolf": {"name": "Wolf", "level": 1, "health": 35, "strength": 10, "magic": 0,
+             "xp_reward": 20, "gold_reward": 5, "health_per_level": 4, "strength_per_level": 1,
+             "magic_per_level": 0, "xp_per_level": 4, "gold_per_level": 1},
+    "troll": {"name": "Troll", "level": 5, "health": 140, "strength": 18, "magic": 3,
+              "xp_reward": 110, "gold_reward": 50, "health_per_level": 14, "strength_per_level": 2,
+              "magic_per_level": 0, "xp_per_level": 15, "gold_per_level": 6},
+}
+
+# Bound on the (enemy, level) cache; it is simply emptied when full
+ENEMY_LEVEL_CACHE_SIZE = 4096
+
+# enemy key -> prototype enemy dict; never handed out, only copied
+_enemy_prototypes = None
+# enemy key -> (base level, health, strength, magic, xp, gold gained per level)
+_enemy_growth = None
+# (enemy key, level) -> prototype scaled to that level
+_scaled_enemies = {}
+
+
+def load_enemy_templates(filename=ENEMY_DATA_FILE):
+    """
+    (Re)load the enemy registry from filename, falling back to
+    DEFAULT_ENEMY_TEMPLATES if the file does not exist.
+    Returns the read-only prototypes (see get_enemy_prototypes).
+    """
+    global _enemy_prototypes, _enemy_growth
+    try:
+        templates = game_data.load_enemies(filename)
+    except MissingDataFileError:
+        templates = DEFAULT_ENEMY_TEMPLATES
+    prototypes = {}
+    growth = {}
+    for key, t in templates.items():
+        prototypes[key] = {
+            "name": t["name"],
+            "health": t["health"],
+            "max_health": t["health"],
+            "strength": t["strength"],
+            "magic": t["magic"],
+            "xp_reward": t["xp_reward"],
+            "gold_reward": t["gold_reward"]
         }
+        growth[key] = (t["level"], t["health_per_level"], t["strength_per_level"],
+                       t["magic_per_level"], t["xp_per_level"], t["gold_per_level"])
+    _enemy_prototypes, _enemy_growth = prototypes, growth
+    _scaled_enemies.clear()
+    return get_enemy_prototypes()
+
 
-    raise InvalidTargetError("Enemy type does not exist.")
+def get_enemy_prototypes():
+    """Return a read-only view of enemy key -> prototype for every registered enemy."""
+    return MappingProxyType({key: MappingProxyType(p) for key, p in _enemy_registry().items()})
 
 
-def get_random_enemy_for_level(character_level):
-    # create_enemy lowercases internally, but we keep the strings explicit
-    if character_level <= 2:
-        return create_enemy("goblin")
-    elif character_level <= 5:
-        return create_enemy("orc")
+def _enemy_registry():
+    if _enemy_prototypes is None:
+        load_enemy_templates()
+    return _enemy_prototypes
+
+
+def _scaled_enemy(key, level):
+    # prototype for `key` at `level`, built once per (key, level)
+    base = _enemy_registry().get(key)
+    if base is None:
+        return None
+    base_level, health, strength, magic, xp, gold = _enemy_growth[key]
+    levels = max(0, level - base_level)
+    scaled = dict(base)
+    scaled["health"] = scaled["max_health"] = base["health"] + health * levels
+    scaled["strength"] = base["strength"] + strength * levels
+    scaled["magic"] = base["magic"] + magic * levels
+    scaled["xp_reward"] = base["xp_reward"] + xp * levels
+    scaled["gold_reward"] = base["gold_reward"] + gold * levels
+    if len(_scaled_enemies) >= ENEMY_LEVEL_CACHE_SIZE:
+        _scaled_enemies.clear()
+    _scaled_enemies[(key, level)] = scaled
+    return scaled
+
+
+def create_enemy(enemy_type, level=None):
+    """
+    Return a new enemy dict copied from the registered prototype. With a
+    level, its stats and rewards grow by the enemy's *_PER_LEVEL amounts for
+    every level above its base level (never below the base stats).
+    """
+    key = enemy_type.lower()
+    if level is None:
+        prototype = _enemy_registry().get(key)
     else:
-        return create_enemy("dragon")
+        prototype = _scaled_enemies.get((key, level)) or _scaled_enemy(key, level)
+    if prototype is None:
+        raise InvalidTargetError("Enemy type does not exist.")
+    return prototype.copy()
+
+
+# ============================================================================
+# ENCOUNTER TABLES
+#data/encounters.txt gives every range of character levels its own weighted list of enemies.
+#Each table gets a Walker alias table when it is loaded, so picking an enemy costs one random number
+#and one comparison however many enemies the table has; reloading keeps the alias tables of unchanged ranges.
+# ============================================================================
+
+ENCOUNTER_DATA_FILE = "data/encounters.txt"
+
+# Used when the encounter data file is missing: the original fixed level bands
+DEFAULT_ENCOUNTER_TABLES = [
+    {"min_level": 1, "max_level": 2, "enemies": [("goblin", 1.0)]},
+    {"min_level": 3, "max_level": 5, "enemies": [("orc", 1.0)]},
+    {"min_level": 6, "max_level": None, "enemies": [("dragon", 1.0)]},
+]
+
+
+class AliasTable:
+    """
+    Walker alias table: sample() returns index i with probability
+    weights[i] / sum(weights) using a single random number.
+    """
+
+    def __init__(self, weights):
+        weights = tuple(float(w) for w in weights)
+        if not weights or min(weights) <= 0:
+            raise ValueError("Alias table weights must be positive.")
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        # pair each under-full column with an over-full one (Vose's method)
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # whatever is left is full, up to rounding: prob stays 1.0
+        self.weights = weights
+        self.prob = prob
+        self.alias = alias
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random):
+        """One index, drawn with rng.random() (rng is the random module by default)."""
+        n = len(self.prob)
+        u = rng.random() * n
+        i = min(int(u), n - 1)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample_many(self, count, rng=random):
+        """A list of count indices."""
+        prob, alias = self.prob, self.alias
+        n = len(prob)
+        rand = rng.random
+        picks = []
+        append = picks.append
+        for _ in range(count):
+            u = rand() * n
+            i = min(int(u), n - 1)
+            append(i if u - i < prob[i] else alias[i])
+        return picks
+
+
+class EncounterTable:
+    """The weighted enemies met by characters of level min_level..max_level (None: no limit)."""
+
+    def __init__(self, min_level, max_level, enemies):
+        self.min_level = min_level
+        self.max_level = max_level
+        self.enemies = tuple(name for name, _ in enemies)
+        self.aliases = AliasTable(weight for _, weight in enemies)
+
+    @property
+    def weights(self):
+        return dict(zip(self.enemies, self.aliases.weights))
+
+    def key(self):
+        return (self.min_level, self.max_level, self.enemies, self.aliases.weights)
+
+    def covers(self, level):
+        return self.min_level <= level and (self.max_level is None or level <= self.max_level)
+
+
+# EncounterTables sorted by min_level, and their min_levels for bisect
+_encounter_tables = None
+_encounter_starts = []
+
+
+def load_encounter_tables(filename=ENCOUNTER_DATA_FILE):
+    """
+    (Re)load the encounter tables from filename, falling back to
+    DEFAULT_ENCOUNTER_TABLES if the file does not exist. Tables whose range
+    and weights did not change keep their alias tables.
+    Raises InvalidDataFormatError if a table names an unknown enemy.
+    Returns the list of EncounterTables.
+    """
+    global _encounter_tables, _encounter_starts
+    try:
+        entries = game_data.load_encounters(filename)
+    except MissingDataFileError:
+        entries = DEFAULT_ENCOUNTER_TABLES
+    enemies = _enemy_registry()
+    previous = {t.key(): t for t in _encounter_tables or ()}
+    tables = []
+    for entry in entries:
+        for name, _ in entry["enemies"]:
+            if name not in enemies:
+                raise InvalidDataFormatError(f"Encounter table lists unknown enemy: {name}")
+        table = EncounterTable(entry["min_level"], entry["max_level"], entry["enemies"])
+        tables.append(previous.get(table.key(), table))
+    _encounter_tables = tables
+    _encounter_starts = [t.min_level for t in tables]
+    return list(tables)
+
+
+def get_encounter_table(character_level):
+    """The EncounterTable covering character_level. Raises InvalidTargetError if none does."""
+    if _encounter_tables is None:
+        load_encounter_tables()
+    index = bisect_right(_encounter_starts, character_level) - 1
+    if index < 0 or not _encounter_tables[index].covers(character_level):
+        raise InvalidTargetError(f"No encounters for level {character_level}.")
+    return _encounter_tables[index]
+
+
+def get_random_enemy_for_level(character_level, rng=None):
+    # one weighted draw from the level's encounter table, scaled to the level
+    table = get_encounter_table(character_level)
+    name = table.enemies[table.aliases.sample(rng or random)]
+    return create_enemy(name, character_level)
+
+
+def sample_enemies(character_level, count, rng=None):
+    """
+    count enemies for character_level drawn from its encounter table, for
+    simulators. rng is anything with a random() method (random.Random);
+    the random module is used by default.
+    """
+    table = get_encounter_table(character_level)
+    names = table.enemies
+    return [create_enemy(names[i], character_level)
+            for i in table.aliases.sample_many(count, rng or random)]
 
 
 # ============================================================================
@@ -79,33 +299,61 @@ def get_random_enemy_for_level(character_level):
 # ============================================================================
 
 class SimpleBattle:
-    def __init__(self, character, enemy):
+    def __init__(self, character, enemy, display=True, sink=None, resolve=None):
         self.character = character
         self.enemy = enemy
         self.combat_active = True
         self.turn = 1
+        self.display = display
+        # where battle events go (see battle_events); the console by default,
+        # nowhere with display=False
+        if sink is None:
+            sink = battle_events.ConsoleSink() if display else battle_events.NullSink()
+        self.sink = sink
+        self.emit = sink.emit
+        # start_battle has no input or randomness, so when the sink has no use
+        # for per-turn events the fight is resolved in one step (resolve_battle).
+        # resolve=True/False forces either way.
+        if resolve is None:
+            resolve = not getattr(sink, "wants_turn_events", True)
+        self.resolve = resolve
 
     def start_battle(self):
         if self.character.get("health", 0) <= 0:
             raise CharacterDeadError("Cannot start a battle while dead.")
 
+        if self.resolve:
+            outcome = resolve_battle(self.character, self.enemy)
+            self.character["health"] = outcome["character_health"]
+            self.enemy["health"] = outcome["enemy_health"]
+            self.turn = outcome["turns"]
+            return self._finish(outcome["winner"])
+
         # Basic loop — deterministic for tests (no input)
         while self.combat_active:
-            display_combat_stats(self.character, self.enemy)
+            self.emit(TurnStart(self.turn, self.character.get("name", "Hero"),
+                                self.character.get("health", 0), self.character.get("max_health", 0),
+                                self.enemy.get("name", "Enemy"),
+                                self.enemy.get("health", 0), self.enemy.get("max_health", 0)))
 
             # Player attacks first
             self.player_turn()
             winner = self.check_battle_end()
             if winner:
-                self.combat_active = False
-                return get_battle_result(winner, self.enemy)
+                return self._finish(winner)
 
             # Enemy turn
             self.enemy_turn()
             winner = self.check_battle_end()
             if winner:
-                self.combat_active = False
-                return get_battle_result(winner, self.enemy)
+                return self._finish(winner)
+            self.turn += 1
+
+    def _finish(self, winner):
+        self.combat_active = False
+        result = get_battle_result(winner, self.enemy)
+        self.emit(BattleEnd(self.turn, winner, result["xp_gained"], result["gold_gained"]))
+        return result
 
     def player_turn(self):
         if not self.combat_active:
@@ -114,7 +362,8 @@ class SimpleBattle:
         # Basic Attack
         damage = self.calculate_damage(self.character, self.enemy)
         self.apply_damage(self.enemy, damage)
-        display_battle_log(f"You attacked the {self.enemy['name']} for {damage} damage!")
+        self.emit(DamageDealt(self.turn, self.character.get("name", "Hero"), self.enemy["name"],
+                              damage, self.enemy["health"], True))
 
     def enemy_turn(self):
         if not self.combat_active:
@@ -122,12 +371,21 @@ class SimpleBattle:
 
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"{self.enemy['name']} hit you for {damage} damage!")
+        self.emit(DamageDealt(self.turn, self.enemy["name"], self.character.get("name", "Hero"),
+                              damage, self.character["health"], False))
+
+    def use_ability(self):
+        """Player uses their class ability on the enemy this turn (instead of player_turn)."""
+        if not self.combat_active:
+            raise CombatNotActiveError("Player attempted an action outside of battle.")
+
+        message = use_special_ability(self.character, self.enemy)
+        self.emit(AbilityUsed(self.turn, self.character.get("name", "Hero"),
+                              str(self.character.get("class", "")).lower(), message))
+        return message
 
     def calculate_damage(self, attacker, defender):
-        # Simple formula, ensures at least 1 damage
-        damage = attacker.get("strength", 1) - (defender.get("strength", 0) // 4)
-        return damage if damage > 1 else 1
+        return basic_attack_damage(attacker, defender)
 
     def apply_damage(self, target, damage):
         target["health"] = max(0, target.get("health", 0) - damage)
@@ -144,14 +402,61 @@ class SimpleBattle:
             raise CombatNotActiveError("Cannot escape outside of battle.")
 
         success = random.random() < 0.5
+        self.emit(EscapeAttempt(self.turn, success))
         if success:
-            display_battle_log("You escaped successfully!")
             self.combat_active = False
-        else:
-            display_battle_log("Escape failed!")
         return success
 
 
+# ============================================================================
+# BATTLE RESOLUTION
+#Without abilities every hit in a SimpleBattle does the same damage, so the fight can be worked out directly.
+#The player needs ceil(enemy HP / player damage) hits and survives ceil(player HP / enemy damage) - 1 hits.
+#Since the player swings first, they win whenever they need no more hits than the enemy does.
+# ============================================================================
+
+def basic_attack_damage(attacker, defender):
+    # Simple formula, ensures at least 1 damage
+    damage = attacker.get("strength", 1) - (defender.get("strength", 0) // 4)
+    return damage if damage > 1 else 1
+
+
+def resolve_battle(character, enemy):
+    """
+    Result of SimpleBattle(character, enemy).start_battle() without playing
+    it out (neither dict is changed). Returns winner, turns (player attacks
+    made), character_health and enemy_health at the end, xp_gained and
+    gold_gained.
+    """
+    if character.get("health", 0) <= 0:
+        raise CharacterDeadError("Cannot start a battle while dead.")
+
+    player_damage = basic_attack_damage(character, enemy)
+    enemy_damage = basic_attack_damage(enemy, character)
+    player_health = character.get("health", 0)
+    enemy_health = enemy.get("health", 0)
+
+    hits_to_win = max(1, -(-enemy_health // player_damage))
+    hits_to_lose = -(-player_health // enemy_damage)
+
+    if hits_to_win <= hits_to_lose:
+        winner, turns = "player", hits_to_win
+        player_health -= (turns - 1) * enemy_damage
+        enemy_health = 0
+    else:
+        winner, turns = "enemy", hits_to_lose
+        enemy_health -= turns * player_damage
+        player_health = 0
+
+    result = get_battle_result(winner, enemy)
+    result.update({
+        "turns": turns,
+        "character_health": player_health,
+        "enemy_health": enemy_health,
+    })
+    return result
+
+
 # ============================================================================
 # SPECIAL ABILITIES
 #This section handles all class-specific special moves—like warrior power strikes, mage fireballs, rogue crits, and cleric heals. 
@@ -10,7 +10,30 @@ AI Usage: ChatGPT assisted in implementing module integration and safe I/O fallb
 
 import re
 import os
-from custom_exceptions import MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+import sys
+import glob
+import time
+import mmap
+import pickle
+import hashlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import inventory_system
+
+try:
+    import numpy as np
+except ImportError:
+    # optional: the columnar views fall back to the array module
+    np = None
+
+from custom_exceptions import (
+    MissingDataFileError,
+    InvalidDataFormatError,
+    CorruptedDataError,
+    InvalidItemTypeError
+)
 
 # validate_quest_data(q)
 # Ensures that a quest dictionary contains all required fields.
@@ -46,106 +69,984 @@ def validate_item_data(item):
     return True
 
 
+# ============================================================================
+# COMPILED CATALOG CACHE
+# Parsed catalogs are pickled into a __catalog_cache__ folder next to the
+# source file. Each cache file starts with a small header (source path, size,
+# mtime and content hash) followed by the parsed entries, so a stale cache can
+# be rejected without unpickling the whole catalog.
+# ============================================================================
+
+CATALOG_CACHE_DIR = "__catalog_cache__"
+CATALOG_CACHE_VERSION = 3
+
+
+# _catalog_cache_path(filename, kind)
+# Returns the path of the cache file for a data file and catalog kind.
+def _catalog_cache_path(filename, kind):
+    folder, base = os.path.split(os.path.abspath(filename))
+    return os.path.join(folder, CATALOG_CACHE_DIR, f"{base}.{kind}.cache")
+
+
+# _hash_file(filename)
+# Returns a hex digest of the file contents, read in 1 MB chunks.
+def _hash_file(filename):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# _read_catalog_cache(filename, kind)
+# Returns the cached entries for filename, or None when there is no usable
+# cache. Size and mtime matching the header is treated as fresh. If only the
+# mtime moved (file touched or copied) the content hash decides, and a
+# matching cache gets its header refreshed.
+def _read_catalog_cache(filename, kind):
+    cache_path = _catalog_cache_path(filename, kind)
+    try:
+        st = os.stat(filename)
+        with open(cache_path, "rb") as fh:
+            header = pickle.load(fh)
+            if (header.get("version") != CATALOG_CACHE_VERSION
+                    or header.get("kind") != kind
+                    or header.get("path") != os.path.abspath(filename)
+                    or header.get("size") != st.st_size):
+                return None
+            if header.get("mtime_ns") != st.st_mtime_ns:
+                if header.get("hash") != _hash_file(filename):
+                    return None
+                entries = pickle.load(fh)
+                _write_catalog_cache(filename, kind, entries)
+                return entries
+            return pickle.load(fh)
+    except Exception:
+        # missing, unreadable or truncated cache: fall back to parsing
+        return None
+
+
+# _write_catalog_cache(filename, kind, entries)
+# Writes the header and entries to a temp file and renames it into place so
+# readers never see a half-written cache. Failures are ignored; the cache is
+# only an optimisation.
+def _write_catalog_cache(filename, kind, entries):
+    cache_path = _catalog_cache_path(filename, kind)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        st = os.stat(filename)
+        header = {
+            "version": CATALOG_CACHE_VERSION,
+            "kind": kind,
+            "path": os.path.abspath(filename),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "hash": _hash_file(filename),
+        }
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(header, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(entries, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+# clear_catalog_cache(filename)
+# Removes any cached catalogs for filename. Returns the number removed.
+def clear_catalog_cache(filename):
+    removed = 0
+    for kind in ("quests", "items"):
+        try:
+            os.remove(_catalog_cache_path(filename, kind))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# _iter_kv_blocks(lines, first_line=1, errors=None)
+# Streams KEY: value blocks from any iterable of lines (an open file works).
+# first_line is the line number of the first line, for error messages.
+# Blocks are separated by blank or whitespace-only lines.
+# Keys are lowercased and values stripped, as in _parse_kv_blocks().
+# Raises InvalidDataFormatError, with the line number, on a line without ':'.
+# If an errors list is given, bad lines are appended to it as
+# (line_number, message) instead and their block is skipped.
+# Yields (line_number, entry) pairs; line_number is where the block starts.
+def _iter_kv_blocks(lines, first_line=1, errors=None):
+    entry = None
+    start = 0
+    bad = False
+    for line_no, line in enumerate(lines, first_line):
+        if not line.strip():
+            if entry is not None and not bad:
+                yield start, entry
+            entry = None
+            bad = False
+            continue
+        if entry is None:
+            entry = {}
+            start = line_no
+        if ":" not in line:
+            message = f"Invalid line in data block (line {line_no})."
+            if errors is None:
+                raise InvalidDataFormatError(message)
+            errors.append((line_no, message))
+            bad = True
+            continue
+        key, val = line.split(":", 1)
+        entry[key.strip().lower()] = val.strip()
+    if entry is not None and not bad:
+        yield start, entry
+
+
 # _parse_kv_blocks(raw)
 # Splits raw text data into blocks separated by empty lines.
 # Converts each block into a dictionary of lowercase keys and stripped values.
 # Raises InvalidDataFormatError if no blocks are found or lines are improperly formatted.
 # Returns a list of parsed dictionaries representing quests or items.
 def _parse_kv_blocks(raw):
-    blocks = [b.strip() for b in re.split(r"\n\s*\n", raw.strip()) if b.strip()]
-    if not blocks:
+    entries = [entry for _, entry in _iter_kv_blocks(raw.splitlines())]
+    if not entries:
         raise InvalidDataFormatError("No data blocks found.")
-    entries = []
-    for block in blocks:
-        entry = {}
-        for line in block.splitlines():
-            if ":" not in line:
-                raise InvalidDataFormatError("Invalid line in data block.")
-            key, val = line.split(":", 1)
-            entry[key.strip().lower()] = val.strip()
-        entries.append(entry)
     return entries
 
-# load_quests(filename)
-# Reads quest data from a specified text file.
-# Raises MissingDataFileError if the file does not exist.
-# Raises CorruptedDataError if the file cannot be read.
-# Validates that the file is not empty or invalid.
-# Parses key-value blocks using _parse_kv_blocks().
-# Converts reward_xp, reward_gold, and required_level to integers.
-# Ensures each quest has a quest_id and passes validate_quest_data().
-# Raises InvalidDataFormatError if any data is missing or incorrectly formatted.
-# Returns a dictionary mapping quest_id to quest data.
-def load_quests(filename):
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Quest data file not found: {filename}")
+
+# ============================================================================
+# QUEST AND ITEM RECORDS
+# Loaded quests and items are compact __slots__ records instead of dicts, so
+# a catalog does not repeat the same key strings in every entry. They behave
+# like the old dicts for reading: q["reward_xp"], q.get("prerequisite"),
+# "title" in q, dict(q), and they accept item assignment. Fields that are not
+# part of the standard format are kept in a small side dict.
+# Items also carry "effects", their EFFECT string compiled once at load time
+# by inventory_system.compile_item_effect().
+# ============================================================================
+
+QUEST_FIELDS = ("quest_id", "title", "description",
+                "reward_xp", "reward_gold", "required_level", "prerequisite")
+ITEM_FIELDS = ("item_id", "name", "type", "effect", "cost", "description")
+
+
+# _restore_record(cls, values, extra)
+# Pickle helper: rebuilds a record from its field tuple.
+def _restore_record(cls, values, extra):
+    record = cls.__new__(cls)
+    for field, value in zip(cls._fields, values):
+        setattr(record, field, value)
+    record._extra = extra
+    return record
+
+
+class _Record(Mapping):
+    """Read-mostly mapping over a fixed set of slots plus optional extras."""
+    __slots__ = ("_extra",)
+    _fields = ()
+    _field_set = frozenset()
+    _interned = ()
+
+    def __init__(self, values):
+        extra = None
+        for key, value in values.items():
+            if key in self._field_set:
+                if key in self._interned and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self._extra = extra
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        if key in self._field_set:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for field in self._fields:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        values = tuple(getattr(self, f, None) for f in self._fields)
+        return (_restore_record, (type(self), values, self._extra))
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Quest(_Record):
+    __slots__ = QUEST_FIELDS
+    _fields = QUEST_FIELDS
+    _field_set = frozenset(QUEST_FIELDS)
+    _interned = frozenset(("quest_id", "prerequisite"))
+
+
+class Item(_Record):
+    __slots__ = ITEM_FIELDS + ("effects",)
+    _fields = ITEM_FIELDS + ("effects",)
+    _field_set = frozenset(ITEM_FIELDS + ("effects",))
+    _interned = frozenset(("item_id", "type"))
+
+
+# _build_quest(q, line_no) / _build_item(it, line_no)
+# Convert the numeric fields of one parsed block and validate it.
+# Error messages carry the line number where the block starts.
+# Return the finished Quest or Item record.
+def _build_quest(q, line_no):
+    for k in ("reward_xp", "reward_gold", "required_level"):
+        if k in q:
+            try:
+                q[k] = int(q[k])
+            except Exception:
+                raise InvalidDataFormatError(f"Field {k} must be an integer (line {line_no}).")
+    if "quest_id" not in q:
+        raise InvalidDataFormatError(f"Missing quest_id in quest entry (line {line_no}).")
     try:
-        with open(filename, "r", encoding="utf-8") as fh:
-            raw = fh.read()
-    except Exception as e:
-        raise CorruptedDataError(f"Could not read quest data file: {e}")
-
-    if not raw or not raw.strip():
-        raise InvalidDataFormatError("Quest data file is empty or invalid.")
-
-    # parse simple KEY: value blocks
-    parsed = _parse_kv_blocks(raw)
-
-    quests = {}
-    for q in parsed:
-        # convert expected numeric fields
-        for k in ("reward_xp", "reward_gold", "required_level"):
-            if k in q:
-                try:
-                    q[k] = int(q[k])
-                except Exception:
-                    raise InvalidDataFormatError(f"Field {k} must be an integer.")
-        if "quest_id" not in q:
-            raise InvalidDataFormatError("Missing quest_id in quest entry.")
-        # validate format (will raise InvalidDataFormatError on problems)
         validate_quest_data(q)
-        quests[q["quest_id"]] = q
-
-    if not quests:
-        raise InvalidDataFormatError("No valid quests parsed.")
-    return quests
-# load_items(filename)
-# Reads item data from a specified text file.
-# Raises MissingDataFileError if the file does not exist.
-# Raises CorruptedDataError if the file cannot be read.
-# Validates that the file is not empty or invalid.
-# Parses key-value blocks using _parse_kv_blocks().
-# Converts cost fields to integers.
-# Ensures each item has an item_id and passes validate_item_data().
-# Raises InvalidDataFormatError if any data is missing or incorrectly formatted.
-# Returns a dictionary mapping item_id to item data.
-def load_items(filename):
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item data file not found: {filename}")
+    except InvalidDataFormatError as e:
+        raise InvalidDataFormatError(f"{e} (line {line_no})")
+    return Quest(q)
+
+
+def _build_item(it, line_no):
+    if "cost" in it:
+        try:
+            it["cost"] = int(it["cost"])
+        except Exception:
+            raise InvalidDataFormatError(f"Item cost must be an integer (line {line_no}).")
+    if "item_id" not in it:
+        raise InvalidDataFormatError(f"Missing item_id in item entry (line {line_no}).")
     try:
-        with open(filename, "r", encoding="utf-8") as fh:
-            raw = fh.read()
+        validate_item_data(it)
+        it["effects"] = inventory_system.compile_item_effect(it["effect"])
+    except InvalidItemTypeError as e:
+        raise InvalidDataFormatError(f"Invalid item effect: {e} (line {line_no})")
+    except InvalidDataFormatError as e:
+        raise InvalidDataFormatError(f"{e} (line {line_no})")
+    return Item(it)
+
+
+# _iter_file_entries(filename, builder)
+# Opens filename and yields builder(entry, line_no) for each block, one at a
+# time, so memory use does not grow with the size of the file.
+# Raises CorruptedDataError if the file cannot be opened or decoded.
+def _iter_file_entries(filename, builder):
+    try:
+        fh = open(filename, "r", encoding="utf-8")
     except Exception as e:
-        raise CorruptedDataError(f"Could not read item data file: {e}")
+        raise CorruptedDataError(f"Could not read data file: {e}")
+    with fh:
+        try:
+            for line_no, entry in _iter_kv_blocks(fh):
+                yield builder(entry, line_no)
+        except UnicodeDecodeError as e:
+            raise CorruptedDataError(f"Could not decode data file: {e}")
+
 
-    if not raw or not raw.strip():
-        raise InvalidDataFormatError("Item data file is empty or invalid.")
+# iter_quests(filename)
+# Streams validated quests from filename without building the full catalog.
+# Raises MissingDataFileError straight away if the file does not exist;
+# format errors are raised while iterating, at the block that caused them.
+# Returns an iterator of quest dictionaries in file order.
+def iter_quests(filename):
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Quest data file not found: {filename}")
+    return _iter_file_entries(filename, _build_quest)
 
-    parsed = _parse_kv_blocks(raw)
 
-    items = {}
-    for it in parsed:
-        if "cost" in it:
-            try:
-                it["cost"] = int(it["cost"])
-            except Exception:
-                raise InvalidDataFormatError("Item cost must be an integer.")
-        if "item_id" not in it:
-            raise InvalidDataFormatError("Missing item_id in item entry.")
-        # validate format (will raise InvalidDataFormatError on problems)
-        validate_item_data(it)
-        items[it["item_id"]] = it
+# iter_items(filename)
+# Same as iter_quests() for item data files.
+def iter_items(filename):
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item data file not found: {filename}")
+    return _iter_file_entries(filename, _build_item)
+
+
+# ============================================================================
+# CATALOG LOADING
+# load_quests / load_items accept a single file, a directory of *.txt shards
+# or a glob pattern. Shards without a fresh compiled cache are parsed in a
+# process pool and merged in sorted path order, so the result does not
+# depend on which worker finishes first.
+# ============================================================================
+
+# Per-shard timings of the most recent load_quests / load_items call, as
+# dicts with path, entries, seconds and cached keys.
+last_shard_timings = []
+
+_CATALOG_KINDS = {
+    "quests": ("Quest", "quest_id", _build_quest),
+    "items": ("Item", "item_id", _build_item),
+}
+
+
+# _resolve_shards(filename, label)
+# Expands a directory (every *.txt inside it) or a glob pattern into a
+# sorted list of files. A plain filename is returned as a single shard.
+# Raises MissingDataFileError if nothing matches.
+def _resolve_shards(filename, label):
+    if os.path.isdir(filename):
+        shards = sorted(glob.glob(os.path.join(filename, "*.txt")))
+    elif not os.path.exists(filename) and glob.has_magic(filename):
+        shards = sorted(glob.glob(filename))
+    else:
+        shards = [filename]
+    if not shards or not os.path.exists(shards[0]):
+        raise MissingDataFileError(f"{label} data file not found: {filename}")
+    return shards
+
+
+# _load_catalog_file(filename, kind, use_cache)
+# Loads one data file: fresh compiled cache first, otherwise a streaming
+# parse that then refreshes the cache.
+# Returns a dictionary mapping id to entry.
+def _load_catalog_file(filename, kind, use_cache):
+    label, id_key, builder = _CATALOG_KINDS[kind]
+    if use_cache:
+        cached = _read_catalog_cache(filename, kind)
+        if cached is not None:
+            return cached
+
+    entries = {}
+    for entry in _iter_file_entries(filename, builder):
+        entries[entry[id_key]] = entry
+
+    if not entries:
+        raise InvalidDataFormatError(f"{label} data file is empty or invalid.")
+    if use_cache:
+        _write_catalog_cache(filename, kind, entries)
+    return entries
+
+
+# _load_shard(job)
+# Process pool worker: parses one shard and times it.
+# Returns (entries, seconds).
+def _load_shard(job):
+    filename, kind, use_cache = job
+    start = time.perf_counter()
+    entries = _load_catalog_file(filename, kind, use_cache)
+    return entries, time.perf_counter() - start
+
+
+# _load_catalog(filename, kind, use_cache, workers)
+# Loads every shard behind filename and merges them.
+# Raises InvalidDataFormatError if the same id appears in two shards.
+# Records per-shard timings in last_shard_timings.
+# Returns the merged dictionary.
+def _load_catalog(filename, kind, use_cache, workers):
+    global last_shard_timings
+    label, id_key, _ = _CATALOG_KINDS[kind]
+    shards = _resolve_shards(filename, label)
+
+    results = {}
+    timings = {}
+    stale = []
+    for shard in shards:
+        start = time.perf_counter()
+        cached = _read_catalog_cache(shard, kind) if use_cache else None
+        if cached is None:
+            stale.append(shard)
+        else:
+            results[shard] = cached
+            timings[shard] = (time.perf_counter() - start, True)
+
+    jobs = [(shard, kind, use_cache) for shard in stale]
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if len(jobs) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_load_shard, jobs))
+    else:
+        parsed = [_load_shard(job) for job in jobs]
+    for shard, (entries, seconds) in zip(stale, parsed):
+        results[shard] = entries
+        timings[shard] = (seconds, False)
+
+    if len(shards) == 1:
+        merged = results[shards[0]]
+    else:
+        merged = {}
+        for shard in shards:
+            entries = results[shard]
+            duplicates = merged.keys() & entries.keys()
+            if duplicates:
+                dup = min(duplicates)
+                first = next(s for s in shards if dup in results[s])
+                raise InvalidDataFormatError(
+                    f"Duplicate {id_key} '{dup}' in {shard} (already defined in {first})."
+                )
+            merged.update(entries)
+
+    last_shard_timings = [
+        {"path": shard, "entries": len(results[shard]),
+         "seconds": timings[shard][0], "cached": timings[shard][1]}
+        for shard in shards
+    ]
+    return merged
+
+
+# load_quests(filename, use_cache=True, workers=None)
+# Reads quest data from a file, a directory of shards or a glob pattern.
+# Raises MissingDataFileError if the file does not exist (or nothing matches).
+# Raises CorruptedDataError if a file cannot be read.
+# Streams each file through the block parser, one validated quest at a time.
+# Raises InvalidDataFormatError (with a line number) on bad entries, if a
+# file holds no quests at all, or if two shards define the same quest_id.
+# Uses the compiled catalog cache when it is fresh (use_cache=False skips it).
+# workers caps the process pool used for stale shards (1 = no pool).
+# Returns a dictionary mapping quest_id to quest data.
+def load_quests(filename, use_cache=True, workers=None):
+    return _load_catalog(filename, "quests", use_cache, workers)
+
+
+# load_items(filename, use_cache=True, workers=None)
+# Same as load_quests() for item data; returns item_id -> item data.
+def load_items(filename, use_cache=True, workers=None):
+    return _load_catalog(filename, "items", use_cache, workers)
+
+
+# ============================================================================
+# CLASS TEMPLATES
+# ============================================================================
+
+CLASS_FIELDS = ("class", "health", "strength", "magic", "gold")
+DEFAULT_STARTING_GOLD = 100
+
+
+# _build_class(c, line_no)
+# Converts the stat fields of one class block to integers and checks them.
+# GOLD is optional (DEFAULT_STARTING_GOLD). Returns the template dictionary.
+def _build_class(c, line_no):
+    if "class" not in c or not c["class"]:
+        raise InvalidDataFormatError(f"Missing class in class entry (line {line_no}).")
+    c.setdefault("gold", DEFAULT_STARTING_GOLD)
+    for k in CLASS_FIELDS[1:]:
+        if k not in c:
+            raise InvalidDataFormatError(f"Missing required field: {k} (line {line_no})")
+        try:
+            c[k] = int(c[k])
+        except Exception:
+            raise InvalidDataFormatError(f"Field {k} must be an integer (line {line_no}).")
+    if c["health"] <= 0:
+        raise InvalidDataFormatError(f"Class health must be positive (line {line_no}).")
+    return {k: c[k] for k in CLASS_FIELDS}
+
+
+# load_classes(filename="data/classes.txt")
+# Reads character class templates (CLASS, HEALTH, STRENGTH, MAGIC, GOLD).
+# Raises MissingDataFileError if the file does not exist, and
+# InvalidDataFormatError on bad entries, duplicate classes or an empty file.
+# Returns a dictionary mapping class name to its template.
+def load_classes(filename="data/classes.txt"):
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Class data file not found: {filename}")
+    classes = {}
+    for template in _iter_file_entries(filename, _build_class):
+        if template["class"] in classes:
+            raise InvalidDataFormatError(f"Duplicate class: {template['class']}")
+        classes[template["class"]] = template
+    if not classes:
+        raise InvalidDataFormatError("Class data file is empty or invalid.")
+    return classes
+
+
+# ============================================================================
+# ENEMY TEMPLATES
+# An enemy's stats are for its base LEVEL (default 1). The optional
+# *_PER_LEVEL fields (default 0) are added once for every level above it.
+# ============================================================================
+
+ENEMY_FIELDS = ("name", "level", "health", "strength", "magic", "xp_reward", "gold_reward")
+ENEMY_SCALING_FIELDS = ("health_per_level", "strength_per_level", "magic_per_level",
+                        "xp_per_level", "gold_per_level")
+
+
+# _build_enemy(e, line_no)
+# Converts the number fields of one enemy block to integers and checks them.
+# Returns the template dictionary (ENEMY_FIELDS then ENEMY_SCALING_FIELDS).
+def _build_enemy(e, line_no):
+    if "name" not in e or not e["name"]:
+        raise InvalidDataFormatError(f"Missing name in enemy entry (line {line_no}).")
+    e.setdefault("level", 1)
+    for k in ENEMY_SCALING_FIELDS:
+        e.setdefault(k, 0)
+    for k in ENEMY_FIELDS[1:] + ENEMY_SCALING_FIELDS:
+        if k not in e:
+            raise InvalidDataFormatError(f"Missing required field: {k} (line {line_no})")
+        try:
+            e[k] = int(e[k])
+        except Exception:
+            raise InvalidDataFormatError(f"Field {k} must be an integer (line {line_no}).")
+    if e["health"] <= 0 or e["level"] < 1:
+        raise InvalidDataFormatError(f"Enemy health and level must be positive (line {line_no}).")
+    return {k: e[k] for k in ENEMY_FIELDS + ENEMY_SCALING_FIELDS}
+
+
+# load_enemies(filename="data/enemies.txt")
+# Reads enemy templates (NAME, LEVEL, HEALTH, STRENGTH, MAGIC, XP_REWARD,
+# GOLD_REWARD and the optional *_PER_LEVEL growth fields).
+# Raises MissingDataFileError if the file does not exist, and
+# InvalidDataFormatError on bad entries, duplicate names or an empty file.
+# Returns a dictionary mapping the lowercased enemy name to its template.
+def load_enemies(filename="data/enemies.txt"):
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Enemy data file not found: {filename}")
+    enemies = {}
+    for template in _iter_file_entries(filename, _build_enemy):
+        key = template["name"].lower()
+        if key in enemies:
+            raise InvalidDataFormatError(f"Duplicate enemy: {template['name']}")
+        enemies[key] = template
+    if not enemies:
+        raise InvalidDataFormatError("Enemy data file is empty or invalid.")
+    return enemies
+
+
+# ============================================================================
+# ENCOUNTER TABLES
+# Each block covers character levels MIN_LEVEL..MAX_LEVEL (no MAX_LEVEL: every
+# level from MIN_LEVEL up) and lists weighted enemies as
+# ENEMIES: goblin=7, wolf=3. Enemy names are not checked here.
+# ============================================================================
+
+# _parse_encounter_enemies(text, line_no)
+# Splits "name=weight, name=weight" into [(lowercased name, weight)].
+def _parse_encounter_enemies(text, line_no):
+    enemies = []
+    for part in text.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip().lower()
+        try:
+            weight = float(weight) if sep else None
+        except ValueError:
+            weight = None
+        if not name or weight is None or not weight > 0:
+            raise InvalidDataFormatError(f"Bad encounter entry '{part.strip()}' (line {line_no}).")
+        if any(name == n for n, _ in enemies):
+            raise InvalidDataFormatError(f"Enemy listed twice: {name} (line {line_no})")
+        enemies.append((name, weight))
+    return enemies
+
+
+# _build_encounter(e, line_no)
+# Checks one encounter block. Returns {"min_level", "max_level", "enemies"};
+# max_level is None for an open-ended table.
+def _build_encounter(e, line_no):
+    if "enemies" not in e or not e["enemies"]:
+        raise InvalidDataFormatError(f"Missing required field: enemies (line {line_no})")
+    levels = {}
+    for k in ("min_level", "max_level"):
+        try:
+            levels[k] = int(e[k]) if k in e else None
+        except Exception:
+            raise InvalidDataFormatError(f"Field {k} must be an integer (line {line_no}).")
+    if levels["min_level"] is None or levels["min_level"] < 1:
+        raise InvalidDataFormatError(f"MIN_LEVEL must be a positive integer (line {line_no}).")
+    if levels["max_level"] is not None and levels["max_level"] < levels["min_level"]:
+        raise InvalidDataFormatError(f"MAX_LEVEL is below MIN_LEVEL (line {line_no}).")
+    levels["enemies"] = _parse_encounter_enemies(e["enemies"], line_no)
+    return levels
+
+
+# load_encounters(filename="data/encounters.txt")
+# Reads encounter tables (MIN_LEVEL, optional MAX_LEVEL, ENEMIES).
+# Raises MissingDataFileError if the file does not exist, and
+# InvalidDataFormatError on bad entries, overlapping level ranges or an
+# empty file. Returns the tables sorted by min_level.
+def load_encounters(filename="data/encounters.txt"):
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Encounter data file not found: {filename}")
+    tables = sorted(_iter_file_entries(filename, _build_encounter), key=lambda t: t["min_level"])
+    if not tables:
+        raise InvalidDataFormatError("Encounter data file is empty or invalid.")
+    for before, after in zip(tables, tables[1:]):
+        if before["max_level"] is None or before["max_level"] >= after["min_level"]:
+            raise InvalidDataFormatError(f"Encounter level ranges overlap at level {after['min_level']}.")
+    return tables
+
+
+# ============================================================================
+# LAZY CATALOGS
+# A LazyCatalog memory-maps a quest or item file and only keeps an index of
+# id -> (offset, length). Blocks are parsed the first time they are looked up
+# and the most recent ones are kept in a small LRU. The index itself is stored
+# in the catalog cache folder, so reopening an unchanged file never scans it.
+# ============================================================================
+
+_BLOCK_SEPARATOR = re.compile(rb"\n\s*\n")
+_ID_LINES = {
+    "quests": re.compile(rb"^[ \t]*quest_id[ \t]*:(.*)$", re.M | re.I),
+    "items": re.compile(rb"^[ \t]*item_id[ \t]*:(.*)$", re.M | re.I),
+}
+
+
+# _build_block_index(data, kind)
+# Scans a bytes-like object (bytes or mmap) for blocks and their id lines.
+# Only the id line of each block is decoded.
+# Raises InvalidDataFormatError if a non-empty block has no id.
+# Returns a dictionary mapping id to (offset, length) of its block.
+def _build_block_index(data, kind):
+    id_line = _ID_LINES[kind]
+    index = {}
+    start = 0
+    separators = _BLOCK_SEPARATOR.finditer(data)
+    while start < len(data):
+        sep = next(separators, None)
+        end = sep.start() if sep else len(data)
+        match = id_line.search(data, start, end)
+        if match:
+            index[match.group(1).strip().decode("utf-8")] = (start, end - start)
+        elif data[start:end].strip():
+            line_no = data[:start].count(b"\n") + 1
+            raise InvalidDataFormatError(f"Missing {kind[:-1]}_id in entry (line {line_no}).")
+        start = sep.end() if sep else len(data)
+    return index
+
+
+class LazyCatalog(Mapping):
+    """
+    Read-only mapping of id -> quest/item backed by a memory-mapped file.
+    Works anywhere a loaded catalog dict is expected (quest_handler,
+    inventory_system). The file should not be rewritten in place while open.
+    """
+
+    def __init__(self, filename, kind, cache_size=1024):
+        if kind not in _CATALOG_KINDS:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Data file not found: {filename}")
+        self.filename = filename
+        self.kind = kind
+        self.cache_size = cache_size
+        self._decoded = OrderedDict()
+        try:
+            with open(filename, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    raise InvalidDataFormatError("Data file is empty or invalid.")
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except InvalidDataFormatError:
+            raise
+        except Exception as e:
+            raise CorruptedDataError(f"Could not read data file: {e}")
+
+        try:
+            index = _read_catalog_cache(filename, f"{kind}.index")
+            if index is None:
+                index = _build_block_index(self._mmap, kind)
+                _write_catalog_cache(filename, f"{kind}.index", index)
+            if not index:
+                raise InvalidDataFormatError("Data file is empty or invalid.")
+        except BaseException:
+            # nobody gets a catalog to close, so release the mapping here
+            self._mmap.close()
+            raise
+        self._index = index
+
+    def __getitem__(self, key):
+        entry = self._decoded.get(key)
+        if entry is not None:
+            self._decoded.move_to_end(key)
+            return entry
+        offset, length = self._index[key]
+        entry = self._decode(offset, length)
+        self._decoded[key] = entry
+        if len(self._decoded) > self.cache_size:
+            self._decoded.popitem(last=False)
+        return entry
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def _decode(self, offset, length):
+        try:
+            text = self._mmap[offset:offset + length].decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise CorruptedDataError(f"Could not decode data file: {e}")
+        try:
+            return self._build(text, 1)
+        except InvalidDataFormatError:
+            # rebuild only on failure, so the error carries the real line number
+            return self._build(text, self._mmap[:offset].count(b"\n") + 1)
+
+    def _build(self, text, first_line):
+        for line_no, entry in _iter_kv_blocks(text.splitlines(), first_line):
+            return _CATALOG_KINDS[self.kind][2](entry, line_no)
+        raise InvalidDataFormatError(f"Empty data block (line {first_line}).")
+
+    def close(self):
+        self._decoded.clear()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# open_quest_catalog(filename, cache_size=1024)
+# Opens a lazily parsed quest catalog. Startup cost is the index size only.
+# Returns a LazyCatalog usable as a quest_data_dict.
+def open_quest_catalog(filename, cache_size=1024):
+    return LazyCatalog(filename, "quests", cache_size)
+
+
+# open_item_catalog(filename, cache_size=1024)
+# Same as open_quest_catalog() for item data files.
+def open_item_catalog(filename, cache_size=1024):
+    return LazyCatalog(filename, "items", cache_size)
+
+
+# ============================================================================
+# COLUMNAR VIEWS
+# Balancing scripts can turn a catalog into columns in one pass and filter or
+# aggregate those instead of looping over quest/item records. Columns are
+# NumPy arrays when NumPy is installed, otherwise array("q") columns (and a
+# plain list for ids) with the same helpers working on them in Python.
+# Text fields with few distinct values (type, prerequisite) are stored as
+# integer codes plus a labels list: labels[codes[i]] is the original value.
+# ============================================================================
+
+# _int_column(values) / _id_column(values)
+# Build a numeric or id column from a list.
+def _int_column(values):
+    if np is not None:
+        return np.array(values, dtype=np.int64)
+    return array("q", values)
+
+
+def _id_column(values):
+    if np is not None:
+        return np.array(values, dtype=object)
+    return values
+
+
+# _categorical(values)
+# Returns (codes column, labels list) for a list of strings.
+def _categorical(values):
+    lookup = {}
+    labels = []
+    codes = []
+    for value in values:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(labels)
+            labels.append(value)
+        codes.append(code)
+    return _int_column(codes), labels
+
+
+# quest_columns(quest_data_dict)
+# Builds a columnar view of a quest catalog in a single pass.
+# Returns a dict with "ids", "reward_xp", "reward_gold", "required_level",
+# "prerequisite_codes" and "prerequisite_labels".
+def quest_columns(quest_data_dict):
+    ids, xp, gold, level, prereq = [], [], [], [], []
+    for qid, q in quest_data_dict.items():
+        ids.append(qid)
+        xp.append(q.get("reward_xp", 0))
+        gold.append(q.get("reward_gold", 0))
+        level.append(q.get("required_level", 1))
+        prereq.append(q.get("prerequisite", "NONE"))
+    codes, labels = _categorical(prereq)
+    return {
+        "ids": _id_column(ids),
+        "reward_xp": _int_column(xp),
+        "reward_gold": _int_column(gold),
+        "required_level": _int_column(level),
+        "prerequisite_codes": codes,
+        "prerequisite_labels": labels,
+    }
+
+
+# item_columns(item_data)
+# Builds a columnar view of an item catalog in a single pass.
+# Returns a dict with "ids", "cost", "type_codes" and "type_labels".
+def item_columns(item_data):
+    ids, cost, types = [], [], []
+    for item_id, item in item_data.items():
+        ids.append(item_id)
+        cost.append(item.get("cost", 0))
+        types.append(item.get("type", ""))
+    codes, labels = _categorical(types)
+    return {
+        "ids": _id_column(ids),
+        "cost": _int_column(cost),
+        "type_codes": codes,
+        "type_labels": labels,
+    }
+
+
+# select_quests_by_level(columns, min_level, max_level)
+# Columnar version of quest_handler.get_quests_by_level().
+# Returns the list of quest ids whose required_level is in range.
+def select_quests_by_level(columns, min_level, max_level):
+    levels = columns["required_level"]
+    if np is not None and isinstance(levels, np.ndarray):
+        mask = (levels >= min_level) & (levels <= max_level)
+        return columns["ids"][mask].tolist()
+    ids = columns["ids"]
+    return [ids[i] for i, rl in enumerate(levels) if min_level <= rl <= max_level]
+
+
+# column_summary(column)
+# Returns count, sum, min, max and mean of a numeric column.
+def column_summary(column):
+    count = len(column)
+    if count == 0:
+        return {"count": 0, "sum": 0, "min": None, "max": None, "mean": 0.0}
+    if np is not None and isinstance(column, np.ndarray):
+        total, low, high = int(column.sum()), int(column.min()), int(column.max())
+    else:
+        total, low, high = sum(column), min(column), max(column)
+    return {"count": count, "sum": total, "min": low, "max": high, "mean": total / count}
+
+
+# group_sum(keys, values)
+# Sums values per distinct key, e.g. reward_xp per required_level or cost
+# per type code. Returns a dict key -> (count, sum), sorted by key.
+def group_sum(keys, values):
+    if np is not None and isinstance(keys, np.ndarray):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(sums, inverse, values)  # exact integer sums
+        return {int(k): (int(c), int(t)) for k, c, t in zip(unique, counts, sums)}
+    groups = {}
+    for key, value in zip(keys, values):
+        count, total = groups.get(key, (0, 0))
+        groups[key] = (count + 1, total + value)
+    return dict(sorted(groups.items()))
+
+
+# ============================================================================
+# CATALOG VALIDATION
+# validate_catalog() checks a whole content drop in one streaming pass and
+# reports every problem at once: malformed lines, missing fields, non-integer
+# numbers, bad effects, duplicate ids (within and across shards) and, for
+# quests, prerequisites that point at quests which do not exist (the rule
+# from quest_handler.validate_quest_prerequisites). Each problem costs O(1)
+# bookkeeping, so the check stays linear in the size of the catalog.
+# ============================================================================
+
+# validate_catalog(filename, kind="quests", strict=False)
+# filename may be a file, a directory of shards or a glob, as for load_quests.
+# strict=True keeps the fail-fast behaviour of load_quests/load_items and
+# raises InvalidDataFormatError at the first problem.
+# Returns a report dict: kind, files, entries (count of good entries),
+# errors (list of dicts with file, line, id and message, in file order) and
+# valid (True when there are no errors).
+def validate_catalog(filename, kind="quests", strict=False):
+    if kind not in _CATALOG_KINDS:
+        raise ValueError(f"Unknown catalog kind: {kind}")
+    label, id_key, builder = _CATALOG_KINDS[kind]
+    shards = _resolve_shards(filename, label)
+
+    errors = []
+    seen = {}  # id -> (file, line) where it was first defined
+    prerequisites = []  # (file, line, quest_id, prerequisite)
+    entries = 0
+
+    def report(path, line, entry_id, message):
+        if strict:
+            raise InvalidDataFormatError(f"{message} [{path}]")
+        errors.append({"file": path, "line": line, "id": entry_id, "message": message})
+
+    for path in shards:
+        line_errors = [] if not strict else None
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line_no, raw in _iter_kv_blocks(fh, 1, line_errors):
+                    entry_id = raw.get(id_key)
+                    try:
+                        entry = builder(raw, line_no)
+                    except InvalidDataFormatError as e:
+                        report(path, line_no, entry_id, str(e))
+                        continue
+                    entry_id = entry[id_key]
+                    if entry_id in seen:
+                        first_path, first_line = seen[entry_id]
+                        report(path, line_no, entry_id,
+                               f"Duplicate {id_key} '{entry_id}' (first defined in "
+                               f"{first_path}, line {first_line}).")
+                        continue
+                    seen[entry_id] = (path, line_no)
+                    entries += 1
+                    if kind == "quests":
+                        prereq = entry["prerequisite"]
+                        if prereq and prereq != "NONE":
+                            prerequisites.append((path, line_no, entry_id, prereq))
+        except UnicodeDecodeError as e:
+            report(path, 0, None, f"Could not decode data file: {e}")
+        except OSError as e:
+            report(path, 0, None, f"Could not read data file: {e}")
+        for line_no, message in line_errors or ():
+            errors.append({"file": path, "line": line_no, "id": None, "message": message})
+
+    for path, line_no, quest_id, prereq in prerequisites:
+        if prereq not in seen:
+            report(path, line_no, quest_id, f"Prerequisite '{prereq}' for '{quest_id}' not found.")
+
+    if entries == 0 and not errors:
+        report(shards[0], 0, None, f"{label} data file is empty or invalid.")
+
+    order = {path: i for i, path in enumerate(shards)}
+    errors.sort(key=lambda e: (order[e["file"]], e["line"]))
+    return {
+        "kind": kind,
+        "files": shards,
+        "entries": entries,
+        "errors": errors,
+        "valid": not errors,
+    }
+
 
-    if not items:
-        raise InvalidDataFormatError("No valid items parsed.")
-    return items
+# Command line: python game_data.py quests|items PATH
+# Prints every problem found in the catalog and exits non-zero if any.
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in _CATALOG_KINDS:
+        print("usage: python game_data.py quests|items PATH")
+        sys.exit(2)
+    result = validate_catalog(sys.argv[2], sys.argv[1])
+    for problem in result["errors"]:
+        print(f"{problem['file']}:{problem['line']}: {problem['message']}")
+    print(f"{result['entries']} valid {sys.argv[1]}, {len(result['errors'])} problems")
+    sys.exit(0 if result["valid"] else 1)
@@ -10,6 +10,7 @@ AI Usage: Chatgpt to refactor my code as well as organize
 This module handles inventory management, item usage, and equipment.
 """
 
+from functools import lru_cache
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -80,19 +81,20 @@ def use_item(character, item_id, item_data):
     if item_data.get("type") != "consumable":
         raise InvalidItemTypeError("Only consumables can be used.")
 
-    stat, amount = parse_item_effect(item_data.get("effect"))
-    apply_stat_effect(character, stat, amount)
+    effects = get_item_effects(item_data)
+    apply_item_effects(character, effects)
 
     remove_item_from_inventory(character, item_id)
     # Use name if available, else item_id
     name = item_data.get("name", item_id)
-    return f"Used {name} (+{amount} {stat})."
+    changes = ", ".join(f"{amount:+d} {stat}" for stat, amount, _ in effects)
+    return f"Used {name} ({changes})."
 
 # ============================================================================
 # EQUIPPING WEAPONS
 #Literal: offensive equipment (swords, bows, etc.).
 #In code: items with type "weapon" handled by equip_weapon and unequip_weapon.
-#Note: currently assumes single-stat effects; multi-stat weapons would need richer storage.
+#Note: effects come pre-compiled from the item record, so multi-stat weapons work.
 # ============================================================================
 
 def equip_weapon(character, item_id, item_data):
@@ -106,12 +108,11 @@ def equip_weapon(character, item_id, item_data):
     if character.get("equipped_weapon") is not None:
         unequip_weapon(character)
 
-    stat, value = parse_item_effect(item_data.get("effect"))
-    apply_stat_effect(character, stat, value)
+    applied = apply_item_effects(character, get_item_effects(item_data))
 
     character["equipped_weapon"] = item_id
-    # store effect tuple for unequip
-    character["weapon_effect"] = (stat, value)
+    # store the (stat, change) pairs actually applied, for unequip
+    character["weapon_effect"] = applied
     remove_item_from_inventory(character, item_id)
 
     return f"You equipped {item_data.get('name', item_id)}."
@@ -120,7 +121,7 @@ def equip_weapon(character, item_id, item_data):
 # EQUIPPING ARMOR
 #Literal: defensive equipment (helmets, chestplates, etc.).
 #In code: items with type "armor" handled by equip_armor and unequip_armor.
-#Note: same multi-stat limitation as weapons.
+#Note: same compiled, multi-stat effects as weapons.
 
 # ============================================================================
 
@@ -134,12 +135,11 @@ def equip_armor(character, item_id, item_data):
     if character.get("equipped_armor") is not None:
         unequip_armor(character)
 
-    stat, value = parse_item_effect(item_data.get("effect"))
-    apply_stat_effect(character, stat, value)
+    applied = apply_item_effects(character, get_item_effects(item_data))
 
     character["equipped_armor"] = item_id
-    # store effect tuple for unequip
-    character["armor_effect"] = (stat, value)
+    # store the (stat, change) pairs actually applied, for unequip
+    character["armor_effect"] = applied
     remove_item_from_inventory(character, item_id)
 
     return f"You equipped {item_data.get('name', item_id)}."
@@ -163,10 +163,7 @@ def unequip_weapon(character):
     return_weapon = weapon_id
 
     # Reverse the effect from equipped weapon
-    effect = character.get("weapon_effect")
-    if effect:
-        stat, value = effect
-        apply_stat_effect(character, stat, -value)
+    _reverse_effect(character, character.get("weapon_effect"))
 
     character["equipped_weapon"] = None
     character["weapon_effect"] = None
@@ -183,10 +180,7 @@ def unequip_armor(character):
     if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory full.")
 
-    effect = character.get("armor_effect")
-    if effect:
-        stat, value = effect
-        apply_stat_effect(character, stat, -value)
+    _reverse_effect(character, character.get("armor_effect"))
 
     character["equipped_armor"] = None
     character["armor_effect"] = None
@@ -197,37 +191,105 @@ def unequip_armor(character):
 # ============================================================================
 # ITEM EFFECT PARSING & APPLY
 #Literal: converting a textual/structured input into a programmatic form.
-#In code: parse_item_effect turns "stat:amount" or {"stat": amount} into usable values.
-#Note: be cautious — dict input currently returns only the first pair; that can silently drop data.
+#In code: compile_item_effect turns "stat:amount[:cap], ..." or {"stat": amount} into a
+#compiled effect vector: a tuple of (stat, amount, cap) triples. game_data compiles every
+#item once at load time and stores it as item["effects"], so use/equip never parse strings.
+#Note: amounts may be signed ("magic:-2"); cap (optional) is the highest value the effect
+#can push the stat to.
 # ============================================================================
 
-def parse_item_effect(effect):
+@lru_cache(maxsize=1024)
+def _compile_effect_string(effect):
+    effects = []
+    for part in effect.split(","):
+        fields = [f.strip() for f in part.split(":")]
+        if len(fields) not in (2, 3) or not fields[0]:
+            raise InvalidItemTypeError("Effect format must be 'stat:amount' or 'stat:amount:cap'")
+        try:
+            amount = int(fields[1])
+            cap = int(fields[2]) if len(fields) == 3 else None
+        except ValueError:
+            raise InvalidItemTypeError("Effect amount and cap must be integers")
+        effects.append((fields[0], amount, cap))
+    return tuple(effects)
+
+
+def compile_item_effect(effect):
     """
-    Accept either a dict {stat: int} or a string "stat:amount" and return (stat, amount)
+    Compile an effect string, {stat: amount} dict or already compiled tuple into a
+    tuple of (stat, amount, cap) triples. Raises InvalidItemTypeError on bad input.
     """
+    if isinstance(effect, tuple):
+        return effect
     if isinstance(effect, dict):
-        # return the first pair
-        for k, v in effect.items():
-            return k, int(v)
+        try:
+            return tuple((str(k).strip(), int(v), None) for k, v in effect.items())
+        except (TypeError, ValueError):
+            raise InvalidItemTypeError("Effect amounts must be integers")
     if isinstance(effect, str):
-        if ":" not in effect:
-            raise InvalidItemTypeError("Effect format must be 'stat:amount'")
-        stat, amount = effect.split(":", 1)
-        return stat.strip(), int(amount)
+        return _compile_effect_string(effect)
     raise InvalidItemTypeError("Invalid effect format/type")
 
-def apply_stat_effect(character, stat, amount):
+
+def get_item_effects(item_data):
+    """
+    Return the compiled effects of an item: the pre-compiled item["effects"] from
+    game_data when present, otherwise its "effect" field compiled (and cached) now.
+    """
+    effects = item_data.get("effects")
+    if effects is None:
+        effects = compile_item_effect(item_data.get("effect"))
+    return effects
+
+
+def parse_item_effect(effect):
+    """
+    Accept either a dict {stat: int} or a string "stat:amount" and return (stat, amount).
+    Only for single-stat effects; multi-stat effects raise InvalidItemTypeError instead of
+    being cut down to their first stat (use compile_item_effect for those).
+    """
+    effects = compile_item_effect(effect)
+    if len(effects) != 1:
+        raise InvalidItemTypeError("Effect has more than one stat; use compile_item_effect")
+    stat, amount, _ = effects[0]
+    return stat, amount
+
+def apply_stat_effect(character, stat, amount, cap=None):
     """
     Apply stat changes to the character. 'health' is bounded by max_health.
-    Other stats are created/updated as integers.
+    Other stats are created/updated as integers. An optional cap stops an increase
+    at that value (a stat already above the cap is left alone).
+    Returns the change actually applied.
     """
+    old = character.get(stat, 0)
     if stat == "health":
-        character["health"] = min(character.get("max_health", 0), character.get("health", 0) + amount)
+        new = min(character.get("max_health", 0), old + amount)
         # don't allow negative health from apply_stat_effect (damage should be handled elsewhere)
-        if character["health"] < 0:
-            character["health"] = 0
+        if new < 0:
+            new = 0
     else:
-        character[stat] = character.get(stat, 0) + amount
+        new = old + amount
+    if cap is not None and amount > 0:
+        new = min(new, max(cap, old))
+    character[stat] = new
+    return new - old
+
+def apply_item_effects(character, effects):
+    """
+    Apply a compiled effect vector. Returns the (stat, change) pairs actually applied,
+    which is what unequipping needs to undo.
+    """
+    return tuple((stat, apply_stat_effect(character, stat, amount, cap))
+                 for stat, amount, cap in effects)
+
+def _reverse_effect(character, applied):
+    # applied is a tuple of (stat, change) pairs, or a single pair from older saves
+    if not applied:
+        return
+    if isinstance(applied[0], str):
+        applied = (applied,)
+    for stat, change in applied:
+        apply_stat_effect(character, stat, -change)
 
 # ============================================================================
 # SHOP / ECONOMY
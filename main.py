@@ -13,6 +13,8 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import catalog_watcher
+import autosave
 from custom_exceptions import *
 
 # ============================================================================#
@@ -25,6 +27,16 @@ all_quests = {}
 all_items = {}
 game_running = False
 
+# Catalog files and the watchers that hot-reload them
+QUEST_DATA_FILE = "data/quests.txt"
+ITEM_DATA_FILE = "data/items.txt"
+quest_watcher = None
+item_watcher = None
+
+# Background saver used for autosaves (started on first use)
+AUTOSAVE_INTERVAL = 5.0
+autosaver = None
+
 # ============================================================================#
 # MAIN MENU
 # ============================================================================#
@@ -169,32 +181,37 @@ def game_loop():
     game_running = True
     print(f"\nEntering game as {current_character['name']} the {current_character['class']}.")
 
-    while game_running:
-        choice = game_menu()
-
-        if choice == 1:
-            view_character_stats()
-        elif choice == 2:
-            view_inventory()
-        elif choice == 3:
-            quest_menu()
-        elif choice == 4:
-            explore()
-            # If character died during explore, handle
-            if character_manager.is_character_dead(current_character):
-                handle_character_death()
-                if not game_running:
-                    break
-        elif choice == 5:
-            shop()
-        elif choice == 6:
-            # Save and Quit
-            save_game()
-            print("Returning to main menu.")
-            break
-        else:
-            print("Invalid choice. Returning to main menu.")
-            break
+    try:
+        while game_running:
+            refresh_game_data()
+            choice = game_menu()
+
+            if choice == 1:
+                view_character_stats()
+            elif choice == 2:
+                view_inventory()
+            elif choice == 3:
+                quest_menu()
+            elif choice == 4:
+                explore()
+                # If character died during explore, handle
+                if character_manager.is_character_dead(current_character):
+                    handle_character_death()
+                    if not game_running:
+                        break
+            elif choice == 5:
+                shop()
+            elif choice == 6:
+                # Save and Quit
+                save_game()
+                print("Returning to main menu.")
+                break
+            else:
+                print("Invalid choice. Returning to main menu.")
+                break
+    finally:
+        # never leave the session with autosaves still queued
+        flush_autosaves()
 
 # ============================================================================#
 # GAME MENU
@@ -303,11 +320,11 @@ def explore():
         return
 
     level = current_character.get("level", 1)
-    enemy = combat_system.get_random_enemy_for_level(level)
-    print(f"\nYou encountered a {enemy['name']}!")
-
-    battle = combat_system.SimpleBattle(current_character, enemy)
     try:
+        enemy = combat_system.get_random_enemy_for_level(level)
+        print(f"\nYou encountered a {enemy['name']}!")
+
+        battle = combat_system.SimpleBattle(current_character, enemy)
         result = battle.start_battle()
         if result["winner"] == "player":
             # Award rewards
@@ -324,8 +341,8 @@ def explore():
                 # shouldn't happen, but ignore
                 pass
             print(f"Victory! Gained {xp} XP and {gold} gold.")
-            # Auto-save after combat
-            save_game()
+            # Auto-save after combat (written in the background)
+            autosave_game()
         else:
             print("You were defeated...")
             handle_character_death()
@@ -334,6 +351,8 @@ def explore():
         handle_character_death()
     except InvalidTargetError:
         print("Invalid enemy encountered.")
+    except DataError as e:
+        print(f"Could not pick an enemy: {e}")
     except Exception as e:
         print(f"Combat error: {e}")
 
@@ -374,6 +393,8 @@ def save_game():
         return
 
     try:
+        # drop any queued autosave first so it cannot overwrite this one
+        flush_autosaves()
         character_manager.save_character(current_character)
         print("Game saved.")
     except PermissionError:
@@ -383,21 +404,34 @@ def save_game():
     except Exception as e:
         print(f"Unknown error saving game: {e}")
 
+def autosave_game():
+    """Queue the current character for a background save; returns at once."""
+    global autosaver
+
+    if not current_character:
+        return
+    if autosaver is None:
+        autosaver = autosave.AutosaveWorker(interval=AUTOSAVE_INTERVAL)
+    autosaver.request(current_character)
+
+def flush_autosaves():
+    """Write all queued autosaves now and report any that failed."""
+    if autosaver is None:
+        return
+    failed = autosaver.failed
+    autosaver.flush()
+    if autosaver.failed != failed:
+        print(f"Autosave failed: {autosaver.last_error}")
+
 def load_game_data():
-    """Load all quest and item data from files (best-effort)."""
-    global all_quests, all_items
+    """Load all quest, item, enemy and encounter data and start watching quests/items for edits."""
+    global all_quests, all_items, quest_watcher, item_watcher
 
     try:
-        # Try to use game_data helpers if available
-        if hasattr(game_data, "load_quests"):
-            all_quests = game_data.load_quests()
-        else:
-            all_quests = {}
-
-        if hasattr(game_data, "load_items"):
-            all_items = game_data.load_items()
-        else:
-            all_items = {}
+        quest_watcher = catalog_watcher.CatalogWatcher(QUEST_DATA_FILE, "quests")
+        item_watcher = catalog_watcher.CatalogWatcher(ITEM_DATA_FILE, "items")
+        all_quests = quest_watcher.catalog
+        all_items = item_watcher.catalog
 
     except MissingDataFileError:
         # Propagate to caller so main() can create defaults
@@ -407,9 +441,41 @@ def load_game_data():
         raise
     except Exception:
         # Any other problem: set safe defaults
+        quest_watcher = None
+        item_watcher = None
         all_quests = {}
         all_items = {}
 
+    # Enemy and encounter data are read now so a broken file is reported at
+    # startup, not in the middle of a fight (InvalidDataFormatError propagates)
+    combat_system.load_enemy_templates()
+    combat_system.load_encounter_tables()
+
+def refresh_game_data():
+    """
+    Pick up edits to the quest/item files without restarting.
+    The new catalogs replace all_quests/all_items; anything still holding the
+    old dicts keeps a consistent copy. A broken edit is reported and ignored.
+    """
+    global all_quests, all_items
+
+    for watcher, label in ((quest_watcher, "quest"), (item_watcher, "item")):
+        if watcher is None:
+            continue
+        try:
+            diff = watcher.poll()
+        except DataError as e:
+            print(f"Ignoring {label} data update: {e}")
+            continue
+        if diff:
+            print(f"Reloaded {label} data: {len(diff['added'])} added, "
+                  f"{len(diff['changed'])} changed, {len(diff['removed'])} removed.")
+
+    if quest_watcher is not None:
+        all_quests = quest_watcher.catalog
+    if item_watcher is not None:
+        all_items = item_watcher.catalog
+
 def handle_character_death():
     """Handle character death: offer revive (cost) or quit. Autograder-safe defaults to quit."""
     global current_character, game_running
@@ -419,6 +485,9 @@ def handle_character_death():
         game_running = False
         return
 
+    # Whatever happens next, earlier autosaves must reach disk first
+    flush_autosaves()
+
     # Offer revive: costs 50% of current gold or flat 50 gold
     revive_cost = max(50, current_character.get("gold", 0) // 2)
 
@@ -458,6 +527,9 @@ def main():
     # Display welcome message
     display_welcome()
 
+    # Keep recently loaded/saved characters in memory between menu visits
+    character_manager.enable_load_cache()
+
     # Load game data
     try:
         load_game_data()
@@ -487,6 +559,8 @@ def main():
             load_game()
         elif choice == 3:
             print("\nThanks for playing Quest Chronicles!")
+            if autosaver is not None:
+                autosaver.close()
             break
         else:
             print("Invalid choice. Please select 1-3.")
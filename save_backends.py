@@ -0,0 +1,188 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Backends Module
+
+Name: Isaiah Coleman
+
+This module provides save stores that can replace the one-file-per-character
+save directory (see character_manager.set_save_backend).
+
+Usage:
+    python save_backends.py migrate data/save_games data/saves.db
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+import character_manager
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+# ============================================================================
+# SQLITE BACKEND
+# One table keyed by character name (the primary key is the name index).
+# Each row holds the character in character_manager's binary save format.
+# The database runs in WAL mode so readers never block the writer. Every
+# save is its own transaction unless it happens inside batch(), which
+# groups many saves into one commit.
+# ============================================================================
+
+class SQLiteSaveBackend:
+    """Stores characters in a SQLite database file."""
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        try:
+            # autocommit mode: transactions are opened explicitly below
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS characters ("
+                " name TEXT PRIMARY KEY,"
+                " data BLOB NOT NULL,"
+                " updated_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not open save database: {e}")
+
+    @contextmanager
+    def batch(self):
+        """Group every save/delete inside the with-block into one transaction."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._conn.execute("COMMIT")
+
+    def save_character(self, character):
+        return self.save_many([character]) == 1
+
+    def save_many(self, characters):
+        """Save several characters in one transaction. Returns how many were saved."""
+        try:
+            rows = [(c["name"], character_manager.encode_character(c), time.time())
+                    for c in characters]
+        except Exception:
+            raise SaveFileCorruptedError("Unable to encode character for saving.")
+        try:
+            with self.batch():
+                self._conn.executemany(
+                    "INSERT INTO characters (name, data, updated_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(name) DO UPDATE SET data = excluded.data,"
+                    " updated_at = excluded.updated_at",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Unable to save character: {e}")
+        return len(rows)
+
+    def load_character(self, character_name):
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM characters WHERE name = ?", (character_name,)
+                ).fetchone()
+        except sqlite3.Error:
+            raise SaveFileCorruptedError("Save database could not be read.")
+        if row is None:
+            raise CharacterNotFoundError("Save file not found.")
+        character = character_manager.decode_character(row[0])
+        character_manager.validate_character_data(character)
+        return character
+
+    def list_saved_characters(self):
+        with self._lock:
+            return [row[0] for row in
+                    self._conn.execute("SELECT name FROM characters ORDER BY name")]
+
+    def delete_character(self, character_name):
+        try:
+            with self.batch():
+                cursor = self._conn.execute(
+                    "DELETE FROM characters WHERE name = ?", (character_name,))
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Unable to delete character: {e}")
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError("Character save file does not exist.")
+        return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def migrate_save_directory(save_directory, backend, batch_size=1000):
+    """
+    Copy every save file in save_directory into backend, batch_size per
+    transaction. Files are read directly, whatever backend is active.
+    Returns (migrated, failed) where failed lists (name, error message) for
+    saves that could not be read.
+    """
+    previous = character_manager.set_save_backend(None)
+    try:
+        names = character_manager.list_saved_characters(save_directory)
+        migrated = 0
+        failed = []
+        pending = []
+        for name in names:
+            try:
+                pending.append(character_manager.load_character(name, save_directory))
+            except (SaveFileCorruptedError, InvalidSaveDataError, CharacterNotFoundError) as e:
+                failed.append((name, str(e)))
+            if len(pending) >= batch_size:
+                migrated += backend.save_many(pending)
+                pending = []
+        if pending:
+            migrated += backend.save_many(pending)
+    finally:
+        character_manager.set_save_backend(previous)
+    return migrated, failed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] != "migrate":
+        print("usage: python save_backends.py migrate SAVE_DIRECTORY DATABASE")
+        return 2
+    _, save_directory, database = argv
+    with SQLiteSaveBackend(database) as backend:
+        migrated, failed = migrate_save_directory(save_directory, backend)
+    for name, message in failed:
+        print(f"Skipped {name}: {message}")
+    print(f"Migrated {migrated} characters into {database}.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Test Async Saves
+Tests the asyncio save/load API of character_manager
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterNotFoundError
+
+
+def make_character(name="AsyncHero"):
+    char = character_manager.create_character(name, "Cleric")
+    char["inventory"] = ["health_potion"]
+    return char
+
+# ============================================================================
+# ASYNC API TESTS
+# ============================================================================
+
+def test_async_round_trip(tmp_path):
+    """Test that async save, list and load behave like the blocking calls"""
+    folder = str(tmp_path)
+
+    async def session():
+        chars = [make_character(f"hero_{i}") for i in range(20)]
+        results = await asyncio.gather(*(character_manager.async_save_character(c, folder) for c in chars))
+        assert results == [True] * 20
+        names = await character_manager.async_list_saved_characters(folder)
+        loaded = await character_manager.async_load_character("hero_7", folder)
+        return chars, names, loaded
+
+    chars, names, loaded = asyncio.run(session())
+    assert sorted(names) == sorted(c["name"] for c in chars)
+    assert loaded == chars[7]
+
+def test_concurrent_loads_share_one_read(tmp_path, monkeypatch):
+    """Test that simultaneous loads of one save read it once but return separate dicts"""
+    folder = str(tmp_path)
+    character_manager.save_character(make_character(), folder)
+    reads = []
+    real_load = character_manager.load_character
+
+    def counting_load(name, save_directory):
+        reads.append(name)
+        return real_load(name, save_directory)
+    monkeypatch.setattr(character_manager, "load_character", counting_load)
+
+    async def session():
+        return await asyncio.gather(*(character_manager.async_load_character("AsyncHero", folder)
+                                      for _ in range(50)))
+
+    loaded = asyncio.run(session())
+    assert reads == ["AsyncHero"]
+    assert all(c == loaded[0] for c in loaded)
+    loaded[0]["inventory"].append("x")
+    assert loaded[1]["inventory"] == ["health_potion"]
+
+def test_saves_of_one_character_apply_in_order(tmp_path):
+    """Test that the last requested save wins, and snapshots are taken at request time"""
+    folder = str(tmp_path)
+
+    async def session():
+        char = make_character()
+        pending = []
+        for gold in range(30):
+            char["gold"] = gold
+            pending.append(asyncio.ensure_future(character_manager.async_save_character(char, folder)))
+        char["gold"] = 999  # not saved
+        await asyncio.gather(*pending)
+        return await character_manager.async_load_character("AsyncHero", folder)
+
+    assert asyncio.run(session())["gold"] == 29
+
+def test_async_load_missing_raises(tmp_path):
+    """Test that errors from the blocking call reach the awaiting caller"""
+    async def session():
+        await character_manager.async_load_character("Nobody", str(tmp_path))
+
+    with pytest.raises(CharacterNotFoundError):
+        asyncio.run(session())
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
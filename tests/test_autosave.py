@@ -0,0 +1,110 @@
+"""
+Test Autosave
+Tests the background save worker and its use in main
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autosave
+import character_manager
+import main
+
+
+class RecordingSave:
+    def __init__(self, fail=False):
+        self.saved = []
+        self.fail = fail
+
+    def __call__(self, character):
+        if self.fail:
+            raise IOError("disk full")
+        self.saved.append(character)
+
+# ============================================================================
+# WORKER TESTS
+# ============================================================================
+
+def test_repeated_requests_coalesce():
+    """Test that many requests for one character become one write of the latest state"""
+    save = RecordingSave()
+    with autosave.AutosaveWorker(save, interval=60) as worker:
+        char = character_manager.create_character("Grinder", "Warrior")
+        for gold in range(100):
+            char["gold"] = gold
+            worker.request(char)
+        worker.request(character_manager.create_character("Other", "Mage"))
+        assert worker.flush() == 2
+
+    assert [c["name"] for c in save.saved] == ["Grinder", "Other"]
+    assert save.saved[0]["gold"] == 99
+    assert worker.stats() == {"requested": 101, "written": 2, "coalesced": 99,
+                              "failed": 0, "pending": 0}
+
+def test_request_snapshots_character():
+    """Test that later changes to the live character do not leak into a queued save"""
+    save = RecordingSave()
+    with autosave.AutosaveWorker(save, interval=60) as worker:
+        char = character_manager.create_character("Snap", "Rogue")
+        worker.request(char)
+        char["inventory"].append("late_item")
+    assert save.saved[0]["inventory"] == []
+
+def test_worker_writes_on_interval():
+    """Test that the worker thread writes pending saves without a flush"""
+    written = threading.Event()
+
+    def save(character):
+        written.set()
+
+    worker = autosave.AutosaveWorker(save, interval=0.01)
+    worker.request(character_manager.create_character("Timer", "Cleric"))
+    assert written.wait(5)
+    worker.close()
+    assert worker.written == 1
+
+def test_close_flushes_and_rejects_new_requests():
+    """Test that close writes what is pending and refuses further requests"""
+    save = RecordingSave()
+    worker = autosave.AutosaveWorker(save, interval=60)
+    char = character_manager.create_character("Closer", "Mage")
+    worker.request(char)
+    worker.close()
+    assert len(save.saved) == 1
+    with pytest.raises(RuntimeError):
+        worker.request(char)
+
+def test_failed_saves_are_counted():
+    """Test that a failing save is recorded, not raised"""
+    worker = autosave.AutosaveWorker(RecordingSave(fail=True), interval=60)
+    worker.request(character_manager.create_character("Broken", "Warrior"))
+    worker.close()
+    assert worker.failed == 1 and worker.written == 0
+    assert isinstance(worker.last_error, IOError)
+
+# ============================================================================
+# MAIN INTEGRATION TESTS
+# ============================================================================
+
+def test_game_loop_exit_flushes_autosaves(monkeypatch):
+    """Test that leaving the game loop writes queued autosaves"""
+    save = RecordingSave()
+    worker = autosave.AutosaveWorker(save, interval=60)
+    char = character_manager.create_character("Looper", "Warrior")
+    monkeypatch.setattr(main, "autosaver", worker)
+    monkeypatch.setattr(main, "current_character", char)
+    monkeypatch.setattr(main, "game_menu", lambda: 0)
+    monkeypatch.setattr(main, "refresh_game_data", lambda: None)
+
+    main.autosave_game()
+    assert save.saved == []
+    main.game_loop()
+    assert [c["name"] for c in save.saved] == ["Looper"]
+    worker.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
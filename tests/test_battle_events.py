@@ -0,0 +1,155 @@
+"""
+Test Battle Events
+Tests the events SimpleBattle emits and the sinks that receive them
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+import battle_events
+from battle_events import TurnStart, DamageDealt, AbilityUsed, EscapeAttempt, BattleEnd
+
+
+def fighters():
+    character = {"name": "Hero", "class": "Warrior", "health": 30, "max_health": 40, "strength": 10}
+    enemy = {"name": "Goblin", "health": 24, "max_health": 50, "strength": 8,
+             "xp_reward": 25, "gold_reward": 10}
+    return character, enemy
+
+
+def old_output(character, enemy):
+    # what the battle printed before events existed
+    battle = combat_system.SimpleBattle(character, enemy, sink=battle_events.NullSink())
+    while True:
+        combat_system.display_combat_stats(character, enemy)
+        damage = battle.calculate_damage(character, enemy)
+        battle.apply_damage(enemy, damage)
+        combat_system.display_battle_log(f"You attacked the {enemy['name']} for {damage} damage!")
+        if battle.check_battle_end():
+            return
+        damage = battle.calculate_damage(enemy, character)
+        battle.apply_damage(character, damage)
+        combat_system.display_battle_log(f"{enemy['name']} hit you for {damage} damage!")
+        if battle.check_battle_end():
+            return
+
+# ============================================================================
+# EVENT TESTS
+# ============================================================================
+
+def test_battle_emits_events_in_order():
+    """Test the event sequence of a three-round battle"""
+    character, enemy = fighters()
+    sink = battle_events.RingBufferSink()
+    result = combat_system.SimpleBattle(character, enemy, sink=sink).start_battle()
+    events = list(sink.events)
+
+    assert events[0] == TurnStart(1, "Hero", 30, 40, "Goblin", 24, 50)
+    assert events[1] == DamageDealt(1, "Hero", "Goblin", 8, 16, True)
+    assert events[2] == DamageDealt(1, "Goblin", "Hero", 6, 24, False)
+    assert [type(e) for e in events] == [TurnStart, DamageDealt, DamageDealt] * 2 + [TurnStart, DamageDealt, BattleEnd]
+    assert events[-1] == BattleEnd(3, "player", 25, 10)
+    assert result["winner"] == "player"
+
+def test_resolved_battle_emits_only_battle_end():
+    """Test that resolve=True still reports how the battle ended"""
+    character, enemy = fighters()
+    sink = battle_events.RingBufferSink()
+    combat_system.SimpleBattle(character, enemy, sink=sink, resolve=True).start_battle()
+    assert list(sink.events) == [BattleEnd(3, "player", 25, 10)]
+
+def test_caller_sink_gets_every_event_without_display():
+    """Test that display=False does not cut down the events of a caller-supplied sink"""
+    sink = battle_events.RingBufferSink()
+    combat_system.SimpleBattle(*fighters(), display=False, sink=sink).start_battle()
+    assert len(sink.events) == 9
+
+def test_null_sink_battles_are_resolved(monkeypatch):
+    """Test that a battle nobody watches is resolved instead of played turn by turn"""
+    character = {"name": "Hero", "health": 10 ** 9, "max_health": 10 ** 9, "strength": 1}
+    enemy = {"name": "Wall", "health": 10 ** 9, "max_health": 10 ** 9, "strength": 1}
+    battle = combat_system.SimpleBattle(character, enemy, sink=battle_events.NullSink())
+    monkeypatch.setattr(battle, "player_turn", lambda: pytest.fail("battle was played out"))
+    assert battle.start_battle()["winner"] == "player"
+    assert battle.turn == 10 ** 9 and character["health"] == 1
+
+    played = combat_system.SimpleBattle(*fighters(), sink=battle_events.NullSink(), resolve=False)
+    assert played.start_battle() == combat_system.SimpleBattle(*fighters(), display=False).start_battle()
+
+def test_ability_and_escape_events(monkeypatch):
+    """Test that use_ability and attempt_escape emit their events"""
+    character, enemy = fighters()
+    sink = battle_events.RingBufferSink()
+    battle = combat_system.SimpleBattle(character, enemy, sink=sink)
+    message = battle.use_ability()
+    assert enemy["health"] == 4
+    monkeypatch.setattr(combat_system.random, "random", lambda: 0.9)
+    assert not battle.attempt_escape()
+    assert list(sink.events) == [AbilityUsed(1, "Hero", "warrior", message), EscapeAttempt(1, False)]
+
+# ============================================================================
+# SINK TESTS
+# ============================================================================
+
+def test_console_sink_matches_old_output(capsys):
+    """Test that the default console output is unchanged, character for character"""
+    old_output(*fighters())
+    expected = capsys.readouterr().out
+
+    combat_system.SimpleBattle(*fighters()).start_battle()
+    assert capsys.readouterr().out == expected
+
+    stream = io.StringIO()
+    combat_system.SimpleBattle(*fighters(), sink=battle_events.ConsoleSink(stream)).start_battle()
+    assert stream.getvalue() == expected
+    assert capsys.readouterr().out == ""
+
+def test_null_sink_prints_nothing(capsys):
+    """Test that a NullSink battle still runs but is silent"""
+    character, enemy = fighters()
+    result = combat_system.SimpleBattle(character, enemy, sink=battle_events.NullSink()).start_battle()
+    assert result["winner"] == "player" and enemy["health"] == 0
+    assert capsys.readouterr().out == ""
+
+def test_ring_buffer_keeps_latest_events():
+    """Test that the ring buffer drops the oldest events past its capacity"""
+    sink = battle_events.RingBufferSink(capacity=2)
+    for turn in range(1, 5):
+        sink.emit(EscapeAttempt(turn, False))
+    assert [e.turn for e in sink.events] == [3, 4]
+    sink.clear()
+    assert not sink.events
+
+def test_batched_file_sink_writes_on_flush(tmp_path):
+    """Test that events reach the file only when the batch fills or on close"""
+    path = tmp_path / "battle.log"
+    sink = battle_events.BatchedFileSink(str(path))
+    combat_system.SimpleBattle(*fighters(), sink=sink).start_battle()
+    assert path.read_text() == ""
+    sink.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 9
+    assert records[1] == {"event": "DamageDealt", "turn": 1, "attacker": "Hero", "target": "Goblin",
+                          "damage": 8, "target_health": 16, "by_player": True}
+    assert records[-1]["event"] == "BattleEnd"
+
+def test_batched_file_sink_text_and_batches(tmp_path):
+    """Test the text format and that a full batch is written straight away"""
+    path = tmp_path / "battle.txt"
+    with battle_events.BatchedFileSink(str(path), batch_bytes=1, fmt="text") as sink:
+        sink.emit(EscapeAttempt(1, True))
+        assert path.read_text() == ">>> You escaped successfully!\n"
+        sink.emit(BattleEnd(1, "player", 0, 0))
+    assert path.read_text() == ">>> You escaped successfully!\n"
+    with pytest.raises(ValueError):
+        battle_events.BatchedFileSink(str(path), fmt="xml")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,69 @@
+"""
+Test Battle Resolution
+Tests that resolve_battle matches playing a SimpleBattle turn by turn
+"""
+
+import pytest
+import sys
+import os
+import time
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+from custom_exceptions import CharacterDeadError
+
+
+def fighters(health, strength, enemy_health, enemy_strength):
+    character = {"name": "Hero", "health": health, "max_health": health, "strength": strength}
+    enemy = {"name": "Foe", "health": enemy_health, "max_health": enemy_health,
+             "strength": enemy_strength, "xp_reward": 7, "gold_reward": 3}
+    return character, enemy
+
+# ============================================================================
+# EQUIVALENCE TESTS
+# ============================================================================
+
+def test_resolve_matches_turn_by_turn(capsys):
+    """Test winner, rewards and final health against start_battle over a grid of stats"""
+    for hp, st, ehp, est in itertools.product((1, 7, 50, 130), (1, 4, 9, 30),
+                                              (0, 1, 40, 200), (0, 3, 12, 40)):
+        character, enemy = fighters(hp, st, ehp, est)
+        resolved = combat_system.resolve_battle(character, enemy)
+        assert character["health"] == hp and enemy["health"] == ehp
+
+        played = combat_system.SimpleBattle(character, enemy).start_battle()
+        assert {k: resolved[k] for k in played} == played
+        assert (resolved["character_health"], resolved["enemy_health"]) == (character["health"], enemy["health"])
+    capsys.readouterr()
+
+def test_battle_without_display_uses_resolver(capsys):
+    """Test that display=False gives the same result and state, with no output"""
+    character, enemy = fighters(120, 15, 200, 25)
+    result = combat_system.SimpleBattle(character, enemy, display=False).start_battle()
+    assert capsys.readouterr().out == ""
+
+    character2, enemy2 = fighters(120, 15, 200, 25)
+    assert combat_system.SimpleBattle(character2, enemy2).start_battle() == result
+    assert (character, enemy) == (character2, enemy2)
+    capsys.readouterr()
+
+def test_huge_fights_resolve_instantly():
+    """Test that a fight lasting ~10^14 turns resolves in constant time"""
+    character, enemy = fighters(10 ** 15, 1, 10 ** 15, 1)
+    start = time.perf_counter()
+    result = combat_system.resolve_battle(character, enemy)
+    assert time.perf_counter() - start < 0.01
+    assert result["winner"] == "player"
+    assert result["turns"] == 10 ** 15
+    assert result["character_health"] == 1
+
+def test_dead_character_cannot_fight():
+    """Test that resolve_battle refuses a dead character like start_battle"""
+    character, enemy = fighters(0, 5, 10, 5)
+    with pytest.raises(CharacterDeadError):
+        combat_system.resolve_battle(character, enemy)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
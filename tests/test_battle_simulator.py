@@ -0,0 +1,97 @@
+"""
+Test Battle Simulator
+Tests the headless battle simulator against real SimpleBattle fights
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_simulator
+import combat_system
+
+
+def play_battle(character, enemy, special_every, rng_seed):
+    # one real battle, using combat_system's own damage and abilities
+    random.seed(rng_seed)
+    character, enemy = dict(character), dict(enemy)
+    battle = combat_system.SimpleBattle(character, enemy)
+    turn = 0
+    while True:
+        turn += 1
+        if special_every and turn % special_every == 0:
+            combat_system.use_special_ability(character, enemy)
+        else:
+            battle.apply_damage(enemy, battle.calculate_damage(character, enemy))
+        if battle.check_battle_end():
+            return "player", turn, character["health"]
+        battle.apply_damage(character, battle.calculate_damage(enemy, character))
+        if battle.check_battle_end():
+            return "enemy", turn, 0
+
+# ============================================================================
+# DISTRIBUTION TESTS
+# ============================================================================
+
+def test_deterministic_battles_match_simple_battle(capsys):
+    """Test that basic-attack battles have one outcome, the same as start_battle"""
+    for cls in ("Warrior", "Mage", "Rogue", "Cleric"):
+        for level in (1, 3, 8):
+            for enemy_type in battle_simulator.enemy_types():
+                character = battle_simulator.character_at_level(cls, level)
+                enemy = combat_system.create_enemy(enemy_type)
+                outcomes = battle_simulator.outcome_distribution(character, enemy)
+                assert len(outcomes) == 1
+
+                real = combat_system.SimpleBattle(dict(character), dict(enemy)).start_battle()
+                assert outcomes[0][0] == real["winner"]
+                assert outcomes[0][1:3] == play_battle(character, enemy, 0, 0)[1:]
+    capsys.readouterr()
+
+def test_rogue_crits_match_real_battles():
+    """Test that the rogue crit distribution matches many real battles"""
+    character = battle_simulator.character_at_level("Rogue", 4)
+    enemy = combat_system.create_enemy("orc")
+    outcomes = battle_simulator.outcome_distribution(character, enemy, special_every=2)
+    assert abs(sum(o[3] for o in outcomes) - 1.0) < 1e-12
+    assert len(outcomes) > 1
+
+    runs = 4000
+    real = {}
+    for seed in range(runs):
+        key = play_battle(character, enemy, 2, seed)
+        real[key] = real.get(key, 0) + 1
+    for winner, turns, health, p in outcomes:
+        assert abs(real.get((winner, turns, health), 0) / runs - p) < 0.03
+
+def test_simulate_leaves_inputs_and_reports_stats():
+    """Test the summary statistics of a simulation"""
+    result = battle_simulator.simulate("Rogue", 4, "orc", trials=200000, special_every=2, seed=5)
+    assert result["trials"] == 200000
+    assert result["win_rate"] + result["loss_rate"] + result["timeout_rate"] == pytest.approx(1.0)
+    assert sum(result["turns_to_kill"].values()) == round(result["win_rate"] * 200000)
+    pct = result["hp_remaining_percentiles"]
+    assert list(pct) == list(battle_simulator.PERCENTILES)
+    assert pct[5] <= pct[50] <= pct[95] <= 100
+    assert result["xp_per_minute"] > 0
+
+    again = battle_simulator.simulate("Rogue", 4, "orc", trials=200000, special_every=2, seed=5)
+    assert again == result
+
+def test_endless_battles_time_out():
+    """Test that a cleric who only heals is stopped at max_turns"""
+    result = battle_simulator.simulate("Cleric", 1, "goblin", trials=10, special_every=1, max_turns=50)
+    assert result["timeout_rate"] == 1.0
+    assert result["xp_per_minute"] == 0.0
+
+def test_all_enemies():
+    """Test that every registered enemy type is simulated"""
+    results = battle_simulator.simulate_all_enemies("Warrior", 6, trials=1000, seed=1)
+    assert list(results) == list(combat_system.get_enemy_prototypes())
+    assert {"wolf", "troll"} <= set(results)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
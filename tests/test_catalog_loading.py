@@ -0,0 +1,447 @@
+"""
+Test Catalog Loading
+Tests the faster catalog loading paths in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError
+
+QUEST_BLOCK = """QUEST_ID: {qid}
+TITLE: Quest {qid}
+DESCRIPTION: Test quest
+REWARD_XP: {xp}
+REWARD_GOLD: 10
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+"""
+
+
+def write_quests(path, quests):
+    with open(path, "w") as f:
+        f.write("\n".join(QUEST_BLOCK.format(qid=q, xp=xp) for q, xp in quests))
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cache_is_written_and_reused(tmp_path):
+    """Test that a second load comes from the compiled cache"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10), ("b", 20)])
+
+    first = game_data.load_quests(path)
+    assert os.path.exists(game_data._catalog_cache_path(path, "quests"))
+
+    second = game_data.load_quests(path)
+    assert second == first
+    assert second["b"]["reward_xp"] == 20
+
+def test_cache_rebuilt_when_source_changes(tmp_path):
+    """Test that editing the data file invalidates the cache"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10)])
+    game_data.load_quests(path)
+
+    write_quests(path, [("a", 10), ("c", 99)])
+    quests = game_data.load_quests(path)
+    assert quests["c"]["reward_xp"] == 99
+
+def test_cache_survives_touch(tmp_path):
+    """Test that a touched but unchanged file still uses the cache"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10)])
+    game_data.load_quests(path)
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert game_data._read_catalog_cache(path, "quests") is not None
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """Test that a damaged cache file falls back to parsing"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10)])
+    game_data.load_quests(path)
+
+    with open(game_data._catalog_cache_path(path, "quests"), "wb") as f:
+        f.write(b"garbage")
+    assert game_data.load_quests(path)["a"]["reward_xp"] == 10
+
+def test_invalid_file_is_not_cached(tmp_path):
+    """Test that bad data still raises and leaves no cache behind"""
+    path = str(tmp_path / "bad.txt")
+    with open(path, "w") as f:
+        f.write("This is not valid quest data")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(path)
+    assert not os.path.exists(game_data._catalog_cache_path(path, "quests"))
+
+# ============================================================================
+# STREAMING PARSER TESTS
+# ============================================================================
+
+def test_iter_quests_streams_entries(tmp_path):
+    """Test that iter_quests yields validated quests in file order"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10), ("b", 20), ("c", 30)])
+
+    quests = game_data.iter_quests(path)
+    first = next(quests)
+    assert first["quest_id"] == "a"
+    assert first["reward_xp"] == 10
+    assert [q["quest_id"] for q in quests] == ["b", "c"]
+
+def test_iter_items_missing_file_raises_immediately():
+    """Test that a missing file is reported before iteration starts"""
+    from custom_exceptions import MissingDataFileError
+    with pytest.raises(MissingDataFileError):
+        game_data.iter_items("nonexistent_items.txt")
+
+def test_stream_error_reports_line_number(tmp_path):
+    """Test that a bad block is reported with its starting line"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10)])
+    with open(path, "a") as f:
+        f.write("\n" + QUEST_BLOCK.format(qid="b", xp="lots"))
+
+    quests = game_data.iter_quests(path)
+    assert next(quests)["quest_id"] == "a"
+    with pytest.raises(InvalidDataFormatError, match="line 9"):
+        next(quests)
+
+def test_blank_lines_with_whitespace_separate_blocks(tmp_path):
+    """Test that whitespace-only lines still split blocks"""
+    path = str(tmp_path / "quests.txt")
+    with open(path, "w") as f:
+        f.write(QUEST_BLOCK.format(qid="a", xp=1) + "   \n\n\n"
+                + QUEST_BLOCK.format(qid="b", xp=2))
+    assert sorted(game_data.load_quests(path, use_cache=False)) == ["a", "b"]
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_load_quests(tmp_path):
+    """Test that the lazy catalog returns the same quests as load_quests"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10), ("b", 20), ("c", 30)])
+
+    with game_data.open_quest_catalog(path) as catalog:
+        assert len(catalog) == 3
+        assert "b" in catalog
+        assert "missing" not in catalog
+        assert dict(catalog.items()) == game_data.load_quests(path, use_cache=False)
+
+def test_lazy_catalog_decodes_on_demand(tmp_path):
+    """Test that only looked-up entries are decoded, bounded by the LRU"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [(f"q{i}", i) for i in range(10)])
+
+    catalog = game_data.open_quest_catalog(path, cache_size=2)
+    assert len(catalog._decoded) == 0
+    assert catalog["q3"]["reward_xp"] == 3
+    catalog["q4"]
+    catalog["q5"]
+    assert list(catalog._decoded) == ["q4", "q5"]
+    catalog.close()
+
+def test_lazy_catalog_reuses_saved_index(tmp_path):
+    """Test that reopening an unchanged file loads the stored index"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10), ("b", 20)])
+    game_data.open_quest_catalog(path).close()
+
+    index = game_data._read_catalog_cache(path, "quests.index")
+    assert set(index) == {"a", "b"}
+
+def test_lazy_catalog_works_with_quest_handler(tmp_path):
+    """Test that quest_handler accepts a lazy catalog unchanged"""
+    import character_manager
+    import quest_handler
+
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10)])
+    char = character_manager.create_character("LazyTest", "Warrior")
+
+    with game_data.open_quest_catalog(path) as catalog:
+        quest_handler.accept_quest(char, "a", catalog)
+        quest_handler.complete_quest(char, "a", catalog)
+    assert char["experience"] == 10
+
+def test_lazy_catalog_bad_block_reports_line(tmp_path):
+    """Test that a broken block raises on access with its line number"""
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 10), ("b", "oops")])
+
+    with game_data.open_quest_catalog(path) as catalog:
+        assert catalog["a"]["reward_xp"] == 10
+        with pytest.raises(InvalidDataFormatError, match="line 9"):
+            catalog["b"]
+
+def test_lazy_catalog_closes_map_on_bad_index(tmp_path, monkeypatch):
+    """Test that a block without an id raises and leaves no open memory map"""
+    path = str(tmp_path / "quests.txt")
+    with open(path, "w") as f:
+        f.write(QUEST_BLOCK.format(qid="a", xp=10) + "\nTITLE: No id here\n")
+    maps = []
+    real_mmap = game_data.mmap.mmap
+
+    def tracked(*args, **kwargs):
+        maps.append(real_mmap(*args, **kwargs))
+        return maps[-1]
+    monkeypatch.setattr(game_data.mmap, "mmap", tracked)
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.open_quest_catalog(path)
+    assert len(maps) == 1 and maps[0].closed
+
+# ============================================================================
+# SHARDED CATALOG TESTS
+# ============================================================================
+
+def write_shards(folder):
+    write_quests(str(folder / "01_intro.txt"), [("a", 1), ("b", 2)])
+    write_quests(str(folder / "02_middle.txt"), [("c", 3)])
+    write_quests(str(folder / "03_end.txt"), [("d", 4), ("e", 5)])
+
+def test_load_quests_from_directory(tmp_path):
+    """Test that every shard in a directory is loaded and merged in order"""
+    write_shards(tmp_path)
+
+    quests = game_data.load_quests(str(tmp_path), workers=2)
+    assert list(quests) == ["a", "b", "c", "d", "e"]
+    assert quests["e"]["reward_xp"] == 5
+    assert [t["entries"] for t in game_data.last_shard_timings] == [2, 1, 2]
+
+def test_load_quests_from_glob(tmp_path):
+    """Test that a glob pattern selects matching shards only"""
+    write_shards(tmp_path)
+
+    quests = game_data.load_quests(str(tmp_path / "0[12]_*.txt"), workers=1)
+    assert sorted(quests) == ["a", "b", "c"]
+
+def test_parallel_and_serial_loads_match(tmp_path):
+    """Test that the process pool gives the same result as a serial load"""
+    write_shards(tmp_path)
+
+    serial = game_data.load_quests(str(tmp_path), use_cache=False, workers=1)
+    parallel = game_data.load_quests(str(tmp_path), use_cache=False, workers=3)
+    assert list(serial.items()) == list(parallel.items())
+
+def test_second_sharded_load_uses_cache(tmp_path):
+    """Test that unchanged shards are read from their compiled cache"""
+    write_shards(tmp_path)
+    game_data.load_quests(str(tmp_path))
+    game_data.load_quests(str(tmp_path))
+    assert all(t["cached"] for t in game_data.last_shard_timings)
+
+def test_duplicate_ids_across_shards(tmp_path):
+    """Test that the same quest_id in two shards is rejected"""
+    write_shards(tmp_path)
+    write_quests(str(tmp_path / "04_dupe.txt"), [("c", 30)])
+
+    with pytest.raises(InvalidDataFormatError, match="01_intro|02_middle"):
+        game_data.load_quests(str(tmp_path), workers=1)
+
+def test_empty_glob_raises_missing_file(tmp_path):
+    """Test that a pattern matching nothing is a missing data file"""
+    from custom_exceptions import MissingDataFileError
+    with pytest.raises(MissingDataFileError):
+        game_data.load_items(str(tmp_path / "*.txt"))
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+def test_watcher_reports_added_changed_removed(tmp_path):
+    """Test that a reload diffs the catalog by quest id"""
+    import catalog_watcher
+
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 1), ("b", 2), ("c", 3), ("d", 4)])
+    watcher = catalog_watcher.CatalogWatcher(path, "quests")
+    assert watcher.poll() is None
+
+    write_quests(path, [("a", 1), ("b", 20), ("d", 4), ("e", 5)])
+    bump_mtime(path)
+    diff = watcher.poll()
+
+    assert diff == {"added": ["e"], "changed": ["b"], "removed": ["c"]}
+    assert watcher.catalog == game_data.load_quests(path, use_cache=False)
+
+def test_watcher_keeps_old_catalog_valid(tmp_path):
+    """Test that a reload swaps in a new dict and leaves the old one alone"""
+    import catalog_watcher
+
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 1), ("b", 2)])
+    watcher = catalog_watcher.CatalogWatcher(path, "quests")
+    old = watcher.catalog
+
+    write_quests(path, [("a", 1), ("b", 99)])
+    bump_mtime(path)
+    watcher.poll()
+
+    assert old["b"]["reward_xp"] == 2
+    assert watcher.catalog["b"]["reward_xp"] == 99
+    assert watcher.catalog["a"] is old["a"]
+
+def test_watcher_ignores_bad_edit_until_fixed(tmp_path):
+    """Test that a broken edit raises but keeps the last good catalog"""
+    import catalog_watcher
+
+    path = str(tmp_path / "quests.txt")
+    write_quests(path, [("a", 1), ("b", 2)])
+    watcher = catalog_watcher.CatalogWatcher(path, "quests")
+
+    write_quests(path, [("a", 1), ("b", "two")])
+    bump_mtime(path)
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert watcher.catalog["b"]["reward_xp"] == 2
+
+    write_quests(path, [("a", 1), ("b", 3)])
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2 * 10**9))
+    assert watcher.poll() == {"added": [], "changed": ["b"], "removed": []}
+
+# ============================================================================
+# RECORD TYPE TESTS
+# ============================================================================
+
+def test_quest_records_behave_like_dicts():
+    """Test that loaded quests support the dict access other modules use"""
+    quest = game_data.load_quests("data/quests.txt")["goblin_hunter"]
+
+    assert isinstance(quest, game_data.Quest)
+    assert quest["reward_xp"] == 100
+    assert quest.get("prerequisite") == "first_steps"
+    assert quest.get("missing", "NONE") == "NONE"
+    assert "title" in quest and "missing" not in quest
+    assert dict(quest) == quest.to_dict()
+    with pytest.raises(KeyError):
+        quest["missing"]
+
+def test_records_have_no_per_entry_dict():
+    """Test that records store their fields in slots"""
+    items = game_data.load_items("data/items.txt")
+    item = items["iron_sword"]
+    assert not hasattr(item, "__dict__")
+    assert item.type is items["steel_sword"].type  # interned
+
+def test_records_keep_unknown_fields(tmp_path):
+    """Test that extra keys in a block are not dropped"""
+    path = str(tmp_path / "quests.txt")
+    with open(path, "w") as f:
+        f.write(QUEST_BLOCK.format(qid="a", xp=1) + "ZONE: forest\n")
+
+    quest = game_data.load_quests(path)["a"]
+    assert quest["zone"] == "forest"
+    assert game_data.load_quests(path)["a"] == quest  # via the cache
+
+# ============================================================================
+# COLUMNAR VIEW TESTS
+# ============================================================================
+
+def test_quest_columns_match_catalog():
+    """Test that quest columns line up with the loaded quests"""
+    quests = game_data.load_quests("data/quests.txt")
+    cols = game_data.quest_columns(quests)
+
+    assert list(cols["ids"]) == list(quests)
+    assert list(cols["reward_xp"]) == [q["reward_xp"] for q in quests.values()]
+    labels = cols["prerequisite_labels"]
+    assert [labels[c] for c in cols["prerequisite_codes"]] == \
+        [q["prerequisite"] for q in quests.values()]
+
+def test_select_quests_by_level_matches_quest_handler():
+    """Test the columnar level filter against get_quests_by_level"""
+    import quest_handler
+
+    quests = game_data.load_quests("data/quests.txt")
+    cols = game_data.quest_columns(quests)
+    expected = [q["quest_id"] for q in quest_handler.get_quests_by_level(quests, 2, 5)]
+    assert game_data.select_quests_by_level(cols, 2, 5) == expected
+
+def test_item_columns_and_aggregates():
+    """Test item cost summaries and per-type grouping"""
+    items = game_data.load_items("data/items.txt")
+    cols = game_data.item_columns(items)
+
+    summary = game_data.column_summary(cols["cost"])
+    assert summary["count"] == len(items)
+    assert summary["sum"] == sum(i["cost"] for i in items.values())
+
+    by_type = game_data.group_sum(cols["type_codes"], cols["cost"])
+    weapon = cols["type_labels"].index("weapon")
+    weapons = [i["cost"] for i in items.values() if i["type"] == "weapon"]
+    assert by_type[weapon] == (len(weapons), sum(weapons))
+
+def test_columns_without_numpy(monkeypatch):
+    """Test that the pure-Python fallback gives the same answers"""
+    quests = game_data.load_quests("data/quests.txt")
+    expected = game_data.select_quests_by_level(game_data.quest_columns(quests), 3, 10)
+
+    monkeypatch.setattr(game_data, "np", None)
+    cols = game_data.quest_columns(quests)
+    assert isinstance(cols["ids"], list)
+    assert game_data.select_quests_by_level(cols, 3, 10) == expected
+
+# ============================================================================
+# AGGREGATED VALIDATION TESTS
+# ============================================================================
+
+def write_broken_quests(path):
+    with open(path, "w") as f:
+        f.write(QUEST_BLOCK.format(qid="a", xp=10) + "\n")
+        f.write(QUEST_BLOCK.format(qid="b", xp="ten") + "\n")            # line 9
+        f.write("QUEST_ID: c\nthis line has no colon\n\n")               # line 17-18
+        f.write(QUEST_BLOCK.format(qid="a", xp=5) + "\n")                 # line 20
+        f.write(QUEST_BLOCK.format(qid="d", xp=1).replace("NONE", "ghost"))  # line 28
+
+def test_validate_catalog_reports_every_problem(tmp_path):
+    """Test that one pass collects all errors with line numbers"""
+    path = str(tmp_path / "quests.txt")
+    write_broken_quests(path)
+
+    report = game_data.validate_catalog(path, "quests")
+    assert not report["valid"]
+    assert report["entries"] == 2  # a and d
+    assert [(e["line"], e["id"]) for e in report["errors"]] == [
+        (9, "b"), (18, None), (20, "a"), (28, "d")]
+    assert "Duplicate" in report["errors"][2]["message"]
+    assert "ghost" in report["errors"][3]["message"]
+
+def test_validate_catalog_strict_fails_fast(tmp_path):
+    """Test that strict mode raises at the first problem"""
+    path = str(tmp_path / "quests.txt")
+    write_broken_quests(path)
+
+    with pytest.raises(InvalidDataFormatError, match="line 9"):
+        game_data.validate_catalog(path, "quests", strict=True)
+
+def test_validate_catalog_finds_duplicates_across_shards(tmp_path):
+    """Test that duplicate ids in different shards are reported"""
+    write_quests(str(tmp_path / "1.txt"), [("a", 1)])
+    write_quests(str(tmp_path / "2.txt"), [("a", 2)])
+
+    report = game_data.validate_catalog(str(tmp_path), "quests")
+    assert len(report["errors"]) == 1
+    assert report["errors"][0]["file"].endswith("2.txt")
+
+def test_validate_shipped_data_is_clean():
+    """Test that the data files in the repo pass validation"""
+    assert game_data.validate_catalog("data/quests.txt", "quests")["valid"]
+    assert game_data.validate_catalog("data/items.txt", "items")["valid"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
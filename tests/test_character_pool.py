@@ -0,0 +1,126 @@
+"""
+Test Character Pool
+Tests that pool operations match the per-character functions exactly
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import character_pool
+from custom_exceptions import CharacterDeadError
+
+
+def make_population(count, seed=0):
+    rng = random.Random(seed)
+    specs = [(f"npc_{i}", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"])) for i in range(count)]
+    characters = character_manager.create_characters(specs)
+    for char in characters:
+        character_manager.gain_experience(char, rng.randrange(20000))
+        char["health"] = rng.randrange(1, char["max_health"] + 1)
+        char["inventory"] = [f"item_{rng.randrange(9)}" for _ in range(rng.randrange(3))]
+    return characters
+
+# ============================================================================
+# CONVERSION TESTS
+# ============================================================================
+
+def test_round_trip():
+    """Test that dicts survive conversion to a pool and back"""
+    characters = make_population(50)
+    pool = character_pool.CharacterPool.from_characters(characters)
+    assert len(pool) == 50
+    assert pool.to_characters() == characters
+    assert pool.character(7) == characters[7]
+
+    pool.inventory[0].append("new")
+    assert "new" not in characters[0]["inventory"]
+
+# ============================================================================
+# OPERATION TESTS
+# ============================================================================
+
+def test_gain_experience_matches_dicts():
+    """Test that pool XP gain matches gain_experience per character"""
+    rng = random.Random(3)
+    characters = make_population(300)
+    amounts = [rng.choice([0, 5, rng.randrange(5000), rng.randrange(10 ** 8)]) for _ in characters]
+    pool = character_pool.CharacterPool(characters)
+    gained = pool.gain_experience(amounts)
+
+    expected = [character_manager.gain_experience(dict(c), a) for c, a in zip(characters, amounts)]
+    assert pool.to_characters() == expected
+    assert list(gained) == [e["level"] - c["level"] for e, c in zip(expected, characters)]
+
+def test_gain_experience_with_table_curve():
+    """Test that pool XP gain follows the active XP curve"""
+    curve = character_manager.TableXPCurve.from_function(lambda level: 40 + level * level, 30)
+    previous = character_manager.set_xp_curve(curve)
+    try:
+        characters = make_population(100)
+        for char in characters:
+            char["level"], char["experience"] = 1, 0
+        pool = character_pool.CharacterPool(characters)
+        pool.gain_experience(5000)
+        assert pool.to_characters() == [character_manager.gain_experience(dict(c), 5000) for c in characters]
+    finally:
+        character_manager.set_xp_curve(previous)
+
+def test_table_curve_levels_above_cap_numpy():
+    """Test the NumPy table-curve path with characters already past the last level"""
+    pytest.importorskip("numpy")
+    previous = character_manager.set_xp_curve(character_manager.TableXPCurve([100] * 30))
+    try:
+        characters = make_population(40)
+        for i, char in enumerate(characters):
+            char["level"], char["experience"] = (32 + i, 7) if i % 2 else (1 + i % 30, 0)
+        pool = character_pool.CharacterPool(characters)
+        assert character_pool.np is not None
+        pool.gain_experience(750)
+        assert pool.to_characters() == [character_manager.gain_experience(dict(c), 750) for c in characters]
+    finally:
+        character_manager.set_xp_curve(previous)
+
+def test_dead_characters_and_revive():
+    """Test dead handling for XP, and that revive matches revive_character"""
+    characters = make_population(20)
+    characters[3]["health"] = 0
+    characters[9]["health"] = -5
+    pool = character_pool.CharacterPool(characters)
+    assert pool.dead_count() == 2
+    assert list(pool.is_dead()) == [character_manager.is_character_dead(c) for c in characters]
+
+    with pytest.raises(CharacterDeadError):
+        pool.gain_experience(100)
+    assert pool.to_characters() == characters
+
+    pool.gain_experience(100, skip_dead=True)
+    assert pool.character(3)["experience"] == characters[3]["experience"]
+
+    assert pool.revive() == 2
+    for char in characters:
+        character_manager.revive_character(char)
+    assert list(pool.health) == [c["health"] for c in characters]
+
+def test_heal_and_gold_match_dicts():
+    """Test that heal and add_gold match the per-character functions"""
+    characters = make_population(100)
+    pool = character_pool.CharacterPool(characters)
+    healed = pool.heal(25)
+    assert list(healed) == [character_manager.heal_character(c, 25) for c in characters]
+    assert list(pool.health) == [c["health"] for c in characters]
+
+    pool.add_gold(list(range(100)))
+    assert list(pool.gold) == [character_manager.add_gold(c, i) for i, c in enumerate(characters)]
+    with pytest.raises(ValueError):
+        pool.add_gold(-150)
+    assert list(pool.gold) == [c["gold"] for c in characters]
+    with pytest.raises(ValueError):
+        pool.heal([1, 2, 3])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
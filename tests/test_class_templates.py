@@ -0,0 +1,75 @@
+"""
+Test Class Templates
+Tests the data-driven class registry used by create_character
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_data
+from custom_exceptions import InvalidCharacterClassError, InvalidDataFormatError, MissingDataFileError
+
+
+@pytest.fixture
+def restore_registry():
+    yield
+    character_manager.load_class_templates()
+
+# ============================================================================
+# DATA FILE TESTS
+# ============================================================================
+
+def test_class_file_matches_defaults():
+    """Test that data/classes.txt holds the four built-in classes"""
+    assert game_data.load_classes("data/classes.txt") == character_manager.DEFAULT_CLASS_TEMPLATES
+
+def test_bad_class_files_rejected(tmp_path):
+    """Test that bad numbers, missing fields and duplicates are reported"""
+    path = tmp_path / "classes.txt"
+    for text in ("CLASS: Bard\nHEALTH: lots\nSTRENGTH: 1\nMAGIC: 1\n",
+                 "CLASS: Bard\nHEALTH: 10\nMAGIC: 1\n",
+                 "CLASS: Bard\nHEALTH: 10\nSTRENGTH: 1\nMAGIC: 1\n\n"
+                 "CLASS: Bard\nHEALTH: 11\nSTRENGTH: 1\nMAGIC: 1\n"):
+        path.write_text(text)
+        with pytest.raises(InvalidDataFormatError):
+            game_data.load_classes(str(path))
+    with pytest.raises(MissingDataFileError):
+        game_data.load_classes(str(tmp_path / "missing.txt"))
+
+# ============================================================================
+# REGISTRY TESTS
+# ============================================================================
+
+def test_custom_class_file(tmp_path, restore_registry):
+    """Test that create_character uses classes from the loaded file"""
+    path = tmp_path / "classes.txt"
+    path.write_text("CLASS: Bard\nHEALTH: 70\nSTRENGTH: 6\nMAGIC: 14\nGOLD: 250\n")
+    assert list(character_manager.load_class_templates(str(path))) == ["Bard"]
+
+    bard = character_manager.create_character("Lute", "Bard")
+    assert (bard["health"], bard["max_health"], bard["magic"], bard["gold"]) == (70, 70, 14, 250)
+    with pytest.raises(InvalidCharacterClassError):
+        character_manager.create_character("Conan", "Warrior")
+
+def test_missing_class_file_uses_defaults(tmp_path, restore_registry):
+    """Test that the built-in classes are used when the file is missing"""
+    templates = character_manager.load_class_templates(str(tmp_path / "none.txt"))
+    assert templates == character_manager.DEFAULT_CLASS_TEMPLATES
+
+def test_create_characters_matches_create_character():
+    """Test that bulk creation builds the same, independent characters"""
+    specs = [(f"npc_{i}", cls) for i, cls in enumerate(["Warrior", "Mage", "Rogue", "Cleric"] * 3)]
+    bulk = character_manager.create_characters(specs)
+    assert bulk == [character_manager.create_character(name, cls) for name, cls in specs]
+
+    bulk[0]["inventory"].append("sword")
+    assert bulk[4]["inventory"] == []
+    with pytest.raises(InvalidCharacterClassError):
+        character_manager.create_characters([("a", "Warrior"), ("b", "Jester")])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
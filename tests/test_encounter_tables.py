@@ -0,0 +1,158 @@
+"""
+Test Encounter Tables
+Tests weighted encounter tables and their alias-method sampling
+"""
+
+import pytest
+import sys
+import os
+import random
+import shutil
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+import character_manager
+import game_data
+import main
+from custom_exceptions import InvalidTargetError, InvalidDataFormatError, MissingDataFileError
+
+# chi-square critical values at p = 0.001, by degrees of freedom
+CHI2_CRITICAL = {1: 10.83, 2: 13.82, 3: 16.27, 4: 18.47, 5: 20.52}
+
+
+def chi_square(counts, weights, total):
+    weight_sum = sum(weights)
+    return sum((counts.get(i, 0) - total * w / weight_sum) ** 2 / (total * w / weight_sum)
+               for i, w in enumerate(weights))
+
+
+@pytest.fixture
+def restore_tables():
+    yield
+    combat_system.load_encounter_tables()
+
+# ============================================================================
+# DATA FILE TESTS
+# ============================================================================
+
+def test_encounter_file_loads():
+    """Test that data/encounters.txt covers every level with known enemies"""
+    tables = combat_system.load_encounter_tables()
+    assert tables[0].min_level == 1 and tables[-1].max_level is None
+    for before, after in zip(tables, tables[1:]):
+        assert before.max_level + 1 == after.min_level
+    known = combat_system.get_enemy_prototypes()
+    assert all(name in known for t in tables for name in t.enemies)
+
+def test_bad_encounter_files_rejected(tmp_path, restore_tables):
+    """Test that bad weights, bad ranges, overlaps and unknown enemies are reported"""
+    path = tmp_path / "encounters.txt"
+    for text in ("MIN_LEVEL: 1\nENEMIES: goblin=0\n",
+                 "MIN_LEVEL: 1\nENEMIES: goblin\n",
+                 "MIN_LEVEL: 1\nENEMIES: goblin=1, Goblin=2\n",
+                 "MIN_LEVEL: 4\nMAX_LEVEL: 3\nENEMIES: goblin=1\n",
+                 "MIN_LEVEL: 1\nMAX_LEVEL: 5\nENEMIES: goblin=1\n\nMIN_LEVEL: 5\nENEMIES: orc=1\n",
+                 "MAX_LEVEL: 5\nENEMIES: goblin=1\n"):
+        path.write_text(text)
+        with pytest.raises(InvalidDataFormatError):
+            game_data.load_encounters(str(path))
+    with pytest.raises(MissingDataFileError):
+        game_data.load_encounters(str(tmp_path / "missing.txt"))
+
+    path.write_text("MIN_LEVEL: 1\nENEMIES: goblin=1, unicorn=1\n")
+    with pytest.raises(InvalidDataFormatError):
+        combat_system.load_encounter_tables(str(path))
+
+# ============================================================================
+# SAMPLING TESTS
+# ============================================================================
+
+def test_alias_table_matches_weights():
+    """Test sampled frequencies against the weights with a chi-square test"""
+    weights = [1, 2, 3, 4, 0.5]
+    table = combat_system.AliasTable(weights)
+    total = 200000
+    counts = Counter(table.sample_many(total, random.Random(163)))
+    assert set(counts) == set(range(len(weights)))
+    assert chi_square(counts, weights, total) < CHI2_CRITICAL[len(weights) - 1]
+
+    single = Counter(table.sample(random.Random(i)) for i in range(20000))
+    assert chi_square(single, weights, 20000) < CHI2_CRITICAL[len(weights) - 1]
+    with pytest.raises(ValueError):
+        combat_system.AliasTable([1, 0])
+
+def test_sample_enemies_match_table_weights(tmp_path, restore_tables):
+    """Test that sample_enemies follows the configured weights and scales enemies"""
+    path = tmp_path / "encounters.txt"
+    path.write_text("MIN_LEVEL: 1\nMAX_LEVEL: 3\nENEMIES: goblin=6, wolf=3, orc=1\n\n"
+                    "MIN_LEVEL: 4\nENEMIES: dragon=1\n")
+    combat_system.load_encounter_tables(str(path))
+
+    total = 100000
+    enemies = combat_system.sample_enemies(3, total, random.Random(7))
+    assert len(enemies) == total
+    names = Counter(e["name"] for e in enemies)
+    counts = {0: names["Goblin"], 1: names["Wolf"], 2: names["Orc"]}
+    assert chi_square(counts, [6, 3, 1], total) < CHI2_CRITICAL[2]
+
+    goblin = next(e for e in enemies if e["name"] == "Goblin")
+    assert goblin == combat_system.create_enemy("goblin", 3)
+    goblin["health"] = 0
+    assert sum(e["health"] == 0 for e in enemies) == 1
+    assert combat_system.get_random_enemy_for_level(40)["name"] == "Dragon"
+
+def test_levels_without_table_rejected(tmp_path, restore_tables):
+    """Test that a level no table covers raises InvalidTargetError"""
+    path = tmp_path / "encounters.txt"
+    path.write_text("MIN_LEVEL: 2\nMAX_LEVEL: 3\nENEMIES: orc=1\n")
+    combat_system.load_encounter_tables(str(path))
+    for level in (1, 4):
+        with pytest.raises(InvalidTargetError):
+            combat_system.sample_enemies(level, 5)
+
+def test_reload_keeps_unchanged_alias_tables(tmp_path, restore_tables):
+    """Test that only tables whose range or weights changed are rebuilt"""
+    path = tmp_path / "encounters.txt"
+    path.write_text("MIN_LEVEL: 1\nMAX_LEVEL: 2\nENEMIES: goblin=1, wolf=1\n\nMIN_LEVEL: 3\nENEMIES: orc=1\n")
+    first = combat_system.load_encounter_tables(str(path))
+    path.write_text("MIN_LEVEL: 1\nMAX_LEVEL: 2\nENEMIES: goblin=1, wolf=1\n\nMIN_LEVEL: 3\nENEMIES: orc=2, troll=1\n")
+    second = combat_system.load_encounter_tables(str(path))
+    assert second[0] is first[0]
+    assert second[1] is not first[1]
+    assert combat_system.get_encounter_table(5).weights == {"orc": 2.0, "troll": 1.0}
+
+# ============================================================================
+# GAME INTEGRATION TESTS
+# ============================================================================
+
+def bad_data_folder(tmp_path):
+    shutil.copytree("data", tmp_path / "data", ignore=shutil.ignore_patterns("save_games", "__catalog_cache__"))
+    (tmp_path / "data" / "encounters.txt").write_text("MIN_LEVEL: 1\nENEMIES: goblin=oops\n")
+
+def test_bad_encounter_file_reported_at_startup(tmp_path, restore_tables, monkeypatch):
+    """Test that main.load_game_data reads encounters up front and raises on a bad file"""
+    bad_data_folder(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(InvalidDataFormatError):
+        main.load_game_data()
+
+def test_explore_survives_encounter_errors(tmp_path, restore_tables, monkeypatch, capsys):
+    """Test that explore reports a bad encounter file or an uncovered level instead of crashing"""
+    monkeypatch.setattr(main, "current_character", character_manager.create_character("Hero", "Warrior"))
+    monkeypatch.setattr(main, "autosave_game", lambda: None)
+    bad_data_folder(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(combat_system, "_encounter_tables", None)
+    main.explore()
+    assert "Could not pick an enemy" in capsys.readouterr().out
+
+    path = tmp_path / "gap.txt"
+    path.write_text("MIN_LEVEL: 2\nENEMIES: orc=1\n")
+    combat_system.load_encounter_tables(str(path))
+    main.explore()
+    assert "Invalid enemy encountered." in capsys.readouterr().out
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""
+Test Enemy Registry
+Tests the data-driven enemy prototypes and level scaling used by create_enemy
+"""
+
+import pytest
+import sys
+import os
+import shutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import combat_system
+import game_data
+import main
+from custom_exceptions import InvalidTargetError, InvalidDataFormatError, MissingDataFileError
+
+
+@pytest.fixture
+def restore_registry():
+    yield
+    combat_system.load_enemy_templates()
+
+
+@pytest.fixture
+def default_encounters(tmp_path):
+    combat_system.load_encounter_tables(str(tmp_path / "none.txt"))
+    yield
+    combat_system.load_encounter_tables()
+
+# ============================================================================
+# DATA FILE TESTS
+# ============================================================================
+
+def test_enemy_file_matches_defaults():
+    """Test that data/enemies.txt holds the built-in enemies"""
+    assert game_data.load_enemies("data/enemies.txt") == combat_system.DEFAULT_ENEMY_TEMPLATES
+
+def test_bad_enemy_files_rejected(tmp_path):
+    """Test that bad numbers, missing fields and duplicates are reported"""
+    path = tmp_path / "enemies.txt"
+    stats = "HEALTH: 10\nSTRENGTH: 1\nMAGIC: 1\nXP_REWARD: 1\nGOLD_REWARD: 1\n"
+    for text in ("NAME: Rat\nHEALTH: lots\nSTRENGTH: 1\nMAGIC: 1\nXP_REWARD: 1\nGOLD_REWARD: 1\n",
+                 "NAME: Rat\nHEALTH: 10\nSTRENGTH: 1\nMAGIC: 1\nXP_REWARD: 1\n",
+                 "NAME: Rat\nLEVEL: 0\n" + stats,
+                 "NAME: Rat\n" + stats + "\nNAME: rat\n" + stats):
+        path.write_text(text)
+        with pytest.raises(InvalidDataFormatError):
+            game_data.load_enemies(str(path))
+    with pytest.raises(MissingDataFileError):
+        game_data.load_enemies(str(tmp_path / "missing.txt"))
+
+# ============================================================================
+# REGISTRY TESTS
+# ============================================================================
+
+def test_create_enemy_returns_independent_copies():
+    """Test that enemies are fresh dicts with the original stats"""
+    first = combat_system.create_enemy("Goblin")
+    assert first == {"name": "Goblin", "health": 50, "max_health": 50, "strength": 8,
+                     "magic": 2, "xp_reward": 25, "gold_reward": 10}
+    first["health"] = 0
+    assert combat_system.create_enemy("goblin")["health"] == 50
+    with pytest.raises(InvalidTargetError):
+        combat_system.create_enemy("unicorn", 3)
+
+def test_prototypes_are_read_only():
+    """Test that the registry view cannot be used to change prototypes"""
+    prototypes = combat_system.get_enemy_prototypes()
+    assert set(prototypes) == {"goblin", "orc", "dragon", "wolf", "troll"}
+    with pytest.raises(TypeError):
+        prototypes["orc"]["health"] = 1
+    with pytest.raises(TypeError):
+        prototypes["rat"] = {}
+
+def test_level_scaling_and_cache():
+    """Test per-level growth above the base level and that it is computed once"""
+    orc = combat_system.create_enemy("orc", 7)
+    assert (orc["health"], orc["max_health"], orc["strength"], orc["magic"]) == (120, 120, 20, 9)
+    assert (orc["xp_reward"], orc["gold_reward"]) == (90, 45)
+    assert combat_system.create_enemy("orc", 1) == combat_system.create_enemy("orc")
+
+    cached = combat_system._scaled_enemies[("orc", 7)]
+    orc["health"] = 0
+    assert combat_system.create_enemy("ORC", 7) == cached and cached["health"] == 120
+
+def test_random_enemy_scales_with_level(default_encounters):
+    """Test that level bands keep their enemy type but grow within the band"""
+    assert combat_system.get_random_enemy_for_level(1) == combat_system.create_enemy("goblin")
+    assert combat_system.get_random_enemy_for_level(2)["health"] == 56
+    assert combat_system.get_random_enemy_for_level(5)["name"] == "Orc"
+    assert combat_system.get_random_enemy_for_level(6) == combat_system.create_enemy("dragon")
+
+def test_custom_enemy_file(tmp_path, restore_registry):
+    """Test that create_enemy uses enemies from the loaded file"""
+    path = tmp_path / "enemies.txt"
+    path.write_text("NAME: Giant Rat\nHEALTH: 12\nSTRENGTH: 3\nMAGIC: 0\nXP_REWARD: 4\nGOLD_REWARD: 1\n"
+                    "HEALTH_PER_LEVEL: 2\n")
+    combat_system.create_enemy("goblin", 4)
+    assert list(combat_system.load_enemy_templates(str(path))) == ["giant rat"]
+
+    assert combat_system.create_enemy("Giant Rat", 3)["health"] == 16
+    with pytest.raises(InvalidTargetError):
+        combat_system.create_enemy("goblin", 4)
+
+def test_missing_enemy_file_uses_defaults(tmp_path, restore_registry):
+    """Test that the built-in enemies are used when the file is missing"""
+    prototypes = combat_system.load_enemy_templates(str(tmp_path / "none.txt"))
+    assert prototypes["dragon"]["health"] == 200
+
+def test_bad_enemy_file_reported_at_startup(tmp_path, restore_registry, monkeypatch):
+    """Test that main.load_game_data reads enemies up front and raises on a bad file"""
+    shutil.copytree("data", tmp_path / "data", ignore=shutil.ignore_patterns("save_games", "__catalog_cache__"))
+    (tmp_path / "data" / "enemies.txt").write_text("NAME: Rat\nHEALTH: lots\n")
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(InvalidDataFormatError):
+        main.load_game_data()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Test Item Effects
+Tests compiled, multi-stat item effects in inventory_system
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import game_data
+from custom_exceptions import InvalidItemTypeError, InvalidDataFormatError
+
+# ============================================================================
+# COMPILING EFFECTS
+# ============================================================================
+
+def test_compile_single_and_multi_stat_effects():
+    """Test that effect strings compile to (stat, amount, cap) triples"""
+    assert inventory_system.compile_item_effect("health:20") == (("health", 20, None),)
+    assert inventory_system.compile_item_effect("strength:5, magic:-2, health:50:200") == (
+        ("strength", 5, None), ("magic", -2, None), ("health", 50, 200))
+
+def test_compile_dict_keeps_every_stat():
+    """Test that dict effects are no longer cut down to their first pair"""
+    effects = inventory_system.compile_item_effect({"strength": 3, "magic": "4"})
+    assert effects == (("strength", 3, None), ("magic", 4, None))
+
+def test_compile_rejects_bad_effects():
+    """Test that malformed effects raise InvalidItemTypeError"""
+    for bad in ("health", "health:lots", "health:1:2:3", 42):
+        with pytest.raises(InvalidItemTypeError):
+            inventory_system.compile_item_effect(bad)
+
+def test_loaded_items_carry_compiled_effects():
+    """Test that load_items compiles every effect once"""
+    items = game_data.load_items("data/items.txt")
+    assert items["iron_sword"]["effects"] == (("strength", 5, None),)
+
+def test_bad_effect_in_file_reports_line(tmp_path):
+    """Test that a bad EFFECT line fails the load with its line number"""
+    path = str(tmp_path / "items.txt")
+    with open(path, "w") as f:
+        f.write("ITEM_ID: x\nNAME: X\nTYPE: weapon\nEFFECT: strength\nCOST: 1\nDESCRIPTION: d\n")
+    with pytest.raises(InvalidDataFormatError, match="line 1"):
+        game_data.load_items(path, use_cache=False)
+
+# ============================================================================
+# APPLYING EFFECTS
+# ============================================================================
+
+def test_multi_stat_weapon_equip_and_unequip():
+    """Test that every stat of a weapon is applied and fully reversed"""
+    char = character_manager.create_character("EffectTest", "Warrior")
+    before = dict(char)
+    sword = {"type": "weapon", "effect": "strength:5, magic:-2"}
+
+    char["inventory"].append("rune_sword")
+    inventory_system.equip_weapon(char, "rune_sword", sword)
+    assert char["strength"] == before["strength"] + 5
+    assert char["magic"] == before["magic"] - 2
+
+    inventory_system.unequip_weapon(char)
+    assert char["strength"] == before["strength"]
+    assert char["magic"] == before["magic"]
+
+def test_capped_effect_stops_at_cap():
+    """Test that a capped effect never raises a stat past its cap"""
+    char = {"strength": 18, "inventory": ["tonic"]}
+    inventory_system.use_item(char, "tonic", {"type": "consumable", "effect": "strength:5:20"})
+    assert char["strength"] == 20
+
+def test_unequip_reverses_only_applied_change():
+    """Test that armor healing capped by max_health is not over-reversed"""
+    char = character_manager.create_character("ArmorTest", "Cleric")
+    char["inventory"].append("vest")
+    inventory_system.equip_armor(char, "vest", {"type": "armor", "effect": "health:20"})
+    assert char["health"] == char["max_health"]
+
+    inventory_system.unequip_armor(char)
+    assert char["health"] == char["max_health"]
+
+def test_use_item_message_lists_all_stats():
+    """Test that the use message mentions each stat changed"""
+    char = {"health": 10, "max_health": 100, "magic": 1, "inventory": ["brew"]}
+    message = inventory_system.use_item(char, "brew", {"type": "consumable", "name": "Brew",
+                                                       "effect": "health:20,magic:3"})
+    assert message == "Used Brew (+20 health, +3 magic)."
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,92 @@
+"""
+Test Load Cache
+Tests the optional LRU cache in front of load_character
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterNotFoundError
+
+
+@pytest.fixture
+def cache():
+    character_manager.enable_load_cache(max_entries=3)
+    yield
+    character_manager.disable_load_cache()
+
+
+def save(name, folder, gold=100, save_format="binary"):
+    char = character_manager.create_character(name, "Mage")
+    char["gold"] = gold
+    character_manager.save_character(char, folder, save_format)
+    return char
+
+# ============================================================================
+# CACHE TESTS
+# ============================================================================
+
+def test_hits_return_copies(tmp_path, cache):
+    """Test that repeat loads hit the cache and cannot corrupt it"""
+    folder = str(tmp_path)
+    char = save("Cached", folder)
+    first = character_manager.load_character("Cached", folder)
+    first["inventory"].append("stolen")
+    first["gold"] = 0
+    second = character_manager.load_character("Cached", folder)
+
+    assert second == char
+    stats = character_manager.load_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+def test_save_and_delete_invalidate(tmp_path, cache):
+    """Test that saving or deleting drops the cached copy"""
+    folder = str(tmp_path)
+    save("Cached", folder, gold=1)
+    character_manager.load_character("Cached", folder)
+    save("Cached", folder, gold=2, save_format="journal")
+    assert character_manager.load_character("Cached", folder)["gold"] == 2
+
+    character_manager.delete_character("Cached", folder)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Cached", folder)
+
+def test_outside_write_detected(tmp_path, cache):
+    """Test that a save written behind the cache's back is picked up"""
+    folder = str(tmp_path)
+    save("Cached", folder, gold=1)
+    character_manager.load_character("Cached", folder)
+
+    other = character_manager.create_character("Cached", "Mage")
+    other["gold"] = 55
+    other["inventory"] = ["rope"]  # different size, even if the mtime is too coarse to differ
+    with open(os.path.join(folder, "Cached_save.bin"), "wb") as f:
+        f.write(character_manager.encode_character(other))
+    assert character_manager.load_character("Cached", folder)["gold"] == 55
+    assert character_manager.load_cache_stats()["stale"] == 1
+
+def test_lru_eviction(tmp_path, cache):
+    """Test that the least recently used character is evicted first"""
+    folder = str(tmp_path)
+    for name in ("a", "b", "c", "d"):
+        save(name, folder)
+    for name in ("a", "b", "c", "a", "d"):
+        character_manager.load_character(name, folder)
+    stats = character_manager.load_cache_stats()
+    assert (stats["evictions"], stats["size"]) == (1, 3)
+
+    character_manager.load_character("a", folder)
+    character_manager.load_character("b", folder)
+    stats = character_manager.load_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 5)
+
+def test_cache_off_by_default():
+    """Test that no cache statistics exist until the cache is enabled"""
+    assert character_manager.load_cache_stats() is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
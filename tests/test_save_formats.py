@@ -0,0 +1,338 @@
+"""
+Test Save Formats
+Tests the save/load paths of character_manager beyond the text format
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+from custom_exceptions import InvalidSaveDataError, CharacterNotFoundError, SaveFileCorruptedError
+
+
+def make_character(name="SaveTest"):
+    char = character_manager.create_character(name, "Rogue")
+    char["inventory"] = ["health_potion", "odd,item:id", "health_potion"]
+    char["active_quests"] = ["goblin_hunter"]
+    char["completed_quests"] = ["first_steps"]
+    char["gold"] = 2 ** 40
+    return char
+
+# ============================================================================
+# BINARY FORMAT TESTS
+# ============================================================================
+
+def test_binary_round_trip(tmp_path):
+    """Test that a binary save loads back identical, commas and colons included"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+
+    assert os.path.exists(tmp_path / "SaveTest_save.bin")
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+
+def test_binary_strings_are_stored_once():
+    """Test that repeated ids share one string table entry"""
+    data = character_manager.encode_character(make_character())
+    assert data.count(b"health_potion") == 1
+    assert data.startswith(character_manager.BINARY_MAGIC)
+
+def test_legacy_text_saves_still_load(tmp_path):
+    """Test that an existing _save.txt file still loads"""
+    char = character_manager.create_character("Legacy", "Mage")
+    character_manager.save_character(char, str(tmp_path), save_format="text")
+    assert character_manager.load_character("Legacy", str(tmp_path)) == char
+
+def test_switching_format_leaves_one_save(tmp_path):
+    """Test that saving in a new format replaces the old file"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+    char["inventory"] = ["a"]
+    character_manager.save_character(char, str(tmp_path), save_format="text")
+
+    assert os.listdir(tmp_path) == ["SaveTest_save.txt"]
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["SaveTest"]
+    character_manager.delete_character("SaveTest", str(tmp_path))
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SaveTest", str(tmp_path))
+
+def test_corrupt_binary_save_raises(tmp_path):
+    """Test that bad headers, versions and truncation are rejected"""
+    good = character_manager.encode_character(make_character())
+    bad_version = good[:6] + bytes([99]) + good[7:]
+    for data in (b"nonsense", bad_version, good[:-3], good + b"x"):
+        with open(tmp_path / "Broken_save.bin", "wb") as f:
+            f.write(data)
+        with pytest.raises(InvalidSaveDataError):
+            character_manager.load_character("Broken", str(tmp_path))
+
+def test_unknown_save_format_rejected(tmp_path):
+    """Test that an unknown format name is a ValueError"""
+    with pytest.raises(ValueError):
+        character_manager.save_character(make_character(), str(tmp_path), save_format="xml")
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_failed_write_keeps_old_save(tmp_path, monkeypatch):
+    """Test that a crash before the rename leaves the old save and no temp file"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+
+    def crash(src, dst):
+        raise OSError("power cut")
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+    char["gold"] = 1
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.save_character(char, str(tmp_path), save_format="binary")
+    monkeypatch.undo()
+
+    assert os.listdir(tmp_path) == ["SaveTest_save.bin"]
+    assert character_manager.load_character("SaveTest", str(tmp_path))["gold"] == 2 ** 40
+
+def test_every_durability_level_saves(tmp_path):
+    """Test that each durability level writes a loadable save"""
+    char = make_character()
+    for level in character_manager.DURABILITY_LEVELS:
+        char["gold"] = len(level)
+        character_manager.save_character(char, str(tmp_path), "binary", durability=level)
+        assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+    with pytest.raises(ValueError):
+        character_manager.save_character(char, str(tmp_path), durability="paranoid")
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_saves_keep_normal_permissions(tmp_path):
+    """Test that new saves get the umask default and rewrites keep the old mode"""
+    char = make_character()
+    path = tmp_path / "SaveTest_save.bin"
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    char["gold"] = 3
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+def test_backup_keeps_previous_save(tmp_path):
+    """Test that backup=True keeps the previous save next to the new one"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), save_format="binary", backup=True)
+    assert not os.path.exists(tmp_path / "SaveTest_save.bin.bak")
+
+    first = dict(char)
+    char["gold"] = 7
+    character_manager.save_character(char, str(tmp_path), save_format="binary", backup=True)
+    with open(tmp_path / "SaveTest_save.bin.bak", "rb") as f:
+        assert character_manager.decode_character(f.read()) == first
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["SaveTest"]
+
+    character_manager.delete_character("SaveTest", str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+# ============================================================================
+# JOURNAL SAVE TESTS
+# ============================================================================
+
+def fresh_load(name, folder):
+    # drop the in-memory state so the next save has to read the files
+    character_manager._journal_states.clear()
+    return character_manager.load_character(name, folder)
+
+def size_or_zero(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def test_journal_appends_changes(tmp_path):
+    """Test that journal saves append small records and replay on load"""
+    folder = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, folder, "journal")
+    snapshot_size = os.path.getsize(tmp_path / "SaveTest_save.bin")
+
+    char["gold"] += 25
+    char["experience"] += 40
+    character_manager.save_character(char, folder, "journal")
+    first = os.path.getsize(tmp_path / "SaveTest_save.journal")
+    char["inventory"].remove("odd,item:id")
+    char["inventory"].append("iron_sword")
+    char["active_quests"] = []
+    char["completed_quests"].append("goblin_hunter")
+    character_manager.save_character(char, folder, "journal")
+
+    assert os.path.getsize(tmp_path / "SaveTest_save.bin") == snapshot_size
+    assert first < 40
+    assert fresh_load("SaveTest", folder) == char
+    assert character_manager.list_saved_characters(folder) == ["SaveTest"]
+
+def test_journal_reorder_and_unchanged(tmp_path):
+    """Test that reordered lists replay exactly and no-op saves write nothing"""
+    folder = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, folder, "journal")
+    char["inventory"] = ["odd,item:id", "health_potion", "health_potion"]
+    character_manager.save_character(char, folder, "journal")
+    size = os.path.getsize(tmp_path / "SaveTest_save.journal")
+    character_manager.save_character(char, folder, "journal")
+    assert os.path.getsize(tmp_path / "SaveTest_save.journal") == size
+    assert fresh_load("SaveTest", folder) == char
+
+def test_journal_compacts_into_snapshot(tmp_path, monkeypatch):
+    """Test that a journal over the threshold is folded into a new snapshot"""
+    monkeypatch.setattr(character_manager, "JOURNAL_COMPACT_BYTES", 200)
+    folder = str(tmp_path)
+    char = make_character()
+    for gold in range(50):
+        char["gold"] = gold
+        character_manager.save_character(char, folder, "journal")
+        assert size_or_zero(tmp_path / "SaveTest_save.journal") <= 200
+    assert fresh_load("SaveTest", folder) == char
+
+def test_journal_torn_record_is_dropped(tmp_path):
+    """Test that a half-written last record is ignored and later saves still replay"""
+    folder = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, folder, "journal")
+    char["gold"] = 10
+    character_manager.save_character(char, folder, "journal")
+    char["gold"] = 20
+    character_manager.save_character(char, folder, "journal")
+    journal = tmp_path / "SaveTest_save.journal"
+    with open(journal, "r+b") as f:
+        f.truncate(os.path.getsize(journal) - 3)
+
+    assert fresh_load("SaveTest", folder)["gold"] == 10
+    char["gold"] = 30
+    character_manager.save_character(char, folder, "journal")
+    assert fresh_load("SaveTest", folder)["gold"] == 30
+
+def test_stale_journal_is_ignored(tmp_path):
+    """Test that switching to a full save format discards the journal"""
+    folder = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, folder, "journal")
+    char["gold"] = 5
+    character_manager.save_character(char, folder, "journal")
+    char["gold"] = 6
+    character_manager.save_character(char, folder, "binary")
+    assert not os.path.exists(tmp_path / "SaveTest_save.journal")
+    assert fresh_load("SaveTest", folder)["gold"] == 6
+    character_manager.delete_character("SaveTest", folder)
+    assert os.listdir(tmp_path) == []
+
+@pytest.mark.parametrize("save_format", ["binary", "text"])
+def test_failed_full_save_keeps_journal(tmp_path, monkeypatch, save_format):
+    """Test that a full save failing before its rename leaves the journaled state loadable"""
+    folder = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, folder, "journal")
+    char["gold"] = 600
+    character_manager.save_character(char, folder, "journal")
+
+    def crash(src, dst):
+        raise OSError("power cut")
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.save_character(dict(char, gold=1), folder, save_format)
+    monkeypatch.undo()
+
+    assert os.path.exists(tmp_path / "SaveTest_save.journal")
+    assert fresh_load("SaveTest", folder)["gold"] == 600
+    char["gold"] = 601
+    character_manager.save_character(char, folder, "journal")
+    assert fresh_load("SaveTest", folder) == char
+
+def test_journal_notices_replaced_snapshot(tmp_path):
+    """Test that a snapshot replaced from outside is re-read before journaling"""
+    folder = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, folder, "journal")
+
+    outside = dict(char, gold=999)
+    replacement = tmp_path / "restore.tmp"
+    replacement.write_bytes(character_manager.encode_character(outside))
+    os.replace(replacement, tmp_path / "SaveTest_save.bin")
+
+    char["gold"] = 5
+    assert character_manager.save_character(char, folder, "journal")
+    assert fresh_load("SaveTest", folder) == char
+
+def test_journal_state_cache_is_bounded(tmp_path, monkeypatch):
+    """Test that only the most recently saved characters stay in memory"""
+    monkeypatch.setattr(character_manager, "JOURNAL_STATE_CACHE_SIZE", 3)
+    character_manager._journal_states.clear()
+    folder = str(tmp_path)
+    chars = [dict(make_character(), name=f"Hero{i}") for i in range(5)]
+    for char in chars:
+        character_manager.save_character(char, folder, "journal")
+    assert len(character_manager._journal_states) == 3
+
+    for char in chars:
+        char["gold"] += 1
+        character_manager.save_character(char, folder, "journal")
+    assert len(character_manager._journal_states) == 3
+    assert [fresh_load(c["name"], folder) for c in chars] == chars
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = save_backends.SQLiteSaveBackend(str(tmp_path / "saves.db"))
+    previous = character_manager.set_save_backend(backend)
+    yield backend
+    character_manager.set_save_backend(previous)
+    backend.close()
+
+def test_sqlite_backend_round_trip(sqlite_backend, tmp_path):
+    """Test that save/load/list/delete go through the active backend"""
+    char = make_character()
+    assert character_manager.save_character(char) is True
+    char["gold"] = 5
+    character_manager.save_character(char)
+
+    assert character_manager.load_character("SaveTest") == char
+    assert character_manager.list_saved_characters() == ["SaveTest"]
+    assert not os.path.exists("data/save_games/SaveTest_save.bin")
+
+    assert character_manager.delete_character("SaveTest") is True
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SaveTest")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SaveTest")
+
+def test_sqlite_batch_rolls_back_on_error(sqlite_backend):
+    """Test that a failed batch leaves no partial saves behind"""
+    with pytest.raises(RuntimeError):
+        with sqlite_backend.batch():
+            sqlite_backend.save_character(make_character("One"))
+            sqlite_backend.save_character(make_character("Two"))
+            raise RuntimeError("boom")
+    assert sqlite_backend.list_saved_characters() == []
+
+    assert sqlite_backend.save_many([make_character("One"), make_character("Two")]) == 2
+    assert sqlite_backend.list_saved_characters() == ["One", "Two"]
+
+def test_migrate_save_directory(tmp_path):
+    """Test that migration copies text and binary saves and skips broken ones"""
+    folder = str(tmp_path / "saves")
+    character_manager.save_character(make_character("Alpha"), folder, save_format="text")
+    character_manager.save_character(make_character("Beta"), folder, save_format="binary")
+    with open(os.path.join(folder, "Broken_save.bin"), "wb") as f:
+        f.write(b"nonsense")
+
+    database = str(tmp_path / "saves.db")
+    assert save_backends.main(["migrate", folder, database]) == 1
+
+    with save_backends.SQLiteSaveBackend(database) as backend:
+        assert backend.list_saved_characters() == ["Alpha", "Beta"]
+        assert backend.load_character("Beta") == make_character("Beta")
+    assert character_manager.get_save_backend() is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
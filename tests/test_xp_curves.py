@@ -0,0 +1,98 @@
+"""
+Test XP Curves
+Tests that one-step leveling matches leveling one level at a time
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def loop_gain_experience(character, xp_amount, curve):
+    # the original one-level-at-a-time loop, for any curve
+    character["experience"] += xp_amount
+    while True:
+        cost = curve.cost(character["level"])
+        if cost is None or character["experience"] < cost:
+            break
+        character["experience"] -= cost
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+    return character
+
+
+def check_equivalent(curve, rng, trials=2000):
+    previous = character_manager.set_xp_curve(curve)
+    try:
+        for _ in range(trials):
+            start = character_manager.create_character("Hero", "Warrior")
+            start["level"] = rng.randrange(1, 50)
+            start["experience"] = rng.randrange(start["level"] * 100)
+            start["health"] = rng.randrange(1, start["max_health"] + 1)
+            xp = rng.choice([0, 1, rng.randrange(1000), rng.randrange(10 ** 6), rng.randrange(10 ** 9)])
+            expected = loop_gain_experience(dict(start), xp, curve)
+            assert character_manager.gain_experience(dict(start), xp) == expected, (start, xp)
+    finally:
+        character_manager.set_xp_curve(previous)
+
+# ============================================================================
+# EQUIVALENCE TESTS
+# ============================================================================
+
+def test_linear_curve_matches_loop():
+    """Test that the closed-form linear curve gives exactly the loop's result"""
+    check_equivalent(character_manager.LinearXPCurve(), random.Random(1))
+
+def test_float_experience_matches_loop():
+    """Test that non-integer XP levels up exactly like the original loop"""
+    curve = character_manager.LinearXPCurve()
+    for level, xp in ((1, 150.0), (1, 99.5), (2, 350.25), (3, 12345.75), (1, 0.5)):
+        start = character_manager.create_character("Hero", "Warrior")
+        start["level"] = level
+        expected = loop_gain_experience(dict(start), xp, curve)
+        result = character_manager.gain_experience(dict(start), xp)
+        assert result == expected, (level, xp)
+
+def test_linear_curve_exact_boundaries():
+    """Test grants that land exactly on and one short of a level boundary"""
+    curve = character_manager.LinearXPCurve()
+    for level in (1, 2, 7, 1000):
+        for levels in (1, 2, 10, 500):
+            cost = sum(l * 100 for l in range(level, level + levels))
+            assert curve.advance(level, cost) == (level + levels, 0)
+            last = level + levels - 1
+            assert curve.advance(level, cost - 1) == (last, last * 100 - 1)
+
+def test_table_curve_matches_loop():
+    """Test that a bisect table curve gives exactly the loop's result, including the cap"""
+    curve = character_manager.TableXPCurve.from_function(lambda level: 50 + level * level * 7, 400)
+    check_equivalent(curve, random.Random(2), trials=500)
+
+def test_table_curve_caps_at_max_level():
+    """Test that characters stop at the table's last level and keep extra XP"""
+    previous = character_manager.set_xp_curve(character_manager.TableXPCurve([100, 200, 300]))
+    try:
+        char = character_manager.create_character("Capped", "Mage")
+        character_manager.gain_experience(char, 10 ** 6)
+        assert char["level"] == 4
+        assert char["experience"] == 10 ** 6 - 600
+        assert char["max_health"] == 80 + 30
+    finally:
+        character_manager.set_xp_curve(previous)
+
+def test_default_curve_restored():
+    """Test that set_xp_curve(None) restores the linear curve"""
+    previous = character_manager.set_xp_curve(None)
+    assert isinstance(character_manager.get_xp_curve(), character_manager.LinearXPCurve)
+    character_manager.set_xp_curve(previous)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])